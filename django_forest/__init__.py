@@ -1,15 +1,21 @@
+from django_forest.resources.utils.count import validate_count_strategies
 from django_forest.utils.cors import set_cors
+from django_forest.utils.count_cache import CountCache
 from django_forest.utils.middlewares import set_middlewares
 from django_forest.utils.schema import Schema
+from django_forest.utils.smart_field_cache import SmartFieldCache
 
 
 def init_forest():
     set_cors()
     set_middlewares()
+    validate_count_strategies()
+    CountCache.connect_signals()
 
     # schema
     Schema.build_schema()
     Schema.add_smart_features()
+    SmartFieldCache.connect_signals()
     Schema.handle_json_api_schema()
     Schema.handle_schema_file()
     Schema.send_apimap()
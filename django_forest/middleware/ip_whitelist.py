@@ -1,8 +1,13 @@
+import logging
+
 from django.http import HttpResponse
 from ipware import get_client_ip
 
 from django_forest.utils.ip_whitelist import IpWhitelist
 
+# Get an instance of a logger
+logger = logging.getLogger(__name__)
+
 
 class IpWhitelistMiddleware:
     def __init__(self, get_response):
@@ -32,14 +37,22 @@ class IpWhitelistMiddleware:
             return IpWhitelist.is_ip_matches_any_rule(client_ip)
         return True
 
+    def get_rules(self):
+        try:
+            IpWhitelist.get_rules()
+        except Exception as e:
+            # Notice: while the Forest API is failing, the last rules are used during a grace period
+            if not IpWhitelist.is_last_known_good_usable():
+                return HttpResponse(f'Unable to retrieve the ip white list ({e})', status=403)
+            logger.warning(f'Unable to retrieve the ip white list, last rules used: {e}')
+
     def process_view(self, request, view_func, *args, **kwargs):
 
         # if invalid ip, fetch again
         if not IpWhitelist.fetched or not self.is_ip_valid(request):
-            try:
-                IpWhitelist.get_rules()
-            except Exception as e:
-                return HttpResponse(f'Unable to retrieve the ip white list ({e})', status=403)
+            error_response = self.get_rules()
+            if error_response is not None:
+                return error_response
 
         if not self.is_ip_valid(request):
             return HttpResponse('IP client is invalid', status=403)
@@ -1,5 +1,4 @@
 import logging
-import csv
 
 from django_forest.resources.associations.utils import AssociationView
 from django_forest.resources.utils.csv import CsvMixin
@@ -28,18 +27,14 @@ class CsvView(SmartFieldMixin, JsonApiSerializerMixin, CsvMixin, AssociationView
             # enhance queryset
             queryset = self.enhance_queryset(queryset, RelatedModel, params, request, apply_pagination=False)
 
+            # Notice: stream the export chunk by chunk to keep a flat memory usage
+            if self.is_csv_streaming():
+                return self.csv_streaming_response(queryset, RelatedModel, params)
+
             # handle smart fields
             self.handle_smart_fields(queryset, RelatedModel._meta.db_table, parse_qs(params), many=True)
 
             # json api serializer
             data = self.serialize(queryset, RelatedModel, params)
 
-            response = self.csv_response(params['filename'])
-
-            field_names_requested = [x for x in params[f'fields[{RelatedModel._meta.db_table}]'].split(',')]
-            csv_header = params['header'].split(',')
-
-            writer = csv.DictWriter(response, fieldnames=field_names_requested)
-            writer.writerow(dict(zip(field_names_requested, csv_header)))
-            self.fill_csv(data, writer, params)
-            return response
+            return self.write_csv(data, RelatedModel, params)
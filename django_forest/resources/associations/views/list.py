@@ -8,6 +8,7 @@ from django_forest.resources.utils.json_api_serializer import JsonApiSerializerM
 from django_forest.resources.utils.query_parameters import parse_qs
 from django_forest.resources.utils.smart_field import SmartFieldMixin
 from django_forest.utils import get_association_field
+from django_forest.utils.count_cache import CountCache
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +29,7 @@ class ListView(SmartFieldMixin, JsonApiSerializerMixin, AssociationView):
 
             params = request.GET.dict()
             # enhance queryset
-            queryset = self.enhance_queryset(queryset, RelatedModel, params, request)
+            queryset = self.enhance_queryset(queryset, RelatedModel, params, request, apply_expression_fields=True)
 
             # handle smart fields
             self.handle_smart_fields(queryset, RelatedModel._meta.db_table, parse_qs(params), many=True)
@@ -52,6 +53,7 @@ class ListView(SmartFieldMixin, JsonApiSerializerMixin, AssociationView):
             instance = self.Model.objects.get(pk=pk)
             objects, fields_to_update = self.get_association_utils(self.Model, RelatedModel, ids)
             self.handle_association(instance, objects, fields_to_update, 'add')
+            CountCache.invalidate(RelatedModel)
             return JsonResponse({}, safe=False)
 
     # Notice: BelongsTo case
@@ -83,5 +85,7 @@ class ListView(SmartFieldMixin, JsonApiSerializerMixin, AssociationView):
             # Notice: Dissociate
             else:
                 self._dissociate(RelatedModel, ids, pk)
+            # Notice: bulk deletes and dissociations do not always run signals
+            CountCache.invalidate(RelatedModel)
 
             return HttpResponse(status=204)
@@ -0,0 +1,119 @@
+import json
+
+from django.core.exceptions import EmptyResultSet
+from django.db import DatabaseError, connections
+
+from django_forest.apps import BaseForestException
+from django_forest.utils.count_cache import CountCache
+from django_forest.utils.forest_setting import get_forest_setting
+
+COUNT_STRATEGIES = ('exact', 'capped', 'estimated')
+# Notice: the params narrowing the counted records, whose estimates by the planner can be far from the count
+COUNT_CONDITIONS_PARAMS = ('filters', 'search', 'segment', 'segmentQuery')
+
+
+class CountStrategyException(BaseForestException):
+    pass
+
+
+def check_count_strategy(strategy):
+    if strategy not in COUNT_STRATEGIES:
+        raise CountStrategyException(f'unknown count strategy {strategy}')
+
+
+def validate_count_strategies():
+    for strategy in get_forest_setting('FOREST_COUNT_STRATEGIES', {}).values():
+        check_count_strategy(strategy)
+
+
+class CountMixin:
+    def get_count_strategy(self, request):
+        strategies = get_forest_setting('FOREST_COUNT_STRATEGIES', {})
+        resolver_kwargs = request.resolver_match.kwargs
+        resource = resolver_kwargs.get('resource')
+        keys = [resource]
+        if 'association_resource' in resolver_kwargs:
+            keys = [f"{resource}:{resolver_kwargs['association_resource']}", f'{resource}:*']
+
+        for key in keys:
+            if key in strategies:
+                return strategies[key]
+        return 'exact'
+
+    def has_count_conditions(self, request):
+        if 'association_resource' in request.resolver_match.kwargs:
+            return True
+        return any(request.GET.get(param) for param in COUNT_CONDITIONS_PARAMS)
+
+    def get_exact_count(self, queryset):
+        return {'count': queryset.count()}
+
+    def get_capped_count(self, queryset):
+        cap = int(get_forest_setting('FOREST_COUNT_CAP', 10000))
+        # Notice: stop counting after cap + 1 rows, ordering is useless here
+        count = queryset.order_by().values('pk')[:cap + 1].count()
+        if count > cap:
+            return {'count': cap, 'meta': {'capped': True}}
+        return {'count': count}
+
+    def get_postgresql_estimate(self, queryset, cursor):
+        if not queryset.query.where:
+            cursor.execute('SELECT reltuples FROM pg_class WHERE oid = %s::regclass', [queryset.model._meta.db_table])
+            reltuples = cursor.fetchone()[0]
+            # Notice: -1 (or 0) until the table has been analyzed
+            if reltuples > 0:
+                return int(reltuples)
+
+        sql, params = queryset.order_by().query.sql_with_params()
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    def get_sqlite_estimate(self, queryset, cursor):
+        if queryset.query.where:
+            return None
+
+        # Notice: sqlite_stat1 only exists once ANALYZE has been run
+        cursor.execute('SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1', [queryset.model._meta.db_table])
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return int(row[0].split(' ')[0])
+
+    def get_row_estimate(self, queryset):
+        ESTIMATES = {
+            'postgresql': self.get_postgresql_estimate,
+            'sqlite': self.get_sqlite_estimate,
+        }
+        connection = connections[queryset.db]
+        if connection.vendor not in ESTIMATES:
+            return None
+
+        try:
+            with connection.cursor() as cursor:
+                return ESTIMATES[connection.vendor](queryset, cursor)
+        except (DatabaseError, EmptyResultSet):
+            return None
+
+    def get_estimated_count(self, queryset):
+        threshold = int(get_forest_setting('FOREST_COUNT_ESTIMATE_THRESHOLD', 100000))
+        estimate = self.get_row_estimate(queryset)
+        # Notice: small estimates are the least accurate, and exact counts are cheap there
+        if estimate is None or estimate < threshold:
+            return self.get_exact_count(queryset)
+        return {'count': estimate, 'meta': {'estimated': True}}
+
+    def count(self, queryset, request):
+        STRATEGIES = {
+            'exact': self.get_exact_count,
+            'capped': self.get_capped_count,
+            'estimated': self.get_estimated_count,
+        }
+        strategy = self.get_count_strategy(request)
+        check_count_strategy(strategy)
+        # Notice: only the whole table (within the scope) is estimated, the other counts are exact
+        if strategy == 'estimated' and self.has_count_conditions(request):
+            strategy = 'exact'
+        return CountCache.get_or_count(queryset, strategy, STRATEGIES[strategy])
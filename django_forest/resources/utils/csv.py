@@ -1,21 +1,35 @@
+import csv
 from datetime import datetime
+from itertools import islice
 
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
+
+from django_forest.resources.utils.query_parameters import parse_qs
+from django_forest.utils.forest_setting import get_forest_setting
+
+
+class Echo:
+    """An object that implements just the write method of the file-like interface."""
+
+    def write(self, value):
+        return value
 
 
 class CsvMixin:
-    def get_related_res(self, data, value):
+    def get_included_index(self, data):
+        # Notice: index included records once, to resolve each relationship in constant time
+        return {(x['type'], str(x['id'])): x for x in data.get('included', [])}
+
+    def get_related_res(self, included, value):
         related_res = None
         if value['data'] is not None:
-            related_res = next((x for x in data['included']
-                                if x['type'] == value['data']['type'] and str(x['id']) == str(value['data']['id'])),
-                               None)
+            related_res = included.get((value['data']['type'], str(value['data']['id'])))
         return related_res
 
-    def fill_csv_relationships(self, res, record, data, params):
+    def fill_csv_relationships(self, res, record, included, params):
         pk_name = self.Model._meta.pk.name
         for name, value in record['relationships'].items():
-            related_res = self.get_related_res(data, value)
+            related_res = self.get_related_res(included, value)
             field_name = params[f'fields[{name}]']
             if related_res:
                 if 'attributes' in related_res and field_name in related_res['attributes']:
@@ -26,22 +40,81 @@ class CsvMixin:
                     res[name] = related_res['id']
         return res
 
-    def fill_csv(self, data, writer, params):
+    def get_csv_rows(self, data, params):
+        included = self.get_included_index(data)
         for record in data['data']:
             res = record['attributes']
             res[self.Model._meta.pk.name] = record['id']
             if 'relationships' in record and 'included' in data:
-                res = self.fill_csv_relationships(res, record, data, params)
+                res = self.fill_csv_relationships(res, record, included, params)
 
+            yield res
+
+    def fill_csv(self, data, writer, params):
+        for res in self.get_csv_rows(data, params):
             writer.writerow(res)
 
+    def get_csv_writer(self, buffer, Model, params):
+        field_names_requested = [x for x in params[f'fields[{Model._meta.db_table}]'].split(',')]
+        csv_header = params['header'].split(',')
+
+        writer = csv.DictWriter(buffer, fieldnames=field_names_requested)
+        return writer, dict(zip(field_names_requested, csv_header))
+
+    def is_csv_streaming(self):
+        return get_forest_setting('FOREST_CSV_STREAMING', False)
+
+    def get_csv_chunk_size(self):
+        return int(get_forest_setting('FOREST_CSV_CHUNK_SIZE', 2000))
+
+    def get_csv_chunks(self, queryset):
+        chunk_size = self.get_csv_chunk_size()
+        # Notice: use a server-side cursor (when available) to avoid loading the whole table
+        iterator = queryset.iterator(chunk_size=chunk_size)
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                break
+            yield chunk
+
+    def stream_csv(self, queryset, Model, params):
+        writer, header = self.get_csv_writer(Echo(), Model, params)
+        yield writer.writerow(header)
+
+        qs = parse_qs(params)
+        for chunk in self.get_csv_chunks(queryset):
+            # handle smart fields
+            self.handle_smart_fields(chunk, Model._meta.db_table, qs, many=True)
+
+            # json api serializer
+            data = self.serialize(chunk, Model, params)
+            for res in self.get_csv_rows(data, params):
+                yield writer.writerow(res)
+
+    def get_csv_headers(self, csv_filename):
+        return {
+            'Content-Disposition': f'attachment; filename="{csv_filename}.csv"',
+            'Last-Modified': datetime.now(),
+            'X-Accel-Buffering': 'no',
+            'Cache-Control': 'no-cache'
+        }
+
     def csv_response(self, csv_filename):
         return HttpResponse(
             content_type='text/csv; charset=utf-8',
-            headers={
-                'Content-Disposition': f'attachment; filename="{csv_filename}.csv"',
-                'Last-Modified': datetime.now(),
-                'X-Accel-Buffering': 'no',
-                'Cache-Control': 'no-cache'
-            },
+            headers=self.get_csv_headers(csv_filename),
         )
+
+    def csv_streaming_response(self, queryset, Model, params):
+        return StreamingHttpResponse(
+            self.stream_csv(queryset, Model, params),
+            content_type='text/csv; charset=utf-8',
+            headers=self.get_csv_headers(params['filename']),
+        )
+
+    def write_csv(self, data, Model, params):
+        response = self.csv_response(params['filename'])
+        writer, header = self.get_csv_writer(response, Model, params)
+        writer.writerow(header)
+        self.fill_csv(data, writer, params)
+        return response
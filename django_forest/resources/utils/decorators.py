@@ -1,37 +1,71 @@
-from .in_search_fields import in_search_fields
+from django.db.models import BooleanField, Case, Q, Value, When
+
 from django_forest.utils.schema import Schema
 
 
 class DecoratorsMixin:
     def get_fields_for_decorator_search(self, collection):
-        fields_to_search = []
-        for x in collection['fields']:
-            if x['type'] in ('String', 'Number', 'Enum') \
-                    and not x['reference'] \
-                    and in_search_fields(x['field'], collection['search_fields']):
-                fields_to_search.append(x)
-        return fields_to_search
-
-    def handle_search_decorator_field(self, field, record, data, search):
+        return Schema.get_collection_metadata(collection['name']).decorator_search_fields
+
+    def get_search_decorator_annotation(self, field_name):
+        return f'forest_search_decorator_{field_name}'
+
+    def get_fields_for_sql_decorator_search(self, params, Model):
+        collection = Schema.get_collection(Model._meta.db_table)
+        lookup = f'fields[{Model._meta.db_table}]'
+        requested_fields = params[lookup].split(',') if lookup in params else None
+        # Notice: smart fields are computed in python, and only serialized fields are decorated
+        return [
+            x for x in self.get_fields_for_decorator_search(collection)
+            if not x['is_virtual'] and (requested_fields is None or x['field'] in requested_fields + ['id'])
+        ]
+
+    def get_search_decorator_q(self, backend, search, Model, field):
+        # Notice: String fields are matched as the search backend does, to decorate the records it found
+        if backend is not None and field['type'] == 'String':
+            return backend.get_field_q(search, Model, field['field'])
+        return Q(**{f"{field['field']}__icontains": search})
+
+    def annotate_search_decorators(self, params, Model, queryset):
+        if not params.get('search'):
+            return queryset
+
+        search = params['search']
+        backend = self.get_search_backend(search, Model._meta.db_table)
+        annotations = {}
+        for field in self.get_fields_for_sql_decorator_search(params, Model):
+            condition = When(self.get_search_decorator_q(backend, search, Model, field), then=Value(True))
+            annotations[self.get_search_decorator_annotation(field['field'])] = Case(
+                condition, default=Value(False), output_field=BooleanField()
+            )
+        return queryset.annotate(**annotations)
+
+    def is_search_decorator_field(self, field, record, instance, search):
+        annotation = self.get_search_decorator_annotation(field['field'])
+        if instance is not None and annotation in instance.__dict__:
+            return instance.__dict__[annotation]
+
         record_attr = {**record.get("attributes", {}), "id": record["id"]}
-        if field['field'] in record_attr \
-           and search.upper() in str(record_attr[field['field']]).upper():
-            decorator_instance = next((x for x in self.get_meta_decorators(data) if x['id'] == record['id']), None)
-            if decorator_instance is None:
-                self.get_meta_decorators(data).append({
-                    'id': record['id'],
-                    'search': [field['field']]
-                })
-            else:
-                decorator_instance['search'].append(field['field'])
-
-    def handle_search_decorator(self, data, Model, search):
+        return field['field'] in record_attr \
+            and search.upper() in str(record_attr[field['field']]).upper()
+
+    def handle_search_decorator(self, data, Model, search, queryset=None):
         collection = Schema.get_collection(Model._meta.db_table)
         fields_to_search = self.get_fields_for_decorator_search(collection)
+        instances = [None] * len(data['data']) if queryset is None else queryset
+
+        decorators = {}
+        for record, instance in zip(data['data'], instances):
+            matches = [
+                x['field'] for x in fields_to_search if self.is_search_decorator_field(x, record, instance, search)
+            ]
+            if matches and record['id'] in decorators:
+                decorators[record['id']]['search'].extend(matches)
+            elif matches:
+                decorators[record['id']] = {'id': record['id'], 'search': matches}
 
-        for record in data['data']:
-            for field in fields_to_search:
-                self.handle_search_decorator_field(field, record, data, search)
+        if decorators:
+            self.get_meta_decorators(data).extend(decorators.values())
 
     def get_meta_decorators(self, data):
         if 'meta' not in data or 'decorators' not in data['meta']:
@@ -40,8 +74,8 @@ class DecoratorsMixin:
             }
         return data['meta']['decorators']
 
-    def decorators(self, data, Model, params):
+    def decorators(self, data, Model, params, queryset=None):
         if 'search' in params and params['search']:
-            self.handle_search_decorator(data, Model, params['search'])
+            self.handle_search_decorator(data, Model, params['search'], queryset)
 
         return data
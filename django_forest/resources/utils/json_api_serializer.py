@@ -1,4 +1,6 @@
+from django_forest.utils.forest_setting import get_forest_setting
 from django_forest.utils.schema import Schema
+from django_forest.utils.schema.json_api_plan import JsonApiPlan, JsonApiPlanUnavailable
 from django_forest.utils.schema.json_api_schema import JsonApiSchema
 from django_forest.resources.utils.query_parameters import parse_qs
 from django_forest.utils.models import Models
@@ -100,5 +102,14 @@ class JsonApiSerializerMixin:
 
         data = {'data': []}
         if queryset:
-            data = JsonSchema(**kwargs).dump(queryset, many=True)
+            data = self.dump(JsonSchema, db_name, queryset, kwargs)
         return data
+
+    def dump(self, JsonSchema, db_name, queryset, kwargs):
+        if not get_forest_setting('FOREST_DISABLE_COMPILED_SERIALIZER', False):
+            try:
+                return JsonApiPlan.get(db_name).dump(queryset, **kwargs)
+            except JsonApiPlanUnavailable:
+                pass
+        # Notice: fallback to marshmallow-jsonapi
+        return JsonSchema(**kwargs).dump(queryset, many=True)
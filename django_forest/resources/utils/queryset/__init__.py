@@ -1,16 +1,24 @@
+from .expression_fields import ExpressionFieldsMixin
 from .filters import FiltersMixin
 from .limit_fields import LimitFieldsMixin
 from .pagination import PaginationMixin
 from .scope import ScopeMixin
 from .search import SearchMixin
 from .segment import SegmentMixin
+from .select_related import SelectRelatedMixin
 from django_forest.resources.utils.decorators import DecoratorsMixin
 
 
 class QuerysetMixin(
-    PaginationMixin, FiltersMixin, SearchMixin, ScopeMixin, DecoratorsMixin, LimitFieldsMixin, SegmentMixin
+    PaginationMixin, FiltersMixin, SearchMixin, ScopeMixin, DecoratorsMixin, LimitFieldsMixin, SegmentMixin,
+    SelectRelatedMixin, ExpressionFieldsMixin
 ):
     def filter_queryset(self, queryset, Model, params, request):
+        # Notice: compute the expression smart fields, filters and sort can use them
+        queryset = self.annotate_expression_fields(
+            queryset, Model, self.get_expression_fields_for_request(params, Model)
+        )
+
         # Notice: first apply scope
         scope_filters = self.get_scope(request, Model)
         if scope_filters is not None:
@@ -26,13 +34,22 @@ class QuerysetMixin(
                 queryset = queryset.filter(method(params, Model))
         return queryset
 
-    def enhance_queryset(self, queryset, Model, params, request, apply_pagination=True):
+    def handle_sort(self, params, queryset):
+        if 'sort' in params:
+            return queryset.order_by(params['sort'].replace('.', '__'))
+        return queryset
+
+    def enhance_queryset(self, queryset, Model, params, request, apply_pagination=True, apply_decorators=False,
+                         apply_expression_fields=False):
         # scopes + filter + search
         queryset = self.filter_queryset(queryset, Model, params, request)
 
+        # the serialized expression smart fields, not requested by the filters nor the sort
+        if apply_expression_fields:
+            queryset = self.annotate_serialized_expression_fields(queryset, Model, params)
+
         # sort
-        if 'sort' in params:
-            queryset = queryset.order_by(params['sort'].replace('.', '__'))
+        queryset = self.handle_sort(params, queryset)
 
         # segment
         queryset = self.handle_segment(params, Model, queryset)
@@ -40,8 +57,15 @@ class QuerysetMixin(
         # limit fields
         queryset = self.handle_limit_fields(params, Model, queryset)
 
+        # join the relationships included by the serializer
+        queryset = self.handle_select_related(params, Model, queryset)
+
+        # compute the search decorators in the same query
+        if apply_decorators:
+            queryset = self.annotate_search_decorators(params, Model, queryset)
+
         # pagination
         if apply_pagination:
-            queryset = self.get_pagination(params, queryset)
+            queryset = self.get_pagination(params, queryset, Model)
 
         return queryset
@@ -0,0 +1,92 @@
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Q
+
+
+def get_connector(aggregator):
+    return Q.OR if aggregator == 'or' else Q.AND
+
+
+def get_field(Model, name):
+    if name == 'pk':
+        return Model._meta.pk
+    try:
+        return Model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+
+
+@lru_cache(maxsize=None)
+def get_exact_lookup(Model, lookup):
+    """Return the field path of an equality lookup (field path, optionally ending with __exact), else None."""
+    path = lookup[:-len('__exact')] if lookup.endswith('__exact') else lookup
+    field = None
+    for name in path.split('__'):
+        if field is not None and not field.is_relation:
+            return None
+        field = get_field(Model if field is None else field.related_model, name)
+        if field is None:
+            return None
+    return path
+
+
+def get_collapsible_lookup(Model, child):
+    if not isinstance(child, tuple) or child[1] is None or hasattr(child[1], 'resolve_expression'):
+        return None
+    return get_exact_lookup(Model, child[0])
+
+
+def collapse_in(Model, children):
+    """Rewrite the equalities on the same field of a disjunction into a single __in lookup."""
+    grouped, res = {}, []
+    for child in children:
+        lookup = get_collapsible_lookup(Model, child)
+        if lookup is None:
+            res.append(child)
+            continue
+        if lookup not in grouped:
+            grouped[lookup] = []
+            res.append(lookup)
+        grouped[lookup].append(child)
+
+    return [
+        child if not isinstance(child, str)
+        else grouped[child][0] if len(grouped[child]) == 1
+        else (f'{child}__in', [value for _, value in grouped[child]])
+        for child in res
+    ]
+
+
+def flatten_q(children, connector):
+    flat = []
+    for child in children:
+        # Notice: same squashing as Node.add, empty Q are ignored as by & and |
+        if isinstance(child, Q) and not child.negated and (child.connector == connector or len(child) == 1):
+            flat.extend(child.children)
+        elif not isinstance(child, Q) or len(child):
+            flat.append(child)
+    return flat
+
+
+def combine_q(children, connector, Model=None):
+    """Combine the children in a single n-ary node, instead of nesting them with & and |."""
+    flat = flatten_q(children, connector)
+    if connector == Q.OR and Model is not None:
+        flat = collapse_in(Model, flat)
+    if not flat:
+        return Q()
+    if len(flat) == 1 and isinstance(flat[0], Q):
+        return flat[0]
+    return Q(*flat, _connector=connector)
+
+
+def fold_q(pairs, Model=None):
+    """Combine (connector, q) pairs from left to right, as q_objects |= q or q_objects &= q would."""
+    children, connector = [], None
+    for child_connector, child in pairs:
+        if connector is not None and child_connector != connector:
+            children = [combine_q(children, connector, Model)]
+        connector = child_connector
+        children.append(child)
+    return combine_q(children, connector, Model)
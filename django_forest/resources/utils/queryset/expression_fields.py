@@ -0,0 +1,44 @@
+import json
+
+from django_forest.utils.schema import Schema
+
+
+class ExpressionFieldsMixin:
+    def get_expression_fields(self, Model):
+        metadata = Schema.get_collection_metadata(Model._meta.db_table)
+        if metadata is None:
+            return {}
+        return {name: field for name, field in metadata.smart_fields.items() if field.get('expression') is not None}
+
+    def get_filters_fields(self, filters):
+        if 'aggregator' in filters:
+            return {name for condition in filters['conditions'] for name in self.get_filters_fields(condition)}
+        return {filters['field'].split(':')[0]}
+
+    def get_expression_fields_for_request(self, params, Model):
+        # Notice: only the serialized, filtered and sorted fields are computed, not the ones of stats or counts
+        names = set()
+        lookup = f'fields[{Model._meta.db_table}]'
+        if lookup in params:
+            names.update(params[lookup].split(','))
+        if params.get('filters'):
+            names.update(self.get_filters_fields(json.loads(params['filters'])))
+        if params.get('sort'):
+            names.add(params['sort'].lstrip('-').split('.')[0])
+        return names
+
+    def annotate_expression_fields(self, queryset, Model, names=None):
+        annotations = {
+            name: field['expression'] for name, field in self.get_expression_fields(Model).items()
+            if names is None or name in names
+        }
+        if annotations:
+            queryset = queryset.annotate(**annotations)
+        return queryset
+
+    def annotate_serialized_expression_fields(self, queryset, Model, params):
+        # Notice: without requested fields all the attributes are serialized, as in the detail view
+        if f'fields[{Model._meta.db_table}]' in params:
+            return queryset
+        names = set(self.get_expression_fields(Model)) - self.get_expression_fields_for_request(params, Model)
+        return self.annotate_expression_fields(queryset, Model, names) if names else queryset
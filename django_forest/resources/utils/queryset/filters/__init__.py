@@ -12,7 +12,4 @@ class FiltersMixin(ConditionsMixin):
         if 'timezone' in params:
             tz = get_timezone(params['timezone'])
 
-        if 'aggregator' in filters:
-            return self.handle_aggregator(filters, Model, tz)
-
-        return self.get_expression(filters, Model, tz)
+        return self.get_compiled_filters(filters, Model, tz)
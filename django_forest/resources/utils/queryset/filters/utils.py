@@ -1,6 +1,10 @@
+import json
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from django.db.models import Q
 
+from django_forest.resources.utils.queryset.combine import fold_q, get_connector
 from django_forest.resources.utils.queryset.filters.date import DatesMixin
 from django_forest.resources.utils.queryset.filters.date.factory import ConditionFactory as DateConditionFactory
 from django_forest.utils import get_association_field
@@ -41,11 +45,17 @@ INSENSITIVE_OPERATORS = {
     'in': '__in',
 }
 
+COMPILED_FILTERS_MAX_SIZE = 1000
+
 
 class ConditionsMixin(DatesMixin):
     DATETIME_FMT = "%Y-%m-%dT%H:%M:%S.%fZ"
     DATE_FMT = "%Y-%m-%d"
 
+    # Notice: (resource, canonical filters) -> compiled template, shared by the requests (user filters and scopes)
+    compiled_filters = OrderedDict()
+    _compiled_filters_lock = threading.Lock()
+
     def get_basic_expression(self, field, field_type, operator, value):
         operators = INSENSITIVE_OPERATORS if isinstance(value, str) else OPERATORS
 
@@ -151,29 +161,92 @@ class ConditionsMixin(DatesMixin):
         field = condition['field'].replace(':', '__')
 
         resource = Model._meta.db_table
-        collection = Schema.get_collection(resource)
-        smart_fields = {x['field']: x for x in collection['fields'] if x['is_virtual']}
-        if field.split("__")[0] in smart_fields.keys():
+        smart_fields = Schema.get_collection_metadata(resource).smart_fields
+        smart_field = smart_fields.get(field.split("__")[0])
+        # Notice: expression smart fields are annotated, they are filtered as regular fields
+        if smart_field is not None and ('filter' in smart_field or smart_field.get('expression') is None):
             return self.get_expression_smart_field(smart_fields, condition, resource)
         else:
             return self.get_expression_field(condition, Model, tz)
 
     def handle_aggregator(self, filters, Model, tz):
-        q_objects = Q()
+        pairs = []
         for condition in filters['conditions']:
             if "aggregator" in condition:
-                if condition['aggregator'] == 'or':
-                    q_objects |= self.handle_aggregator(condition, Model, tz)
-                else:
-                    q_objects &= self.handle_aggregator(condition, Model, tz)
+                pairs.append((get_connector(condition['aggregator']), self.handle_aggregator(condition, Model, tz)))
             else:
-                if filters['aggregator'] == 'or':
-                    q_objects |= self.get_expression(condition, Model, tz)
-                else:
-                    q_objects &= self.get_expression(condition, Model, tz)
-        return q_objects
+                pairs.append((get_connector(filters['aggregator']), self.get_expression(condition, Model, tz)))
+        return fold_q(pairs, Model)
+
+    def is_dynamic_condition(self, condition, Model):
+        # Notice: relative dates depend on the request time and timezone, python smart field filters on their method
+        if condition['operator'] in DateConditionFactory.OPERATORS:
+            return True
+        smart_field = Schema.get_collection_metadata(Model._meta.db_table).smart_fields.get(
+            condition['field'].split(':')[0]
+        )
+        return smart_field is not None and ('filter' in smart_field or smart_field.get('expression') is None)
+
+    def compile_condition(self, condition, Model):
+        if self.is_dynamic_condition(condition, Model):
+            return condition
+        return self.get_expression(condition, Model, None)
+
+    def compile_aggregator(self, filters, Model):
+        # Notice: same combination as handle_aggregator, nested aggregators are combined with their own aggregator
+        template = []
+        for condition in filters['conditions']:
+            aggregator = condition['aggregator'] if 'aggregator' in condition else filters['aggregator']
+            template.append((aggregator, self.compile_filters(condition, Model)))
+
+        if all(isinstance(child, Q) for _, child in template):
+            return self.bind_filters(template, Model, None)
+        return template
+
+    def compile_filters(self, filters, Model):
+        """Return a Q for static filters, else a template (condition or [(aggregator, template)]) to bind."""
+        if 'aggregator' in filters:
+            return self.compile_aggregator(filters, Model)
+        return self.compile_condition(filters, Model)
+
+    def bind_filters(self, template, Model, tz):
+        if isinstance(template, Q):
+            return template
+        if isinstance(template, dict):
+            return self.get_expression(template, Model, tz)
+
+        return fold_q([
+            (get_connector(aggregator), self.bind_filters(child, Model, tz)) for aggregator, child in template
+        ], Model)
+
+    def get_compiled_filters(self, filters, Model, tz):
+        key = (Model._meta.db_table, json.dumps(filters, sort_keys=True, default=str))
+        with self._compiled_filters_lock:
+            template = self.compiled_filters.get(key)
+            if template is not None:
+                # Notice: least recently used first, the filters used again are evicted last
+                self.compiled_filters.move_to_end(key)
+
+        if template is None:
+            template = self.compile_filters(filters, Model)
+            with self._compiled_filters_lock:
+                self.compiled_filters[key] = template
+                while len(self.compiled_filters) > COMPILED_FILTERS_MAX_SIZE:
+                    self.compiled_filters.popitem(last=False)
+        return self.bind_filters(template, Model, tz)
 
     def get_field_type(self, field, Model):
+        metadata = Schema.get_collection_metadata(Model._meta.db_table)
+        if metadata is None:
+            return self.get_model_field_type(field, Model)
+
+        if field in metadata.smart_fields:
+            return metadata.smart_fields[field]['type']
+        if field not in metadata.field_types:
+            metadata.field_types[field] = self.get_model_field_type(field, Model)
+        return metadata.field_types[field]
+
+    def get_model_field_type(self, field, Model):
         if ':' in field:
             fields = field.split(':')
             RelatedModel = get_association_field(Model, fields[0]).related_model
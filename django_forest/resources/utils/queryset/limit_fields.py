@@ -1,11 +1,26 @@
+from django_forest.utils.schema import Schema
+
+
 class LimitFieldsMixin:
+    def get_smart_fields_versions(self, requested_fields, Model):
+        # Notice: the version columns of the cached smart fields are loaded with the records
+        metadata = Schema.get_collection_metadata(Model._meta.db_table)
+        if metadata is None:
+            return []
+        smart_fields = [metadata.smart_fields[x] for x in requested_fields if x in metadata.smart_fields]
+        return [x['cache']['version'] for x in smart_fields if x.get('cache') and x['cache'].get('version')]
+
     def handle_fields(self, params, lookup, Model, queryset):
         args = []
         fields_name = [x.name for x in Model._meta.get_fields()]
-        for param in params[lookup].split(','):
+        requested_fields = params[lookup].split(',')
+        for param in requested_fields:
             if param in fields_name:
                 args.append(param)
+        args += self.get_smart_fields_versions(requested_fields, Model)
 
+        # Notice: only load the requested fields of the joined relationships
+        args += self.get_select_related_only(params, Model)
         return queryset.only(*args)
 
     def handle_context(self, Model, queryset):
@@ -1,12 +1,131 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.exceptions import EmptyResultSet, FieldDoesNotExist
+from django.db.models import F, Q
+
+from django_forest.utils.forest_setting import get_forest_setting
+from django_forest.utils.schema import Schema
+
+KEYSET_BOUNDARIES_MAX_SIZE = 1000
+# Notice: records inserted, deleted or updated since would shift the pages, only the next page of a recent fetch
+# is sought
+KEYSET_BOUNDARY_MAX_AGE = 60
+
+
 class PaginationMixin:
-    def get_pagination(self, params, queryset):
+    # Notice: last (sort value, pk) of the pages already served, and when, per query, page size and page number
+    keyset_boundaries = OrderedDict()
+    _keyset_boundaries_lock = threading.Lock()
+
+    def get_offset_pagination(self, queryset, page_number, page_size):
+        _from = (page_number - 1) * page_size
+        _to = page_number * page_size
+
+        return queryset[_from:_to]
+
+    def is_keyset_pagination(self, Model):
+        collection = Schema.get_collection(Model._meta.db_table)
+        return collection is not None and collection['pagination_type'] == 'cursor'
+
+    def get_keyset_field(self, Model, name):
+        if name == 'pk':
+            return Model._meta.pk
+        try:
+            return Model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+
+    def is_keyset_lookup(self, Model, lookup):
+        for name in lookup.split('__'):
+            field = self.get_keyset_field(Model, name)
+            # Notice: nullable columns are not ordered the same way by all databases, they can't be sought
+            if field is None or not field.concrete or field.null or field.many_to_many:
+                return False
+            if field.is_relation:
+                Model = field.related_model
+        return not field.is_relation
+
+    def get_keyset_ordering(self, queryset, Model):
+        ordering = queryset.query.order_by or Model._meta.ordering
+        if len(ordering) == 1 and isinstance(ordering[0], str):
+            if self.is_keyset_lookup(Model, ordering[0].lstrip('-')):
+                return ordering[0]
+        return None
+
+    def is_keyset_pk(self, Model, ordering):
+        return ordering.lstrip('-') in ('pk', Model._meta.pk.name)
+
+    def get_keyset_filter(self, Model, ordering, boundary):
+        lookup = ordering.lstrip('-')
+        operator = 'lt' if ordering.startswith('-') else 'gt'
+        value, pk = boundary
+        if self.is_keyset_pk(Model, ordering):
+            return Q(**{f'pk__{operator}': pk})
+        return Q(**{f'{lookup}__{operator}': value}) | Q(**{lookup: value, f'pk__{operator}': pk})
+
+    def get_keyset_queryset(self, queryset, Model, ordering):
+        if self.is_keyset_pk(Model, ordering):
+            return queryset.order_by(ordering)
+        # Notice: the primary key breaks ties, so rows never shift between pages
+        # the annotation loads the sort value even when the column is not requested
+        queryset = queryset.annotate(forest_keyset_value=F(ordering.lstrip('-')))
+        return queryset.order_by(ordering, '-pk' if ordering.startswith('-') else 'pk')
+
+    def remember_keyset_boundary(self, key, page):
+        # Notice: evaluate the page now, the view reuses the queryset results cache
+        if len(page):
+            last = page[len(page) - 1]
+            with self._keyset_boundaries_lock:
+                boundary = (getattr(last, 'forest_keyset_value', None), last.pk)
+                self.keyset_boundaries[key] = (boundary, time.monotonic())
+                self.keyset_boundaries.move_to_end(key)
+                while len(self.keyset_boundaries) > KEYSET_BOUNDARIES_MAX_SIZE:
+                    self.keyset_boundaries.popitem(last=False)
+
+    def get_keyset_boundary(self, key):
+        max_age = float(get_forest_setting('FOREST_KEYSET_BOUNDARY_MAX_AGE', KEYSET_BOUNDARY_MAX_AGE))
+        with self._keyset_boundaries_lock:
+            if key not in self.keyset_boundaries:
+                return None
+            boundary, remembered_at = self.keyset_boundaries[key]
+            if time.monotonic() - remembered_at > max_age:
+                del self.keyset_boundaries[key]
+                return None
+            # Notice: least recently used first, the boundaries used again are evicted last
+            self.keyset_boundaries.move_to_end(key)
+            return boundary
+
+    def get_keyset_pagination(self, queryset, Model, ordering, page_number, page_size):
+        queryset = self.get_keyset_queryset(queryset, Model, ordering)
+        try:
+            query = str(queryset.query)
+        except EmptyResultSet:
+            return self.get_offset_pagination(queryset, page_number, page_size)
+
+        boundary = self.get_keyset_boundary((query, page_size, page_number - 1))
+        if boundary is not None:
+            page = queryset.filter(self.get_keyset_filter(Model, ordering, boundary))[:page_size]
+        else:
+            # Notice: random page jumps fall back to OFFSET
+            page = self.get_offset_pagination(queryset, page_number, page_size)
+        self.remember_keyset_boundary((query, page_size, page_number), page)
+        return page
+
+    def get_pagination(self, params, queryset, Model):
         if 'page[number]' in params and 'page[size]' in params:
             page_number = int(params['page[number]'])
             page_size = int(params['page[size]'])
+            if not queryset.ordered:
+                # Notice: the database order is unpredictable (joined relationships), keep the pages stable
+                queryset = queryset.order_by('pk')
 
-            _from = (page_number - 1) * page_size
-            _to = page_number * page_size
+            if self.is_keyset_pagination(Model):
+                ordering = self.get_keyset_ordering(queryset, Model)
+                if ordering is not None:
+                    return self.get_keyset_pagination(queryset, Model, ordering, page_number, page_size)
 
-            return queryset[_from:_to]
+            return self.get_offset_pagination(queryset, page_number, page_size)
 
         return queryset
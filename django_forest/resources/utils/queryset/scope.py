@@ -10,4 +10,4 @@ class ScopeMixin(ConditionsMixin):
         filters = ScopeManager.get_scope_for_user(token, Model._meta.db_table)
         if filters is not None:
             tz = get_timezone(request.GET['timezone'])
-            return self.handle_aggregator(filters, Model, tz)
+            return self.get_compiled_filters(filters, Model, tz)
@@ -2,23 +2,18 @@ import sys
 from distutils.util import strtobool
 from uuid import UUID
 
-from django.db.models import Q
+from django.db.models import ForeignObjectRel, Q
 
 from django_forest.utils.collection import Collection
-from ..in_search_fields import in_search_fields
+from django_forest.utils.models import Models
 from django_forest.utils.schema import Schema
+from .combine import combine_q
+from .search_backends import get_search_backend
 
 
 class SearchMixin:
     def get_fields_to_search(self, collection):
-        fields_to_search = []
-        for x in collection['fields']:
-            if x['type'] in ('String', 'Number', 'Enum') \
-                    and not x['reference'] \
-                    and not x['is_virtual'] \
-                    and in_search_fields(x['field'], collection['search_fields']):
-                fields_to_search.append(x)
-        return fields_to_search
+        return Schema.get_collection_metadata(collection['name']).search_fields
 
     def is_number(self, search):
         is_number = True
@@ -81,26 +76,56 @@ class SearchMixin:
         return lookup_field
 
     def handle_field(self, search, field, related_field_name=None):
-        q_objects = Q()
-
         lookup_field = self.get_lookup_field(field['field'], related_field_name)
         if field['type'] == 'Enum':
-            q_objects |= self.handle_enum(search, field['enums'], lookup_field)
+            return self.handle_enum(search, field['enums'], lookup_field)
         elif field['type'] == 'Number':
-            q_objects |= self.handle_number(search, lookup_field)
-        else:
-            q_objects |= self.handle_string(search, lookup_field)
-
-        return q_objects
+            return self.handle_number(search, lookup_field)
+        return self.handle_string(search, lookup_field)
+
+    def get_search_backend(self, search, resource):
+        # Notice: uuid are exact matches, keep the default conditions
+        if self.is_uuid(search):
+            return None
+        return get_search_backend(resource)
+
+    def handle_search_backend(self, backend, search, resource, fields_to_search, related_field_name=None):
+        q_objects = []
+        string_fields = []
+        for field in fields_to_search:
+            if field['type'] == 'String':
+                string_fields.append(field['field'])
+            else:
+                q_objects.append(self.handle_field(search, field, related_field_name))
+
+        q_objects.append(backend.get_q(search, Models.get(resource), string_fields, related_field_name))
+        return combine_q(q_objects, Q.OR)
+
+    def get_search_extended_columns(self, related_field):
+        # Notice: ForeignKey and OneToOneField
+        if related_field.concrete:
+            return related_field.attname, related_field.target_field.attname
+        # Notice: their reverse relations
+        if isinstance(related_field, ForeignObjectRel):
+            return related_field.field.target_field.attname, related_field.field.attname
+        return None
+
+    def handle_search_extended_field(self, search, related_field):
+        RelatedModel = related_field.related_model
+        columns = self.get_search_extended_columns(related_field)
+        if columns is None:
+            return self.fill_conditions(search, RelatedModel._meta.db_table, related_field.name)
+
+        conditions = self.fill_conditions(search, RelatedModel._meta.db_table)
+        if not conditions:
+            return Q()
+        # Notice: one subquery per relation, instead of joining every related table in the same query
+        column, related_column = columns
+        return Q(**{f'{column}__in': RelatedModel._base_manager.filter(conditions).values(related_column)})
 
     def handle_search_extended(self, search, Model):
-        q_objects = Q()
-
         related_fields = [x for x in Model._meta.get_fields() if x.is_relation and not x.many_to_many]
-        for related_field in related_fields:
-            q_objects |= self.fill_conditions(search, related_field.related_model._meta.db_table, related_field.name)
-
-        return q_objects
+        return combine_q([self.handle_search_extended_field(search, x) for x in related_fields], Q.OR)
 
     def add_smart_field(self, smart_field, resource, search):
         q_object = Q()
@@ -112,34 +137,33 @@ class SearchMixin:
         return q_object
 
     def add_smart_fields(self, collection, resource, search):
-        q_objects = Q()
-        smart_fields = [x for x in collection['fields'] if x['is_virtual']]
-        for smart_field in smart_fields:
-            if 'search' in smart_field:
-                q_objects |= self.add_smart_field(smart_field, resource, search)
-
-        return q_objects
+        smart_fields = Schema.get_collection_metadata(resource).smart_fields.values()
+        return combine_q([
+            self.add_smart_field(smart_field, resource, search)
+            for smart_field in smart_fields if 'search' in smart_field
+        ], Q.OR)
 
     def fill_conditions(self, search, resource, related_field_name=None):
-        q_objects = Q()
-
         collection = Schema.get_collection(resource)
         fields_to_search = self.get_fields_to_search(collection)
-        for field in fields_to_search:
-            q_objects |= self.handle_field(search, field, related_field_name)
+        backend = self.get_search_backend(search, resource)
+        if backend is None:
+            q_objects = [self.handle_field(search, field, related_field_name) for field in fields_to_search]
+        else:
+            q_objects = [self.handle_search_backend(backend, search, resource, fields_to_search, related_field_name)]
 
         # Notice handle smart fields
-        q_objects |= self.add_smart_fields(collection, resource, search)
+        q_objects.append(self.add_smart_fields(collection, resource, search))
 
-        return q_objects
+        # Notice: a single OR node, whatever the number of searched columns
+        return combine_q(q_objects, Q.OR)
 
     def get_search(self, params, Model):
-        q_objects = Q()
         search = params['search']
 
-        q_objects |= self.fill_conditions(search, Model._meta.db_table)
+        q_objects = [self.fill_conditions(search, Model._meta.db_table)]
 
         if 'searchExtended' in params and strtobool(str(params['searchExtended'])):
-            q_objects |= self.handle_search_extended(search, Model)
+            q_objects.append(self.handle_search_extended(search, Model))
 
-        return q_objects
+        return combine_q(q_objects, Q.OR)
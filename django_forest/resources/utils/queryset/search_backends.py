@@ -0,0 +1,168 @@
+import logging
+from abc import ABC, abstractmethod
+
+from django.apps import apps
+from django.db import connections, router
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from django_forest.utils.forest_setting import get_forest_setting
+from django_forest.utils.models import Models
+
+try:
+    from django.contrib.postgres.search import SearchQuery, SearchVector
+except ImportError:
+    # Notice: psycopg is only installed along PostgreSQL
+    SearchQuery = SearchVector = None
+
+# Get an instance of a logger
+logger = logging.getLogger(__name__)
+
+
+class SearchBackend(ABC):
+    """Build the search condition on the String fields of a collection.
+
+    Number and Enum fields, smart fields and uuid searches keep the default conditions.
+    """
+
+    # Notice: (backend, connection alias) -> is the backend supported by the database, checked once
+    _availability = {}
+
+    @classmethod
+    def is_available(cls, connection):
+        key = (cls, connection.alias)
+        if key not in SearchBackend._availability:
+            SearchBackend._availability[key] = cls.check_availability(connection)
+        return SearchBackend._availability[key]
+
+    @classmethod
+    def check_availability(cls, connection):
+        return True
+
+    def get_lookup(self, lookup, related_field_name=None):
+        if related_field_name is not None:
+            return f'{related_field_name}__{lookup}'
+        return lookup
+
+    @abstractmethod
+    def get_q(self, search, Model, fields, related_field_name=None):
+        """Return the condition of the records matching the search on one of the fields."""
+
+    def get_field_q(self, search, Model, field):
+        """Return the condition of the records matching the search on the field, used by the search decorators."""
+        return self.get_q(search, Model, [field])
+
+
+class FullTextSearchBackend(SearchBackend):
+    """PostgreSQL full-text search, on a stored tsvector column when vector_field is set."""
+
+    def __init__(self, config=None, search_type='websearch', vector_field=None):
+        self.config = config
+        self.search_type = search_type
+        self.vector_field = vector_field
+
+    @classmethod
+    def check_availability(cls, connection):
+        return SearchQuery is not None and connection.vendor == 'postgresql'
+
+    def get_query(self, search):
+        return SearchQuery(search, config=self.config, search_type=self.search_type)
+
+    def get_fields_q(self, query, Model, fields, related_field_name=None):
+        if not fields:
+            return Q()
+        queryset = Model.objects.annotate(forest_search=SearchVector(*fields, config=self.config))
+        return Q(**{self.get_lookup('pk__in', related_field_name): queryset.filter(forest_search=query).values('pk')})
+
+    def get_q(self, search, Model, fields, related_field_name=None):
+        query = self.get_query(search)
+        if self.vector_field is not None:
+            return Q(**{self.get_lookup(self.vector_field, related_field_name): query})
+        return self.get_fields_q(query, Model, fields, related_field_name)
+
+    def get_field_q(self, search, Model, field):
+        # Notice: the stored vector mixes the searched fields, each field is matched on its own
+        return self.get_fields_q(self.get_query(search), Model, [field])
+
+
+class TrigramSearchBackend(SearchBackend):
+    """PostgreSQL pg_trgm similarity, it requires django.contrib.postgres in INSTALLED_APPS."""
+
+    @classmethod
+    def check_availability(cls, connection):
+        if connection.vendor != 'postgresql' or not apps.is_installed('django.contrib.postgres'):
+            return False
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            return cursor.fetchone() is not None
+
+    def get_q(self, search, Model, fields, related_field_name=None):
+        q_objects = Q()
+        for field in fields:
+            q_objects |= Q(**{self.get_lookup(f'{field}__trigram_similar', related_field_name): search})
+        return q_objects
+
+
+class SqliteFts5SearchBackend(SearchBackend):
+    """SQLite FTS5, on a virtual table (<db_table>_fts by default) whose rowid is the primary key.
+
+    The columns of the virtual table are named as the columns of the model.
+    """
+
+    def __init__(self, table=None):
+        self.table = table
+
+    @classmethod
+    def check_availability(cls, connection):
+        if connection.vendor != 'sqlite':
+            return False
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+            return bool(cursor.fetchone()[0])
+
+    @staticmethod
+    def get_phrase(search):
+        # Notice: search the whole string as a phrase, FTS5 query syntax is not exposed
+        return '"{}"'.format(search.replace('"', '""'))
+
+    def get_match_q(self, Model, match, related_field_name=None):
+        table = self.table or f'{Model._meta.db_table}_fts'
+        sql = f'SELECT rowid FROM "{table}" WHERE "{table}" MATCH %s'
+        return Q(**{self.get_lookup('pk__in', related_field_name): RawSQL(sql, [match])})
+
+    def get_q(self, search, Model, fields, related_field_name=None):
+        return self.get_match_q(Model, self.get_phrase(search), related_field_name)
+
+    def get_field_q(self, search, Model, field):
+        # Notice: a column filter restricts the match to the column of the field
+        column = Model._meta.get_field(field).column
+        return self.get_match_q(Model, f'{{{column}}} : {self.get_phrase(search)}')
+
+
+SEARCH_BACKENDS = {
+    'full_text': FullTextSearchBackend,
+    'trigram': TrigramSearchBackend,
+    'sqlite_fts5': SqliteFts5SearchBackend,
+}
+
+
+def get_search_backend(resource):
+    """Return the search backend set for the collection in FOREST_SEARCH_BACKENDS, None for the default one.
+
+    Values are a backend name (or class dotted path), or a dict with a 'backend' key and the backend options.
+    A backend which is not supported by the database of the collection falls back to the default search.
+    """
+    options = get_forest_setting('FOREST_SEARCH_BACKENDS', {}).get(resource)
+    if options is None:
+        return None
+
+    if isinstance(options, str):
+        options = {'backend': options}
+    options = dict(options)
+    name = options.pop('backend')
+    Backend = SEARCH_BACKENDS[name] if name in SEARCH_BACKENDS else import_string(name)
+    if not Backend.is_available(connections[router.db_for_read(Models.get(resource))]):
+        logger.warning(f'The {name} search backend of {resource} is not available, the default search is used')
+        return None
+    return Backend(**options)
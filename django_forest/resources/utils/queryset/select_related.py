@@ -0,0 +1,35 @@
+from django_forest.utils import get_association_field
+from django_forest.utils.schema import Schema
+
+
+class SelectRelatedMixin:
+    def is_related_field_requested(self, field, requested_fields):
+        return not field['is_virtual'] \
+            and (requested_fields is None or field['field'] in requested_fields)
+
+    def get_select_related(self, params, Model):
+        metadata = Schema.get_collection_metadata(Model._meta.db_table)
+        if metadata is None:
+            return []
+
+        lookup = f'fields[{Model._meta.db_table}]'
+        requested_fields = params[lookup].split(',') if lookup in params else None
+        # Notice: BelongsTo and HasOne relationships are included by the serializer
+        relationships = metadata.single_relationships
+        return [x['field'] for x in relationships if self.is_related_field_requested(x, requested_fields)]
+
+    def get_select_related_only(self, params, Model):
+        args = []
+        for related_field in self.get_select_related(params, Model):
+            lookup = f'fields[{related_field}]'
+            if lookup in params:
+                RelatedModel = get_association_field(Model, related_field).related_model
+                fields_name = [x.name for x in RelatedModel._meta.get_fields() if x.concrete]
+                args += [f'{related_field}__{x}' for x in params[lookup].split(',') if x in fields_name]
+        return args
+
+    def handle_select_related(self, params, Model, queryset):
+        select_related = self.get_select_related(params, Model)
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        return queryset
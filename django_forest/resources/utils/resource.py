@@ -2,12 +2,13 @@ import logging
 
 from django.http import JsonResponse
 
+from django_forest.resources.utils.count import CountMixin
 from django_forest.utils.views.base import BaseView
 
 logger = logging.getLogger(__name__)
 
 
-class ResourceView(BaseView):
+class ResourceView(CountMixin, BaseView):
     def dispatch(self, request, resource, *args, **kwargs):
         try:
             self.Model = self.get_model(resource)
@@ -21,8 +22,9 @@ class ResourceView(BaseView):
         try:
             # enhance queryset (compute scope)
             queryset = self.enhance_queryset(queryset, self.Model, params, request)
+            count = self.count(queryset, request)
         except Exception as e:
             logger.exception(e)
             return self.error_response(e)
         else:
-            return JsonResponse({'count': queryset.count()}, safe=False)
+            return JsonResponse(count, safe=False)
@@ -1,15 +1,226 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from functools import partial
+
+from django.db import connections
+
 from django_forest.utils.collection import Collection
+from django_forest.utils.forest_setting import get_forest_setting
+from django_forest.utils.models import Models
 from django_forest.utils.schema import Schema
+from django_forest.utils.smart_field_cache import SmartFieldCache
+
+# Notice: a single bounded pool shared by the requests. A pool whose getters timed out is dropped: its workers
+# end along their getters, and a new pool serves the next requests. While FOREST_SMART_FIELDS_WORKERS getters
+# are still running after their timeout, the smart fields are computed in the request thread.
+_executor = None
+_executor_workers = 0
+_abandoned_futures = 0
+_executor_lock = threading.Lock()
+
+
+def get_smart_fields_executor(workers):
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _abandoned_futures >= workers:
+            return None
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='forest-smart-fields')
+            _executor_workers = workers
+        return _executor
+
+
+def release_abandoned_future(future):
+    global _abandoned_futures
+    with _executor_lock:
+        _abandoned_futures -= 1
+
+
+def abandon_smart_fields_futures(executor, futures):
+    global _executor, _executor_workers, _abandoned_futures
+    with _executor_lock:
+        _abandoned_futures += len(futures)
+        # Notice: the pool is not shut down, the requests still using it can submit their getters
+        if _executor is executor:
+            _executor = None
+            _executor_workers = 0
+    for future in futures:
+        future.add_done_callback(release_abandoned_future)
+
+
+def shutdown_smart_fields_executor():
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+        _executor = None
+        _executor_workers = 0
+
+
+def release_worker_connections():
+    # Notice: the workers keep their connection between the calls, like a request thread, only the broken ones
+    # are closed
+    for connection in connections.all():
+        if connection.connection is not None and connection.errors_occurred:
+            connection.close()
 
 
 class SmartFieldMixin:
-    def _handle_get_method(self, smart_field, item, resource):
-        if 'get' in smart_field:
-            method = smart_field['get']
-            if isinstance(method, str):
-                setattr(item, smart_field['field'], getattr(Collection._registry[resource], method)(item))
-            elif callable(method):
-                setattr(item, smart_field['field'], method(item))
+    def _get_smart_field_method(self, smart_field, key, resource):
+        method = smart_field.get(key)
+        if isinstance(method, str):
+            return getattr(Collection._registry[resource], method)
+        return method if callable(method) else None
+
+    def _is_batched_smart_field(self, smart_field):
+        return 'get_many' in smart_field or 'get_key' in smart_field
+
+    def _load_smart_relationship(self, smart_field, resource, items):
+        # Notice: the targets of the whole page are fetched with a single query on the referenced collection
+        reference, key_field = smart_field['reference'].split('.')
+        RelatedModel = Models.get(reference)
+        to_python = RelatedModel._meta.get_field(key_field).to_python
+        get_key = self._get_smart_field_method(smart_field, 'get_key', resource)
+        keys = {item.pk: get_key(item) for item in items}
+
+        targets = {}
+        values = {to_python(key) for key in keys.values() if key is not None}
+        if values:
+            for target in RelatedModel._base_manager.filter(**{f'{key_field}__in': values}):
+                targets[getattr(target, key_field)] = target
+        return {pk: None if key is None else targets.get(to_python(key)) for pk, key in keys.items()}
+
+    def _get_smart_field_batch_method(self, smart_field, resource):
+        if 'get_key' in smart_field:
+            return partial(self._load_smart_relationship, smart_field, resource)
+        return self._get_smart_field_method(smart_field, 'get_many', resource)
+
+    def _get_uncached_items(self, items, smart_field, resource):
+        if not smart_field.get('cache'):
+            return items
+
+        uncached_items = []
+        for item, value in zip(items, SmartFieldCache.get_values(resource, smart_field, items)):
+            if value is SmartFieldCache.MISSING:
+                uncached_items.append(item)
+            else:
+                setattr(item, smart_field['field'], value)
+        return uncached_items
+
+    def _get_smart_field_calls(self, items, smart_fields, resource):
+        # Notice: a call computes a smart field of one item, or of all the items with get_many and get_key
+        calls = []
+        for smart_field in smart_fields:
+            uncached_items = self._get_uncached_items(items, smart_field, resource)
+            if self._is_batched_smart_field(smart_field):
+                method = self._get_smart_field_batch_method(smart_field, resource)
+                calls.extend([(smart_field, method, uncached_items, resource)] if uncached_items else [])
+                continue
+            method = self._get_smart_field_method(smart_field, 'get', resource)
+            if method is not None:
+                calls.extend((smart_field, method, [item], resource) for item in uncached_items)
+        return calls
+
+    def _call_smart_field(self, call):
+        smart_field, method, items, resource = call
+        # Notice: get_many receives all the items at once and returns their values by pk
+        return method(items) if self._is_batched_smart_field(smart_field) else method(items[0])
+
+    def _set_smart_field_value(self, call, value):
+        smart_field, method, items, resource = call
+        values = [value.get(item.pk) for item in items] if self._is_batched_smart_field(smart_field) else [value]
+        for item, item_value in zip(items, values):
+            setattr(item, smart_field['field'], item_value)
+        if smart_field.get('cache'):
+            SmartFieldCache.set_values(resource, smart_field, items, values)
+
+    def _set_smart_field_placeholder(self, call):
+        smart_field, method, items, resource = call
+        for item in items:
+            setattr(item, smart_field['field'], smart_field.get('placeholder'))
+
+    def _get_smart_field_timeout(self, smart_field):
+        return smart_field.get('timeout', get_forest_setting('FOREST_SMART_FIELDS_TIMEOUT', None))
+
+    def _get_smart_fields_workers(self):
+        return int(get_forest_setting('FOREST_SMART_FIELDS_WORKERS', 0))
+
+    def _get_smart_fields_executor(self, calls, async_calls):
+        workers = self._get_smart_fields_workers()
+        # Notice: a single getter also runs in the pool, along the coroutines
+        if workers <= 0 or len(calls) + min(len(async_calls), 1) < 2:
+            return None
+        return get_smart_fields_executor(workers)
+
+    def _call_smart_field_in_thread(self, call):
+        # Notice: the getters run with the connection of their worker, outside the transaction of the request,
+        # with ATOMIC_REQUESTS (or in an atomic block) its uncommitted writes are not visible to them
+        try:
+            return self._call_smart_field(call)
+        finally:
+            release_worker_connections()
+
+    def _wait_for_smart_field(self, call, future, started_at):
+        timeout = self._get_smart_field_timeout(call[0])
+        if timeout is not None:
+            timeout = max(0, started_at + timeout - time.monotonic())
+        try:
+            self._set_smart_field_value(call, future.result(timeout=timeout))
+        except FutureTimeoutError:
+            self._set_smart_field_placeholder(call)
+
+    def _release_smart_field_futures(self, executor, futures):
+        # Notice: the getters not started yet are cancelled, the ones still running are not waited for
+        running = [future for call, future in futures if not future.cancel() and not future.done()]
+        if running:
+            abandon_smart_fields_futures(executor, running)
+
+    def _run_smart_field_calls_in_pool(self, executor, calls, async_calls):
+        started_at = time.monotonic()
+        futures = [(call, executor.submit(self._call_smart_field_in_thread, call)) for call in calls]
+        try:
+            # Notice: the coroutines run in the request thread meanwhile, their timeouts overlap
+            if async_calls:
+                self._run_async_smart_field_calls(async_calls)
+            for call, future in futures:
+                self._wait_for_smart_field(call, future, started_at)
+        finally:
+            self._release_smart_field_futures(executor, futures)
+
+    async def _await_smart_field(self, call):
+        try:
+            value = await asyncio.wait_for(self._call_smart_field(call), self._get_smart_field_timeout(call[0]))
+        except asyncio.TimeoutError:
+            self._set_smart_field_placeholder(call)
+        else:
+            self._set_smart_field_value(call, value)
+
+    async def _gather_smart_field_calls(self, calls):
+        await asyncio.gather(*[self._await_smart_field(call) for call in calls])
+
+    def _run_async_smart_field_calls(self, calls):
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(self._gather_smart_field_calls(calls))
+        finally:
+            loop.close()
+
+    def _run_smart_field_calls(self, calls):
+        async_calls = [call for call in calls if asyncio.iscoroutinefunction(call[1])]
+        calls = [call for call in calls if not asyncio.iscoroutinefunction(call[1])]
+        executor = self._get_smart_fields_executor(calls, async_calls)
+        if executor is not None:
+            self._run_smart_field_calls_in_pool(executor, calls, async_calls)
+            return
+
+        if async_calls:
+            self._run_async_smart_field_calls(async_calls)
+        for call in calls:
+            self._set_smart_field_value(call, self._call_smart_field(call))
 
     def _handle_set_method(self, smart_field, instance, value, resource):
         if 'set' in smart_field:
@@ -21,12 +232,13 @@ class SmartFieldMixin:
         return instance
 
     def _add_smart_fields(self, item, smart_fields, resource):
-        for smart_field in smart_fields:
-            self._handle_get_method(smart_field, item, resource)
+        self._run_smart_field_calls(self._get_smart_field_calls([item], smart_fields, resource))
 
-    def _get_smart_fields_for_request(self, collection, params=None):
+    def _add_smart_fields_many(self, items, smart_fields, resource):
+        self._run_smart_field_calls(self._get_smart_field_calls(list(items), smart_fields, resource))
 
-        fields = [field for field in collection['fields'] if field['is_virtual']]
+    def _get_smart_fields_for_request(self, collection, params=None):
+        fields = list(Schema.get_collection_metadata(collection['name']).smart_fields.values())
 
         if params is None:
             return fields
@@ -45,8 +257,7 @@ class SmartFieldMixin:
 
         # Don't bother adding anything if there are no smart fields
         if smart_fields and many:
-            for item in queryset:
-                self._add_smart_fields(item, smart_fields, resource)
+            self._add_smart_fields_many(queryset, smart_fields, resource)
         elif smart_fields:
             self._add_smart_fields(queryset, smart_fields, resource)
 
@@ -70,11 +281,13 @@ class SmartFieldMixin:
 
     def _handle_smart_field_for_relation(self, queryset, relation_field, collection_name, params, many):
         if many:
-            for item in queryset:
-                if getattr(item, relation_field["field"], None) is not None:
-                    self.handle_smart_fields(
-                        getattr(item, relation_field["field"]), collection_name, params, False, False
-                    )
+            # Notice: the related records of the whole page are computed at once, for the get_many methods
+            related_items = [
+                getattr(item, relation_field["field"]) for item in queryset
+                if getattr(item, relation_field["field"], None) is not None
+            ]
+            if related_items:
+                self.handle_smart_fields(related_items, collection_name, params, True, False)
         else:
             if getattr(queryset, relation_field["field"], None) is not None:
                 self.handle_smart_fields(
@@ -82,11 +295,7 @@ class SmartFieldMixin:
                 )
 
     def __get_relations_for_smart_fields(self, base_collection, params):
-        relations = [
-            field
-            for field in base_collection["fields"]
-            if field["relationship"] is not None and field["relationship"] in ["BelongsTo", "HasOne"]
-        ]
+        relations = Schema.get_collection_metadata(base_collection['name']).single_relationships
         # filter with asked fields in params (if set)
         if params is not None:
             relations = [
@@ -96,8 +305,7 @@ class SmartFieldMixin:
         return relations
 
     def update_smart_fields(self, instance, body, resource):
-        collection = Schema.get_collection(resource)
-        smart_fields = [x for x in collection['fields'] if x['is_virtual']]
+        smart_fields = Schema.get_collection_metadata(resource).smart_fields.values()
         for smart_field in smart_fields:
             if smart_field['field'] in body['data']['attributes'].keys():
                 value = body['data']['attributes'][smart_field['field']]
@@ -1,5 +1,4 @@
 import logging
-import csv
 
 from django_forest.resources.utils.csv import CsvMixin
 from django_forest.resources.utils.format import FormatFieldMixin
@@ -22,6 +21,10 @@ class CsvView(FormatFieldMixin, SmartFieldMixin, JsonApiSerializerMixin, CsvMixi
             # enhance queryset, ignoring any parameters about pagination
             queryset = self.enhance_queryset(queryset, self.Model, params, request, apply_pagination=False)
 
+            # Notice: stream the export chunk by chunk to keep a flat memory usage
+            if self.is_csv_streaming():
+                return self.csv_streaming_response(queryset, self.Model, params)
+
             # handle smart fields
             self.handle_smart_fields(queryset, self.Model._meta.db_table, parse_qs(params), many=True)
 
@@ -31,12 +34,4 @@ class CsvView(FormatFieldMixin, SmartFieldMixin, JsonApiSerializerMixin, CsvMixi
             logger.exception(e)
             return self.error_response(e)
         else:
-            response = self.csv_response(params['filename'])
-
-            field_names_requested = [x for x in params[f'fields[{self.Model._meta.db_table}]'].split(',')]
-            csv_header = params['header'].split(',')
-
-            writer = csv.DictWriter(response, fieldnames=field_names_requested)
-            writer.writerow(dict(zip(field_names_requested, csv_header)))
-            self.fill_csv(data, writer, params)
-            return response
+            return self.write_csv(data, self.Model, params)
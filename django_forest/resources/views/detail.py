@@ -21,7 +21,7 @@ class DetailView(SmartFieldMixin, FormatFieldMixin, JsonApiSerializerMixin, Reso
         scope_filters = self.get_scope(request, self.Model)
         if scope_filters is not None:
             queryset = queryset.filter(scope_filters)
-        queryset = queryset.filter(pk=pk)
+        queryset = self.annotate_expression_fields(queryset.filter(pk=pk), self.Model)
 
         if not len(queryset):
             raise Exception('Record does not exist or you don\'t have the right to query it')
@@ -7,6 +7,7 @@ from django_forest.resources.utils.json_api_serializer import JsonApiSerializerM
 from django_forest.resources.utils.query_parameters import parse_qs
 from django_forest.resources.utils.resource import ResourceView
 from django_forest.resources.utils.smart_field import SmartFieldMixin
+from django_forest.utils.count_cache import CountCache
 from django_forest.utils.schema.json_api_schema import JsonApiSchema
 
 logger = logging.getLogger(__name__)
@@ -21,7 +22,8 @@ class ListView(FormatFieldMixin, SmartFieldMixin, JsonApiSerializerMixin, Resour
 
         try:
             # enhance queryset
-            queryset = self.enhance_queryset(queryset, self.Model, params, request)
+            queryset = self.enhance_queryset(queryset, self.Model, params, request, apply_decorators=True,
+                                             apply_expression_fields=True)
 
             # handle smart fields
             self.handle_smart_fields(queryset, self.Model._meta.db_table, parse_qs(params), many=True)
@@ -30,7 +32,7 @@ class ListView(FormatFieldMixin, SmartFieldMixin, JsonApiSerializerMixin, Resour
             data = self.serialize(queryset, self.Model, params)
 
             # search decorator
-            data = self.decorators(data, self.Model, params)
+            data = self.decorators(data, self.Model, params, queryset)
         except Exception as e:
             logger.exception(e)
             return self.error_response(e)
@@ -61,4 +63,5 @@ class ListView(FormatFieldMixin, SmartFieldMixin, JsonApiSerializerMixin, Resour
         ids = self.get_ids_from_request(request, self.Model)
         # Notice: this does not run pre/post_delete signals
         queryset.filter(pk__in=ids).delete()
+        CountCache.invalidate(self.Model)
         return HttpResponse(status=204)
@@ -34,12 +34,12 @@ mocked_config = {
 
 class AuthenticationOidcConfigurationRetrieverTests(TestCase):
 
-    @mock.patch('requests.get', return_value=mocked_requests(mocked_config, 200))
+    @mock.patch('requests.Session.get', return_value=mocked_requests(mocked_config, 200))
     def test_retrieve(self, mocked_requests_get):
         configuration = retrieve()
         self.assertEqual(configuration, mocked_config)
 
-    @mock.patch('requests.get', return_value=mocked_requests({'error': 'error'}, 400))
+    @mock.patch('requests.Session.get', return_value=mocked_requests({'error': 'error'}, 400))
     def test_retrieve_error(self, mocked_requests_get):
         with self.assertRaises(Exception) as cm:
             retrieve()
@@ -26,18 +26,18 @@ class AuthenticationOidcDynamicClientRegistratorTests(TestCase):
             'registration_endpoint': 'https://api.development.forestadmin.com/oidc/reg'
         }
 
-    @mock.patch('requests.post', return_value=mocked_requests(mocked_client_credentials, 201))
+    @mock.patch('requests.Session.post', return_value=mocked_requests(mocked_client_credentials, 201))
     def test_register(self, mocked_requests_post):
         client_credentials = register(self.metadata)
         self.assertEqual(client_credentials, mocked_client_credentials)
 
-    @mock.patch('requests.post', return_value=mocked_requests({'foo': 'bar'}, 400))
+    @mock.patch('requests.Session.post', return_value=mocked_requests({'foo': 'bar'}, 400))
     def test_register_exception(self, mocked_requests_post):
         with self.assertRaises(Exception) as cm:
             register(self.metadata)
         self.assertEqual(cm.exception.args[0],'The registration to the authentication API failed, response: {"foo": "bar"}')
 
-    @mock.patch('requests.post', return_value=mocked_requests({'error': 'foo'}, 400))
+    @mock.patch('requests.Session.post', return_value=mocked_requests({'error': 'foo'}, 400))
     def test_register_error(self, mocked_requests_post):
         with self.assertRaises(Exception) as cm:
             register(self.metadata)
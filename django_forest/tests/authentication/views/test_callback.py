@@ -117,10 +117,11 @@ class AuthenticationCallbackViewTests(TestCase):
         self.retrieve_patcher.stop()
         self.register_patcher.stop()
 
+    @mock.patch('requests.Session.get', side_effect=mocked_requests_get)
     @mock.patch('oic.utils.time_util.utc_time_sans_frac', return_value=1623431559)
     @mock.patch('requests.request', return_value=mocked_requests(mocked_token_response, 200))
     @mock.patch('requests.get', side_effect=mocked_requests_get)
-    def test_get(self, mocked_requests_get, mocked_requests_request, mocked_utc_time_sans_frac):
+    def test_get(self, mocked_requests_get, mocked_requests_request, mocked_utc_time_sans_frac, mocked_session_get):
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 200)
         r = response.json()
@@ -133,10 +134,11 @@ class AuthenticationCallbackViewTests(TestCase):
         self.assertEqual(r['tokenData']['team'], 'Operations')
         self.assertEqual(r['tokenData']['rendering_id'], 1)
 
+    @mock.patch('requests.Session.get', side_effect=mocked_requests_get_not_found)
     @mock.patch('oic.utils.time_util.utc_time_sans_frac', return_value=1623431559)
     @mock.patch('requests.request', return_value=mocked_requests(mocked_token_response, 200))
     @mock.patch('requests.get', side_effect=mocked_requests_get_not_found)
-    def test_get_not_found(self, mocked_requests_get, mocked_requests_request, mocked_utc_time_sans_frac):
+    def test_get_not_found(self, mocked_requests_get, mocked_requests_request, mocked_utc_time_sans_frac, mocked_session_get):
         r = self.client.get(self.url)
         self.assertEqual(r.status_code, 503)
         r = r.json()
@@ -148,10 +150,11 @@ class AuthenticationCallbackViewTests(TestCase):
             ]
         })
 
+    @mock.patch('requests.Session.get', side_effect=mocked_requests_get_422)
     @mock.patch('oic.utils.time_util.utc_time_sans_frac', return_value=1623431559)
     @mock.patch('requests.request', return_value=mocked_requests(mocked_token_response, 200))
     @mock.patch('requests.get', side_effect=mocked_requests_get_422)
-    def test_get_422(self, mocked_requests_get, mocked_requests_request, mocked_utc_time_sans_frac):
+    def test_get_422(self, mocked_requests_get, mocked_requests_request, mocked_utc_time_sans_frac, mocked_session_get):
         r = self.client.get(self.url)
         self.assertEqual(r.status_code, 503)
         r = r.json()
@@ -163,10 +166,11 @@ class AuthenticationCallbackViewTests(TestCase):
             ]
         })
 
+    @mock.patch('requests.Session.get', side_effect=mocked_requests_get_bad_response_2fa)
     @mock.patch('oic.utils.time_util.utc_time_sans_frac', return_value=1623431559)
     @mock.patch('requests.request', return_value=mocked_requests(mocked_token_response, 200))
     @mock.patch('requests.get', side_effect=mocked_requests_get_bad_response_2fa)
-    def test_get_bad_response_2fa(self, mocked_requests_get, mocked_requests_request, mocked_utc_time_sans_frac):
+    def test_get_bad_response_2fa(self, mocked_requests_get, mocked_requests_request, mocked_utc_time_sans_frac, mocked_session_get):
         r = self.client.get(self.url)
         self.assertEqual(r.status_code, 503)
         r = r.json()
@@ -178,10 +182,11 @@ class AuthenticationCallbackViewTests(TestCase):
             ]
         })
 
+    @mock.patch('requests.Session.get', side_effect=mocked_requests_get_bad_response)
     @mock.patch('oic.utils.time_util.utc_time_sans_frac', return_value=1623431559)
     @mock.patch('requests.request', return_value=mocked_requests(mocked_token_response, 200))
     @mock.patch('requests.get', side_effect=mocked_requests_get_bad_response)
-    def test_get_bad_response(self, mocked_requests_get, mocked_requests_request, mocked_utc_time_sans_frac):
+    def test_get_bad_response(self, mocked_requests_get, mocked_requests_request, mocked_utc_time_sans_frac, mocked_session_get):
         r = self.client.get(self.url)
         self.assertEqual(r.status_code, 503)
         r = r.json()
@@ -193,10 +198,11 @@ class AuthenticationCallbackViewTests(TestCase):
             ]
         })
 
+    @mock.patch('requests.Session.get', side_effect=mocked_requests_get)
     @mock.patch('oic.utils.time_util.utc_time_sans_frac', return_value=1623431559)
     @mock.patch('requests.request', return_value=mocked_requests(mocked_token_response, 200))
     @mock.patch('requests.get', side_effect=mocked_requests_get)
-    def test_get_state_missing(self, mocked_requests_get, mocked_requests_request, mocked_utc_time_sans_frac):
+    def test_get_state_missing(self, mocked_requests_get, mocked_requests_request, mocked_utc_time_sans_frac, mocked_session_get):
         url = reverse('django_forest:authentication:callback')
         query = {
             'code': 'eslqHqk8Luo_3CIf5SanmXBpq_7ytlTV8HgoVFNPwUvmWKDiwnf9XV6Bo04zRon8',
@@ -213,10 +219,11 @@ class AuthenticationCallbackViewTests(TestCase):
             ]
         })
 
+    @mock.patch('requests.Session.get', side_effect=mocked_requests_get)
     @mock.patch('oic.utils.time_util.utc_time_sans_frac', return_value=1623431559)
     @mock.patch('requests.request', return_value=mocked_requests(mocked_token_response, 200))
     @mock.patch('requests.get', side_effect=mocked_requests_get)
-    def test_get_no_rendering_id(self, mocked_requests_get, mocked_requests_request, mocked_utc_time_sans_frac):
+    def test_get_no_rendering_id(self, mocked_requests_get, mocked_requests_request, mocked_utc_time_sans_frac, mocked_session_get):
         url = reverse('django_forest:authentication:callback')
         query = {
             'code': 'eslqHqk8Luo_3CIf5SanmXBpq_7ytlTV8HgoVFNPwUvmWKDiwnf9XV6Bo04zRon8',
@@ -234,10 +241,11 @@ class AuthenticationCallbackViewTests(TestCase):
             ]
         })
 
+    @mock.patch('requests.Session.get', side_effect=mocked_requests_get)
     @mock.patch('oic.utils.time_util.utc_time_sans_frac', return_value=1623431559)
     @mock.patch('requests.request', return_value=mocked_requests(mocked_token_response, 200))
     @mock.patch('requests.get', side_effect=mocked_requests_get)
-    def test_get_invalid_state(self, mocked_requests_get, mocked_requests_request, mocked_utc_time_sans_frac):
+    def test_get_invalid_state(self, mocked_requests_get, mocked_requests_request, mocked_utc_time_sans_frac, mocked_session_get):
         url = reverse('django_forest:authentication:callback')
         query = {
             'code': 'eslqHqk8Luo_3CIf5SanmXBpq_7ytlTV8HgoVFNPwUvmWKDiwnf9XV6Bo04zRon8',
@@ -255,10 +263,11 @@ class AuthenticationCallbackViewTests(TestCase):
             ]
         })
 
+    @mock.patch('requests.Session.get', side_effect=mocked_requests_get)
     @mock.patch('oic.utils.time_util.utc_time_sans_frac', return_value=1623427968)
     @mock.patch('requests.request', return_value=mocked_requests(mocked_token_response, 200))
     @mock.patch('requests.get', side_effect=mocked_requests_get)
-    def test_iat_issued_in_future_within_allowed_skew(self, mocked_requests_get, mocked_requests_request, mocked_utc_time_sans_frac):
+    def test_iat_issued_in_future_within_allowed_skew(self, mocked_requests_get, mocked_requests_request, mocked_utc_time_sans_frac, mocked_session_get):
         """
         Given an id_token that has an iat timestamp 1 second ahead of the current time,
         assert authentication is still successful.
@@ -266,10 +275,11 @@ class AuthenticationCallbackViewTests(TestCase):
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 200)
 
+    @mock.patch('requests.Session.get', side_effect=mocked_requests_get)
     @mock.patch('oic.utils.time_util.utc_time_sans_frac', return_value=1623427963)
     @mock.patch('requests.request', return_value=mocked_requests(mocked_token_response, 200))
     @mock.patch('requests.get', side_effect=mocked_requests_get)
-    def test_iat_issued_in_future_outside_allowed_skew(self, mocked_requests_get, mocked_requests_request, mocked_utc_time_sans_frac):
+    def test_iat_issued_in_future_outside_allowed_skew(self, mocked_requests_get, mocked_requests_request, mocked_utc_time_sans_frac, mocked_session_get):
         """
         Given an id_token that has an iat timestamp 11 second ahead of the current time,
         assert authentication is not successful.
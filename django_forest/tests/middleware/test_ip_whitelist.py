@@ -1,6 +1,9 @@
 import copy
+from datetime import datetime
 from unittest import mock
 
+import pytz
+
 from django.conf import settings
 from django.test import TestCase
 from django.urls import reverse
@@ -8,6 +11,7 @@ from django.urls import reverse
 from django_forest.tests.fixtures.schema import test_schema
 from django_forest.tests.middleware import mocked_ip_whitelist, mocked_config, \
     mocked_requests_permission
+from django_forest.utils.date import get_utc_now
 from django_forest.utils.ip_whitelist import IpWhitelist
 from django_forest.utils.middlewares import set_middlewares
 from django_forest.utils.permissions import Permission
@@ -81,75 +85,96 @@ class MiddlewareIpWhitelistTests(TestCase):
         Permission.renderings_cached = {}
         ScopeManager.cache = {}
         IpWhitelist.fetched = False
+        IpWhitelist.fetched_at = None
+        IpWhitelist.use_ip_whitelist = False
+        IpWhitelist.rules = []
         settings.MIDDLEWARE.remove('django_forest.middleware.PermissionMiddleware')
         settings.MIDDLEWARE.remove('django_forest.middleware.IpWhitelistMiddleware')
 
-    @mock.patch('requests.get', side_effect=mocked_requests_permission(mocked_config_server_error))
+    @mock.patch('requests.Session.get', side_effect=mocked_requests_permission(mocked_config_server_error))
     @mock.patch('django_forest.middleware.ip_whitelist.IpWhitelistMiddleware.get_client_ip', return_value='123.12.34.0')
     def test_server_error(self, mocked_ip, mocked_requests, mocked_decode):
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 403)
 
-    @mock.patch('requests.get', side_effect=mocked_requests_permission(mocked_config))
+    @mock.patch('requests.Session.get', side_effect=mocked_requests_permission(mocked_config))
     @mock.patch('django_forest.middleware.ip_whitelist.IpWhitelistMiddleware.get_client_ip', return_value='123.12.34.0')
     def test_no_rules(self, mocked_ip, mocked_requests, mocked_decode):
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 200)
 
-    @mock.patch('requests.get', side_effect=mocked_requests_permission(mocked_config_ip))
+    @mock.patch('requests.Session.get', side_effect=mocked_requests_permission(mocked_config_ip))
     @mock.patch('django_forest.middleware.ip_whitelist.IpWhitelistMiddleware.get_client_ip', return_value=None)
     def test_no_ip(self, mocked_ip, mocked_requests, mocked_decode):
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 403)
 
-    @mock.patch('requests.get', side_effect=mocked_requests_permission(mocked_config_ip))
+    @mock.patch('requests.Session.get', side_effect=mocked_requests_permission(mocked_config_ip))
     def test_machine_ip(self, mocked_requests, mocked_decode):
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 403)
 
-    @mock.patch('requests.get', side_effect=mocked_requests_permission(mocked_config_ip))
+    @mock.patch('requests.Session.get', side_effect=mocked_requests_permission(mocked_config_ip))
     @mock.patch('django_forest.middleware.ip_whitelist.IpWhitelistMiddleware.get_client_ip', return_value='123.12.34.0')
     def test_ip(self, mocked_ip, mocked_requests, mocked_decode):
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 200)
 
-    @mock.patch('requests.get', side_effect=mocked_requests_permission(mocked_config_ip))
+    @mock.patch('requests.Session.get', side_effect=mocked_requests_permission(mocked_config_ip))
     @mock.patch('django_forest.middleware.ip_whitelist.IpWhitelistMiddleware.get_client_ip', return_value='123.12.34.1')
     def test_ip_invalid(self, mocked_ip, mocked_requests, mocked_decode):
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 403)
 
-    @mock.patch('requests.get', side_effect=mocked_requests_permission(mocked_config_ip))
+    @mock.patch('django_forest.utils.ip_whitelist.IpWhitelist.get_rules', side_effect=Exception('down'))
+    @mock.patch('requests.Session.get', side_effect=mocked_requests_permission(mocked_config))
+    @mock.patch('django_forest.middleware.ip_whitelist.IpWhitelistMiddleware.get_client_ip', return_value='123.12.34.1')
+    def test_ip_invalid_last_known_good(self, mocked_ip, mocked_requests, mocked_get_rules, mocked_decode):
+        IpWhitelist.fetched = True
+        IpWhitelist.fetched_at = get_utc_now()
+        IpWhitelist.use_ip_whitelist = True
+        IpWhitelist.rules = mocked_ip_whitelist_ip['data']['attributes']['rules']
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.content, b'IP client is invalid')
+
+        # Notice: beyond the grace period, the last rules are not used anymore
+        IpWhitelist.fetched_at = datetime(2021, 7, 8, 9, 0, 0, tzinfo=pytz.UTC)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.content, b'Unable to retrieve the ip white list (down)')
+
+    @mock.patch('requests.Session.get', side_effect=mocked_requests_permission(mocked_config_ip))
     @mock.patch('django_forest.middleware.ip_whitelist.IpWhitelistMiddleware.get_client_ip', return_value='2001:db8::1000')
     def test_ip_v6_invalid(self, mocked_ip, mocked_requests, mocked_decode):
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 403)
 
-    @mock.patch('requests.get', side_effect=mocked_requests_permission(mocked_config_ip_loopback))
+    @mock.patch('requests.Session.get', side_effect=mocked_requests_permission(mocked_config_ip_loopback))
     @mock.patch('django_forest.middleware.ip_whitelist.IpWhitelistMiddleware.get_client_ip', return_value='127.0.0.2')
     def test_ip_loopback(self, mocked_ip, mocked_requests, mocked_decode):
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 200)
 
-    @mock.patch('requests.get', side_effect=mocked_requests_permission(mocked_config_range))
+    @mock.patch('requests.Session.get', side_effect=mocked_requests_permission(mocked_config_range))
     @mock.patch('django_forest.middleware.ip_whitelist.IpWhitelistMiddleware.get_client_ip', return_value='123.12.34.5')
     def test_range(self, mocked_ip, mocked_requests, mocked_decode):
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 200)
 
-    @mock.patch('requests.get', side_effect=mocked_requests_permission(mocked_config_range))
+    @mock.patch('requests.Session.get', side_effect=mocked_requests_permission(mocked_config_range))
     @mock.patch('django_forest.middleware.ip_whitelist.IpWhitelistMiddleware.get_client_ip', return_value='223.12.34.5')
     def test_range_invalid(self, mocked_ip, mocked_requests, mocked_decode):
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 403)
 
-    @mock.patch('requests.get', side_effect=mocked_requests_permission(mocked_config_range))
+    @mock.patch('requests.Session.get', side_effect=mocked_requests_permission(mocked_config_range))
     @mock.patch('django_forest.middleware.ip_whitelist.IpWhitelistMiddleware.get_client_ip', return_value='2001:db8::1000')
     def test_range_ipv6_invalid(self, mocked_ip, mocked_requests, mocked_decode):
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 403)
 
-    @mock.patch('requests.get', side_effect=mocked_requests_permission(mocked_config_subnet))
+    @mock.patch('requests.Session.get', side_effect=mocked_requests_permission(mocked_config_subnet))
     @mock.patch('django_forest.middleware.ip_whitelist.IpWhitelistMiddleware.get_client_ip', return_value='123.12.34.1')
     def test_no_subnet(self, mocked_ip, mocked_requests, mocked_decode):
         response = self.client.get(self.url, {
@@ -158,7 +183,7 @@ class MiddlewareIpWhitelistTests(TestCase):
         })
         self.assertEqual(response.status_code, 200)
 
-    @mock.patch('requests.get', side_effect=mocked_requests_permission(mocked_config_subnet))
+    @mock.patch('requests.Session.get', side_effect=mocked_requests_permission(mocked_config_subnet))
     @mock.patch('django_forest.middleware.ip_whitelist.IpWhitelistMiddleware.get_client_ip', return_value='123.12.34.3')
     def test_subnet_invalid(self, mocked_ip, mocked_requests, mocked_decode):
         response = self.client.get(self.url)
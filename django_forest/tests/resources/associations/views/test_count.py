@@ -40,6 +40,29 @@ class ResourceAssociationCountViewTests(TransactionTestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(data, {'count': 2})
 
+    @mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
+    @mock.patch('django_forest.resources.utils.count.get_forest_setting',
+                side_effect=lambda setting, default=None: {'FOREST_COUNT_STRATEGIES': {'tests_question:*': 'capped'},
+                                                           'FOREST_COUNT_CAP': 1}.get(setting, default))
+    def test_get_capped(self, *args, **kwargs):
+        url = reverse('django_forest:resources:associations:count', kwargs={'resource': 'tests_question', 'pk': 1, 'association_resource': 'choice_set'})
+        response = self.client.get(url)
+        data = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data, {'count': 1, 'meta': {'capped': True}})
+
+    @mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
+    @mock.patch('django_forest.resources.utils.count.get_forest_setting',
+                side_effect=lambda setting, default=None: {'FOREST_COUNT_STRATEGIES': {'tests_question:*': 'estimated'},
+                                                           'FOREST_COUNT_ESTIMATE_THRESHOLD': 0}.get(setting, default))
+    def test_get_estimated(self, *args, **kwargs):
+        url = reverse('django_forest:resources:associations:count', kwargs={'resource': 'tests_question', 'pk': 1, 'association_resource': 'choice_set'})
+        response = self.client.get(url)
+        data = response.json()
+        self.assertEqual(response.status_code, 200)
+        # Notice: the related records of a record are filtered, their count is exact
+        self.assertEqual(data, {'count': 2})
+
     @mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
     def test_deactivate(self, *args, **kwargs):
         settings.MIDDLEWARE.insert(0, 'django_forest.middleware.DeactivateCountMiddleware')
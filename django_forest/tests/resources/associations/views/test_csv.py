@@ -68,6 +68,26 @@ class ResourceAssociationCsvViewTests(TransactionTestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.content.decode('utf-8'), 'id,question,choice text,\r\n1,what is your favorite color?,,yes\r\n2,what is your favorite color?,,no\r\n')
 
+    @mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
+    @mock.patch('django_forest.resources.utils.csv.get_forest_setting',
+                side_effect=lambda setting, default=None: {'FOREST_CSV_STREAMING': True,
+                                                           'FOREST_CSV_CHUNK_SIZE': 1}.get(setting, default))
+    def test_get_streaming(self, *args, **kwargs):
+        response = self.client.get(self.url, {
+            'fields[tests_choice]': 'id,question,topic,choice_text',
+            'fields[question]': 'question_text',
+            'fields[topic]': 'name',
+            'search': '',
+            'searchExtended': '',
+            'filename': 'choices',
+            'header': 'id,question,choice text',
+            'timezone': 'Europe/Paris',
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(b''.join(response.streaming_content).decode('utf-8'),
+                         'id,question,choice text,\r\n1,what is your favorite color?,,yes\r\n2,what is your favorite color?,,no\r\n')
+
     def test_get_no_association(self, *args, **kwargs):
         response = self.client.get(self.bad_association_url, {
             'fields[tests_choice]': 'id,question,choice_text',
@@ -2,9 +2,12 @@ import copy
 import json
 from unittest import mock
 
+from django.db import connection
 from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+from django_forest.resources.utils.queryset import PaginationMixin
 from django_forest.tests.fixtures.schema import test_schema
 from django_forest.tests.models import Restaurant, Publication, Article, Choice
 from django_forest.utils.schema import Schema
@@ -53,6 +56,7 @@ class ResourceAssociationListViewTests(TransactionTestCase):
         # reset _registry after each test
         JsonApiSchema._registry = {}
         ScopeManager.cache = {}
+        PaginationMixin.keyset_boundaries.clear()
 
     @mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
     def test_get(self, *args, **kwargs):
@@ -123,6 +127,24 @@ class ResourceAssociationListViewTests(TransactionTestCase):
             ]
         })
 
+    @mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
+    def test_get_keyset_pagination(self, *args, **kwargs):
+        Schema.get_collection('tests_choice')['pagination_type'] = 'cursor'
+        params = {
+            'page[size]': '1',
+            'fields[tests_choice]': 'id,choice_text',
+        }
+        response = self.client.get(self.url, {'page[number]': '1', **params})
+        self.assertEqual([x['id'] for x in response.json()['data']], [1])
+
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(self.url, {'page[number]': '2', **params})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([x['id'] for x in response.json()['data']], [2])
+        self.assertTrue(captured.captured_queries[1]['sql'].endswith(
+            'WHERE ("tests_choice"."question_id" = 1 AND "tests_choice"."id" > 1) '
+            'ORDER BY "tests_choice"."id" ASC LIMIT 1'))
+
     def test_get_no_model(self, *args, **kwargs):
         response = self.client.get(self.bad_url, {
             'page[number]': '1',
@@ -0,0 +1,86 @@
+import copy
+from datetime import datetime
+from unittest import mock
+
+from django.test import TestCase
+from freezegun import freeze_time
+
+from django_forest.resources.utils.queryset.filters.utils import ConditionsMixin
+from django_forest.tests.fixtures.schema import test_schema
+from django_forest.tests.models import Question
+from django_forest.utils.date import get_timezone
+from django_forest.utils.schema import Schema
+
+FILTERS = {
+    'aggregator': 'and',
+    'conditions': [
+        {'field': 'question_text', 'operator': 'contains', 'value': 'favorite'},
+        {
+            'aggregator': 'or',
+            'conditions': [
+                {'field': 'id', 'operator': 'equal', 'value': 1},
+                {'field': 'pub_date', 'operator': 'before', 'value': '2021-06-03T00:00:00.000Z'},
+            ]
+        },
+    ]
+}
+
+
+class ConditionsMixinCompiledFiltersTests(TestCase):
+    fixtures = ['question.json']
+
+    def setUp(self):
+        Schema.schema = copy.deepcopy(test_schema)
+        self.mixin = ConditionsMixin()
+        self.tz = get_timezone('Europe/Paris')
+
+    def tearDown(self):
+        ConditionsMixin.compiled_filters.clear()
+
+    def test_get_compiled_filters(self):
+        q = self.mixin.get_compiled_filters(FILTERS, Question, self.tz)
+        self.assertEqual(q, self.mixin.handle_aggregator(FILTERS, Question, self.tz))
+        with mock.patch.object(ConditionsMixin, 'get_expression') as get_expression:
+            self.assertIs(self.mixin.get_compiled_filters(copy.deepcopy(FILTERS), Question, self.tz), q)
+        get_expression.assert_not_called()
+
+    def test_get_compiled_filters_condition(self):
+        condition = {'field': 'question_text', 'operator': 'equal', 'value': 'do you like chocolate?'}
+        q = self.mixin.get_compiled_filters(condition, Question, self.tz)
+        self.assertEqual(q, self.mixin.get_expression(condition, Question, self.tz))
+        self.assertEqual(list(Question.objects.filter(q).values_list('id', flat=True)), [2])
+
+    def test_get_compiled_filters_date_operator(self):
+        filters = {
+            'aggregator': 'and',
+            'conditions': [
+                {'field': 'question_text', 'operator': 'contains', 'value': 'favorite'},
+                {'field': 'pub_date', 'operator': 'today', 'value': None},
+            ]
+        }
+        with freeze_time(datetime(2021, 6, 2, 12, tzinfo=self.tz)):
+            q = self.mixin.get_compiled_filters(filters, Question, self.tz)
+            self.assertEqual(q, self.mixin.handle_aggregator(filters, Question, self.tz))
+            self.assertEqual(list(Question.objects.filter(q).values_list('id', flat=True)), [1])
+        with freeze_time(datetime(2021, 6, 3, 12, tzinfo=self.tz)):
+            q = self.mixin.get_compiled_filters(filters, Question, self.tz)
+            self.assertEqual(list(Question.objects.filter(q).values_list('id', flat=True)), [3])
+        self.assertEqual(len(ConditionsMixin.compiled_filters), 1)
+
+    @mock.patch('django_forest.resources.utils.queryset.filters.utils.COMPILED_FILTERS_MAX_SIZE', 2)
+    def test_get_compiled_filters_max_size(self):
+        for value in range(3):
+            self.mixin.get_compiled_filters({'field': 'id', 'operator': 'equal', 'value': value}, Question, self.tz)
+        self.assertEqual([key[1] for key in ConditionsMixin.compiled_filters], [
+            '{"field": "id", "operator": "equal", "value": 1}',
+            '{"field": "id", "operator": "equal", "value": 2}',
+        ])
+
+    @mock.patch('django_forest.resources.utils.queryset.filters.utils.COMPILED_FILTERS_MAX_SIZE', 2)
+    def test_get_compiled_filters_max_size_least_recently_used(self):
+        for value in (0, 1, 0, 2):
+            self.mixin.get_compiled_filters({'field': 'id', 'operator': 'equal', 'value': value}, Question, self.tz)
+        self.assertEqual([key[1] for key in ConditionsMixin.compiled_filters], [
+            '{"field": "id", "operator": "equal", "value": 0}',
+            '{"field": "id", "operator": "equal", "value": 2}',
+        ])
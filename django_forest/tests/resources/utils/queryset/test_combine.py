@@ -0,0 +1,53 @@
+import copy
+
+from django.db.models import F, Q
+from django.test import TestCase
+
+from django_forest.resources.utils.queryset.combine import combine_q, fold_q, get_exact_lookup
+from django_forest.resources.utils.queryset.filters.utils import ConditionsMixin
+from django_forest.tests.fixtures.schema import test_schema
+from django_forest.tests.models import Choice, Question
+from django_forest.utils.schema import Schema
+
+
+class ResourceUtilsQuerysetCombineTests(TestCase):
+
+    def setUp(self):
+        Schema.schema = copy.deepcopy(test_schema)
+
+    def test_combine_q(self):
+        q = combine_q([Q(id=1), Q(), Q(votes=1) | Q(votes=2), ~Q(choice_text='yes')], Q.OR)
+        self.assertEqual(q, Q(id=1) | Q(votes=1) | Q(votes=2) | ~Q(choice_text='yes'))
+        self.assertEqual(len(q.children), 4)
+
+    def test_combine_q_single(self):
+        self.assertEqual(combine_q([Q(), Q(id=1)], Q.AND), Q(id=1))
+        self.assertEqual(combine_q([], Q.OR), Q())
+
+    def test_combine_q_collapse_in(self):
+        q = combine_q([Q(id=1), Q(votes=1), Q(id__exact=2), Q(id=3), Q(question__question_text='yes')], Q.OR, Choice)
+        self.assertEqual(q, Q(('id__in', [1, 2, 3]), _connector=Q.OR) | Q(votes=1) | Q(question__question_text='yes'))
+
+    def test_combine_q_collapse_in_excluded(self):
+        children = [Q(id=1), Q(id=None), Q(id=F('votes')), Q(choice_text__icontains='y'), Q(choice_text__icontains='n')]
+        self.assertEqual(combine_q(children, Q.OR, Choice), Q(id=1) | Q(id=None) | Q(id=F('votes')) |
+                         Q(choice_text__icontains='y') | Q(choice_text__icontains='n'))
+        self.assertEqual(combine_q([Q(id=1), Q(id=2)], Q.AND, Choice), Q(id=1) & Q(id=2))
+
+    def test_get_exact_lookup(self):
+        self.assertEqual(get_exact_lookup(Choice, 'question__topic__name__exact'), 'question__topic__name')
+        self.assertEqual(get_exact_lookup(Choice, 'pk'), 'pk')
+        self.assertIsNone(get_exact_lookup(Choice, 'choice_text__icontains'))
+        self.assertIsNone(get_exact_lookup(Choice, 'question__pub_date__year'))
+
+    def test_fold_q(self):
+        q = fold_q([(Q.OR, Q(id=1)), (Q.OR, Q(id=2)), (Q.AND, Q(votes=1)), (Q.AND, Q(votes__gt=0)), (Q.OR, Q(id=3))])
+        self.assertEqual(q, (((Q(id=1) | Q(id=2)) & Q(votes=1)) & Q(votes__gt=0)) | Q(id=3))
+
+    def test_handle_aggregator(self):
+        filters = {
+            'aggregator': 'or',
+            'conditions': [{'field': 'id', 'operator': 'equal', 'value': value} for value in range(50)],
+        }
+        q = ConditionsMixin().handle_aggregator(filters, Question, None)
+        self.assertEqual(q, Q(('id__in', list(range(50))), _connector=Q.OR))
@@ -0,0 +1,122 @@
+from unittest import mock
+
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase
+
+from django_forest.resources.utils.queryset.search_backends import FullTextSearchBackend, SearchBackend as \
+    BaseSearchBackend, SqliteFts5SearchBackend, TrigramSearchBackend, get_search_backend
+from django_forest.tests.models import Question
+
+
+class SearchBackend(BaseSearchBackend):
+    def get_q(self, search, Model, fields, related_field_name=None):
+        return Q(**{self.get_lookup(f'{field}__iexact', related_field_name): search for field in fields})
+
+
+def mock_search_backends(backends):
+    return mock.patch('django_forest.resources.utils.queryset.search_backends.get_forest_setting',
+                      side_effect=lambda setting, default=None: {'FOREST_SEARCH_BACKENDS': backends}.get(setting,
+                                                                                                          default))
+
+
+class SearchBackendsTests(TestCase):
+
+    def setUp(self):
+        BaseSearchBackend._availability = {}
+
+    def tearDown(self):
+        BaseSearchBackend._availability = {}
+
+    def test_get_search_backend_default(self):
+        self.assertIsNone(get_search_backend('tests_question'))
+
+    @mock_search_backends({'tests_question': 'trigram'})
+    @mock.patch.object(TrigramSearchBackend, 'check_availability', return_value=True)
+    def test_get_search_backend_name(self, *args):
+        self.assertIsInstance(get_search_backend('tests_question'), TrigramSearchBackend)
+        self.assertIsNone(get_search_backend('tests_choice'))
+
+    @mock_search_backends({'tests_question': {'backend': 'full_text', 'config': 'french', 'vector_field': 'vector'}})
+    def test_get_search_backend_options(self, *args):
+        backend = get_search_backend('tests_question')
+        self.assertIsInstance(backend, FullTextSearchBackend)
+        self.assertEqual(backend.config, 'french')
+        self.assertEqual(backend.vector_field, 'vector')
+
+    @mock_search_backends({'tests_question': 'full_text'})
+    @mock.patch('django_forest.resources.utils.queryset.search_backends.SearchQuery', None)
+    def test_get_search_backend_not_available(self, *args):
+        with self.assertLogs('django_forest.resources.utils.queryset.search_backends', level='WARNING') as cm:
+            self.assertIsNone(get_search_backend('tests_question'))
+        self.assertEqual(cm.output, [
+            'WARNING:django_forest.resources.utils.queryset.search_backends:'
+            'The full_text search backend of tests_question is not available, the default search is used'
+        ])
+
+    @mock_search_backends({'tests_question': 'trigram'})
+    def test_get_search_backend_trigram_not_available(self, *args):
+        # Notice: django.contrib.postgres is not installed in the tests
+        with self.assertLogs('django_forest.resources.utils.queryset.search_backends', level='WARNING'):
+            self.assertIsNone(get_search_backend('tests_question'))
+
+    @mock_search_backends({'tests_question': 'sqlite_fts5'})
+    def test_get_search_backend_sqlite_fts5_not_available(self, *args):
+        with self.assertLogs('django_forest.resources.utils.queryset.search_backends', level='WARNING'):
+            self.assertIsNone(get_search_backend('tests_question'))
+
+    def test_is_available_once(self):
+        with mock.patch.object(TrigramSearchBackend, 'check_availability', return_value=True) as mocked_check:
+            self.assertTrue(TrigramSearchBackend.is_available(connection))
+            self.assertTrue(TrigramSearchBackend.is_available(connection))
+        mocked_check.assert_called_once_with(connection)
+        self.assertTrue(FullTextSearchBackend.is_available(connection))
+
+    def test_trigram_check_availability(self):
+        with mock.patch('django_forest.resources.utils.queryset.search_backends.apps.is_installed', return_value=True):
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+                has_extension = cursor.fetchone() is not None
+            self.assertEqual(TrigramSearchBackend.check_availability(connection), has_extension)
+
+    def test_abstract(self):
+        self.assertRaises(TypeError, BaseSearchBackend)
+
+    @mock_search_backends({'tests_question': 'django_forest.tests.resources.utils.queryset.test_search_backends.SearchBackend'})
+    def test_get_search_backend_path(self, *args):
+        self.assertIsInstance(get_search_backend('tests_question'), SearchBackend)
+
+    def test_full_text_vector_field(self):
+        q = FullTextSearchBackend(vector_field='vector').get_q('foo', Question, ['question_text'], 'question')
+        self.assertEqual(q.children[0][0], 'question__vector')
+
+    def test_full_text_no_fields(self):
+        self.assertEqual(FullTextSearchBackend().get_q('foo', Question, []), Q())
+
+    def test_trigram(self):
+        q = TrigramSearchBackend().get_q('foo', Question, ['question_text'], 'question')
+        self.assertEqual(q, Q(question__question_text__trigram_similar='foo'))
+
+    def test_sqlite_fts5(self):
+        q = SqliteFts5SearchBackend().get_q('say "hi"', Question, ['question_text'])
+        lookup, raw_sql = q.children[0]
+        self.assertEqual(lookup, 'pk__in')
+        self.assertEqual(raw_sql.sql, 'SELECT rowid FROM "tests_question_fts" WHERE "tests_question_fts" MATCH %s')
+        self.assertEqual(raw_sql.params, ['"say ""hi"""'])
+
+    def test_full_text_field_vector_field(self):
+        q = FullTextSearchBackend(vector_field='vector').get_field_q('foo', Question, 'question_text')
+        lookup, queryset = q.children[0]
+        self.assertEqual(lookup, 'pk__in')
+        self.assertIn('to_tsvector', str(queryset.query))
+
+    def test_trigram_field(self):
+        q = TrigramSearchBackend().get_field_q('foo', Question, 'question_text')
+        self.assertEqual(q, Q(question_text__trigram_similar='foo'))
+
+    def test_sqlite_fts5_field(self):
+        q = SqliteFts5SearchBackend(table='questions_fts').get_field_q('hi', Question, 'question_text')
+        lookup, raw_sql = q.children[0]
+        self.assertEqual(lookup, 'pk__in')
+        self.assertEqual(raw_sql.sql, 'SELECT rowid FROM "questions_fts" WHERE "questions_fts" MATCH %s')
+        self.assertEqual(raw_sql.params, ['{question_text} : "hi"'])
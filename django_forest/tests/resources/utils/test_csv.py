@@ -0,0 +1,62 @@
+import uuid
+
+from django.test import TestCase
+
+from django_forest.resources.utils.csv import CsvMixin
+from django_forest.tests.models import Choice, Serial
+
+
+class CsvView(CsvMixin):
+    Model = Choice
+
+
+def get_record(pk, attributes, relationships):
+    return {'type': 'tests_choice', 'id': pk, 'attributes': attributes, 'relationships': relationships}
+
+
+class CsvMixinTests(TestCase):
+    params = {'fields[question]': 'question_text', 'fields[serial]': 'name'}
+
+    def test_get_csv_rows_shared_related(self):
+        data = {
+            'data': [
+                get_record('1', {'choice_text': 'yes'}, {'question': {'data': {'type': 'tests_question', 'id': 1}}}),
+                get_record('2', {'choice_text': 'no'}, {'question': {'data': {'type': 'tests_question', 'id': '1'}}}),
+                get_record('3', {'choice_text': 'good'}, {'question': {'data': {'type': 'tests_question', 'id': 2}}}),
+                get_record('4', {'choice_text': 'none'}, {'question': {'data': None}}),
+            ],
+            'included': [
+                {'type': 'tests_question', 'id': '1', 'attributes': {'question_text': 'favorite color?'}},
+                {'type': 'tests_question', 'id': '2', 'attributes': {'question_text': 'chocolate?'}},
+                # Notice: the same id in another collection is another record
+                {'type': 'tests_topic', 'id': '1', 'attributes': {'question_text': 'not a question'}},
+            ],
+        }
+        rows = list(CsvView().get_csv_rows(data, self.params))
+        self.assertEqual(rows, [
+            {'choice_text': 'yes', 'id': '1', 'question': 'favorite color?'},
+            {'choice_text': 'no', 'id': '2', 'question': 'favorite color?'},
+            {'choice_text': 'good', 'id': '3', 'question': 'chocolate?'},
+            {'choice_text': 'none', 'id': '4'},
+        ])
+
+    def test_get_csv_rows_uuid(self):
+        pk = uuid.uuid4()
+        data = {
+            'data': [
+                get_record('1', {}, {'serial': {'data': {'type': 'tests_serial', 'id': pk}}}),
+                get_record('2', {}, {'serial': {'data': {'type': 'tests_serial', 'id': str(pk)}}}),
+            ],
+            'included': [
+                {'type': 'tests_serial', 'id': str(pk), 'attributes': {'name': 'serial'}},
+            ],
+        }
+        rows = list(CsvView().get_csv_rows(data, self.params))
+        self.assertEqual([row['serial'] for row in rows], ['serial', 'serial'])
+
+    def test_get_included_index(self):
+        pk = uuid.uuid4()
+        included = [{'type': Serial._meta.db_table, 'id': pk}, {'type': 'tests_session', 'id': 'key'}]
+        index = CsvView().get_included_index({'included': included})
+        self.assertEqual(list(index), [('tests_serial', str(pk)), ('tests_session', 'key')])
+        self.assertEqual(CsvView().get_included_index({}), {})
@@ -140,7 +140,7 @@ class ResourceListScopeViewTests(TransactionTestCase):
         })
 
     @mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
-    @mock.patch('requests.get', side_effect=mocked_requests_scope({
+    @mock.patch('requests.Session.get', side_effect=mocked_requests_scope({
         'scope': {
             'data': mocked_scope,
             'status': 200
@@ -175,7 +175,7 @@ class ResourceListScopeViewTests(TransactionTestCase):
         })
 
     @mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1, 'name': 'singer'})
-    @mock.patch('requests.get', side_effect=mocked_requests_scope({
+    @mock.patch('requests.Session.get', side_effect=mocked_requests_scope({
         'scope': {
             'data': mocked_scope_dynamic_value,
             'status': 200
@@ -223,7 +223,7 @@ class ResourceListScopeViewTests(TransactionTestCase):
         })
 
     @mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
-    @mock.patch('requests.get', side_effect=mocked_requests_scope({
+    @mock.patch('requests.Session.get', side_effect=mocked_requests_scope({
         'scope': {
             'data': {},
             'status': 400
@@ -558,3 +558,99 @@ class ResourceListViewTests(TransactionTestCase):
                 ]
             }
         })
+
+    @mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
+    @mock.patch('django_forest.resources.utils.queryset.search_backends.get_forest_setting',
+                side_effect=lambda setting, default=None: {
+                    'FOREST_SEARCH_BACKENDS': {'tests_question': {'backend': 'full_text', 'config': 'english'}}
+                }.get(setting, default))
+    @mock.patch('django_forest.utils.scope.ScopeManager._has_cache_expired', return_value=False)
+    def test_get_search_full_text(self, *args):
+        with self._django_assert_num_queries(1) as captured:
+            response = self.client.get(self.url, {
+                'fields[tests_question]': 'id,question_text',
+                'page[number]': 1,
+                'page[size]': 15,
+                'search': 'singers',
+                'searchExtended': 0
+            })
+        data = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('to_tsvector', captured.captured_queries[0]['sql'])
+        self.assertEqual([x['id'] for x in data['data']], [3])
+        # Notice: the decorators highlight the fields matched by the backend, not only the exact matches
+        self.assertEqual(data['meta'], {'decorators': [{'id': 3, 'search': ['question_text']}]})
+
+    @mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
+    @mock.patch('django_forest.resources.utils.queryset.search_backends.get_forest_setting',
+                side_effect=lambda setting, default=None: {
+                    'FOREST_SEARCH_BACKENDS': {'tests_choice': 'full_text'}
+                }.get(setting, default))
+    @mock.patch('django_forest.utils.scope.ScopeManager._has_cache_expired', return_value=False)
+    def test_get_extended_search_full_text(self, *args):
+        response = self.client.get(self.url, {
+            'fields[tests_question]': 'id,question_text',
+            'page[number]': 1,
+            'page[size]': 15,
+            'search': 'good',
+            'searchExtended': 1
+        })
+        data = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([x['id'] for x in data['data']], [2])
+
+    @mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
+    @mock.patch('django_forest.utils.scope.ScopeManager._has_cache_expired', return_value=False)
+    def test_get_extended_search_subqueries(self, *args):
+        with self._django_assert_num_queries(1) as captured:
+            response = self.client.get(self.url, {
+                'fields[tests_question]': 'id,question_text',
+                'page[number]': 1,
+                'page[size]': 15,
+                'search': 'yes',
+                'searchExtended': 1
+            })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([x['id'] for x in response.json()['data']], [1])
+        sql = captured.captured_queries[0]['sql']
+        self.assertNotIn('JOIN', sql)
+        self.assertIn('"tests_question"."id" IN (SELECT U0."question_id" FROM "tests_choice" U0', sql)
+
+    @mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
+    @mock.patch('django_forest.utils.scope.ScopeManager._has_cache_expired', return_value=False)
+    def test_get_extended_search_belongs_to(self, *args):
+        with self._django_assert_num_queries(1) as captured:
+            response = self.client.get(self.reverse_url, {
+                'fields[tests_choice]': 'id,choice_text',
+                'page[number]': 1,
+                'page[size]': 15,
+                'search': 'color',
+                'searchExtended': 1
+            })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([x['id'] for x in response.json()['data']], [1, 2])
+        self.assertIn('"tests_choice"."question_id" IN (SELECT U0."id" FROM "tests_question" U0',
+                      captured.captured_queries[0]['sql'])
+
+    @mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
+    @mock.patch('django_forest.utils.scope.ScopeManager._has_cache_expired', return_value=False)
+    def test_get_search_decorators_sql(self, *args):
+        with self._django_assert_num_queries(1) as captured:
+            response = self.client.get(self.url, {
+                'fields[tests_question]': 'id,question_text',
+                'page[number]': 1,
+                'page[size]': 15,
+                'search': 'FAVORITE',
+                'searchExtended': 0
+            })
+        data = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('CASE WHEN UPPER("tests_question"."question_text"::text) LIKE UPPER(\'%FAVORITE%\') THEN true',
+                      captured.captured_queries[0]['sql'])
+        self.assertEqual([x['id'] for x in data['data']], [1, 3])
+        self.assertEqual(data['meta'], {
+            'decorators': [
+                {'id': 1, 'search': ['question_text']},
+                {'id': 3, 'search': ['question_text']},
+            ]
+        })
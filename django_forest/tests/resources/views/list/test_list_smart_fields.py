@@ -1,15 +1,22 @@
+import asyncio
 import copy
 import sys
+import threading
+import time
 from datetime import datetime
 from unittest import mock
 
 import pytest
 import pytz
+from django.core.cache import caches
+from django.db import connection
 from django.test import TransactionTestCase
 from django.urls import reverse
 from freezegun import freeze_time
 
-from django_forest.resources.utils.smart_field import SmartFieldMixin
+from django_forest.resources.utils import smart_field
+from django_forest.resources.utils.smart_field import SmartFieldMixin, get_smart_fields_executor, \
+    shutdown_smart_fields_executor
 from django_forest.tests.fixtures.schema import test_schema
 from django_forest.utils.collection import Collection
 from django_forest.utils.schema import Schema
@@ -62,6 +69,7 @@ class ResourceListSmartFieldsViewTests(TransactionTestCase):
         JsonApiSchema._registry = {}
         ScopeManager.cache = {}
         Collection._registry = {}
+        shutdown_smart_fields_executor()
 
     @mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
     @freeze_time(
@@ -319,12 +327,292 @@ class ResourceListSmartFieldsViewTests(TransactionTestCase):
             ]
         })
 
+    @mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
+    @freeze_time(
+        lambda: datetime(2021, 7, 8, 9, 20, 23, 582772, tzinfo=get_timezone('UTC'))
+    )
+    def test_get_many(self, mocked_decode):
+        foo_field = Schema.get_collection_metadata('tests_question').smart_fields['foo']
+        get_many = mock.Mock(side_effect=lambda items: {item.pk: f'{item.pk}+many' for item in items})
+        foo_field['get_many'] = get_many
+        response = self.client.get(self.url, {
+            'fields[tests_question]': 'id,question_text,foo,bar',
+            'page[number]': '1',
+            'page[size]': '15'
+        })
+        data = response.json()
+        self.assertEqual(response.status_code, 200)
+        get_many.assert_called_once()
+        self.assertEqual([len(call.args[0]) for call in get_many.call_args_list], [3])
+        self.assertEqual([x['attributes']['foo'] for x in data['data']], ['1+many', '2+many', '3+many'])
+        self.assertEqual([x['attributes']['bar'] for x in data['data']], [
+            'what is your favorite color?+bar',
+            'do you like chocolate?+bar',
+            'who is your favorite singer?+bar',
+        ])
+
+    @mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
+    @freeze_time(
+        lambda: datetime(2021, 7, 8, 9, 20, 23, 582772, tzinfo=get_timezone('UTC'))
+    )
+    def test_get_many_on_relation(self, mocked_decode):
+        foo_field = Schema.get_collection_metadata('tests_question').smart_fields['foo']
+        get_many = mock.Mock(side_effect=lambda items: {item.pk: f'{item.pk}+many' for item in items})
+        foo_field['get_many'] = get_many
+        url = reverse('django_forest:resources:list', kwargs={'resource': 'tests_choice'})
+        response = self.client.get(url, {
+            'fields[tests_choice]': 'id,question',
+            'fields[question]': 'foo',
+            'page[number]': '1',
+            'page[size]': '15'
+        })
+        data = response.json()
+        self.assertEqual(response.status_code, 200)
+        get_many.assert_called_once()
+        self.assertEqual(len(get_many.call_args.args[0]), 3)
+        self.assertEqual(sorted(x['attributes']['foo'] for x in data['included']), ['1+many', '2+many'])
+
+    @mock.patch('django_forest.resources.utils.smart_field.get_forest_setting',
+                side_effect=lambda setting, default=None: {'FOREST_SMART_FIELDS_WORKERS': 3}.get(setting, default))
+    @mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
+    @freeze_time(
+        lambda: datetime(2021, 7, 8, 9, 20, 23, 582772, tzinfo=get_timezone('UTC'))
+    )
+    def test_get_concurrently(self, *args):
+        # the barrier is only crossed when the getters of the 3 questions run at the same time
+        barrier = threading.Barrier(3, timeout=5)
+
+        def get_foo(obj):
+            barrier.wait()
+            return f'{obj.pk}+foo'
+
+        Schema.get_collection_metadata('tests_question').smart_fields['foo']['get'] = get_foo
+        response = self.client.get(self.url, {
+            'fields[tests_question]': 'id,foo',
+            'page[number]': '1',
+            'page[size]': '15'
+        })
+        data = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([x['attributes']['foo'] for x in data['data']], ['1+foo', '2+foo', '3+foo'])
+
+    @mock.patch('django_forest.resources.utils.smart_field.get_forest_setting',
+                side_effect=lambda setting, default=None: {'FOREST_SMART_FIELDS_WORKERS': 2}.get(setting, default))
+    @mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
+    @freeze_time(
+        lambda: datetime(2021, 7, 8, 9, 20, 23, 582772, tzinfo=get_timezone('UTC'))
+    )
+    def test_get_concurrently_shared_pool(self, *args):
+        threads, db_connections = set(), set()
+
+        def get_foo(obj):
+            threads.add(threading.current_thread())
+            obj.choice_set.count()
+            db_connections.add(connection.connection)
+            return f'{obj.pk}+foo'
+
+        Schema.get_collection_metadata('tests_question').smart_fields['foo']['get'] = get_foo
+        for _ in range(2):
+            response = self.client.get(self.url, {
+                'fields[tests_question]': 'id,foo',
+                'page[number]': '1',
+                'page[size]': '15'
+            })
+            self.assertEqual(response.status_code, 200)
+        # Notice: the requests share the workers, which keep their connection between the calls
+        self.assertLessEqual(len(threads), 2)
+        self.assertLessEqual(len(db_connections), 2)
+
+    @mock.patch('django_forest.resources.utils.smart_field.get_forest_setting',
+                side_effect=lambda setting, default=None: {'FOREST_SMART_FIELDS_WORKERS': 3}.get(setting, default))
+    @mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
+    # Notice: time is not frozen, the timeouts rely on it
+    @mock.patch('django_forest.utils.scope.ScopeManager._has_cache_expired', return_value=False)
+    def test_get_concurrently_timeout(self, *args):
+        event = threading.Event()
+
+        def get_foo(obj):
+            if obj.pk == 2:
+                event.wait(5)
+            return f'{obj.pk}+foo'
+
+        foo_field = Schema.get_collection_metadata('tests_question').smart_fields['foo']
+        foo_field.update({'get': get_foo, 'timeout': 0.1, 'placeholder': 'loading'})
+        try:
+            response = self.client.get(self.url, {
+                'fields[tests_question]': 'id,foo,bar',
+                'page[number]': '1',
+                'page[size]': '15'
+            })
+        finally:
+            event.set()
+        data = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([x['attributes']['foo'] for x in data['data']], ['1+foo', 'loading', '3+foo'])
+        self.assertEqual(data['data'][1]['attributes']['bar'], 'do you like chocolate?+bar')
+
+    def wait_for_abandoned_futures(self):
+        for _ in range(500):
+            if smart_field._abandoned_futures == 0:
+                return
+            time.sleep(0.01)
+        self.fail('the abandoned getters did not end')
+
+    @mock.patch('django_forest.resources.utils.smart_field.get_forest_setting',
+                side_effect=lambda setting, default=None: {'FOREST_SMART_FIELDS_WORKERS': 2}.get(setting, default))
+    @mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
+    # Notice: time is not frozen, the timeouts rely on it
+    @mock.patch('django_forest.utils.scope.ScopeManager._has_cache_expired', return_value=False)
+    def test_get_concurrently_timeout_new_pool(self, *args):
+        event = threading.Event()
+
+        def get_foo(obj):
+            if obj.pk == 2:
+                event.wait(5)
+            return f'{obj.pk}+foo'
+
+        foo_field = Schema.get_collection_metadata('tests_question').smart_fields['foo']
+        foo_field.update({'get': get_foo, 'timeout': 0.1, 'placeholder': 'loading'})
+        executor = get_smart_fields_executor(2)
+        try:
+            response = self.client.get(self.url, {'fields[tests_question]': 'id,foo'})
+            self.assertEqual(response.status_code, 200)
+            # Notice: the busy worker is not reused, the next requests get a new pool
+            self.assertEqual(smart_field._abandoned_futures, 1)
+            self.assertIsNot(get_smart_fields_executor(2), executor)
+        finally:
+            event.set()
+        self.wait_for_abandoned_futures()
+
+    @mock.patch('django_forest.resources.utils.smart_field.get_forest_setting',
+                side_effect=lambda setting, default=None: {'FOREST_SMART_FIELDS_WORKERS': 1}.get(setting, default))
+    @mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
+    # Notice: time is not frozen, the timeouts rely on it
+    @mock.patch('django_forest.utils.scope.ScopeManager._has_cache_expired', return_value=False)
+    def test_get_concurrently_timeout_exhausted(self, *args):
+        event = threading.Event()
+        threads = []
+
+        def get_foo(obj):
+            threads.append(threading.current_thread())
+            if len(threads) == 1:
+                event.wait(5)
+            return f'{obj.pk}+foo'
+
+        foo_field = Schema.get_collection_metadata('tests_question').smart_fields['foo']
+        foo_field.update({'get': get_foo, 'timeout': 0.1, 'placeholder': 'loading'})
+        try:
+            response = self.client.get(self.url, {'fields[tests_question]': 'id,foo'})
+            self.assertEqual([x['attributes']['foo'] for x in response.json()['data']], ['loading'] * 3)
+            # Notice: the single worker is busy, the getters run in the request thread
+            del threads[:]
+            response = self.client.get(self.url, {'fields[tests_question]': 'id,foo'})
+            self.assertEqual([x['attributes']['foo'] for x in response.json()['data']], ['1+foo', '2+foo', '3+foo'])
+            self.assertEqual(set(threads), {threading.current_thread()})
+        finally:
+            event.set()
+        self.wait_for_abandoned_futures()
+
+    @mock.patch('django_forest.resources.utils.smart_field.get_forest_setting',
+                side_effect=lambda setting, default=None: {'FOREST_SMART_FIELDS_WORKERS': 2}.get(setting, default))
+    @mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
+    # Notice: time is not frozen, the timeouts rely on it
+    @mock.patch('django_forest.utils.scope.ScopeManager._has_cache_expired', return_value=False)
+    def test_get_coroutine_concurrently(self, *args):
+        event = threading.Event()
+
+        def get_foo(obj):
+            event.set()
+            return f'{obj.pk}+foo'
+
+        async def get_bar(obj):
+            # Notice: only set by the getters of the pool, which run along the coroutines
+            while not event.is_set():
+                await asyncio.sleep(0.01)
+            return f'{obj.pk}+bar'
+
+        smart_fields = Schema.get_collection_metadata('tests_question').smart_fields
+        smart_fields['foo'].update({'get': get_foo, 'timeout': 2})
+        smart_fields['bar'].update({'get': get_bar, 'timeout': 2})
+        response = self.client.get(self.url, {'fields[tests_question]': 'id,foo,bar'})
+        data = response.json()
+        self.assertEqual([x['attributes']['foo'] for x in data['data']], ['1+foo', '2+foo', '3+foo'])
+        self.assertEqual([x['attributes']['bar'] for x in data['data']], ['1+bar', '2+bar', '3+bar'])
+
+    @mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
+    # Notice: time is not frozen, the timeouts rely on it
+    @mock.patch('django_forest.utils.scope.ScopeManager._has_cache_expired', return_value=False)
+    def test_get_coroutine(self, *args):
+        async def get_foo(obj):
+            await asyncio.sleep(5 if obj.pk == 3 else 0)
+            return f'{obj.pk}+foo'
+
+        foo_field = Schema.get_collection_metadata('tests_question').smart_fields['foo']
+        foo_field.update({'get': get_foo, 'timeout': 0.1})
+        response = self.client.get(self.url, {
+            'fields[tests_question]': 'id,foo',
+            'page[number]': '1',
+            'page[size]': '15'
+        })
+        data = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([x['attributes']['foo'] for x in data['data']], ['1+foo', '2+foo', None])
+
+    @mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
+    @freeze_time(
+        lambda: datetime(2021, 7, 8, 9, 20, 23, 582772, tzinfo=get_timezone('UTC'))
+    )
+    def test_get_cached(self, mocked_decode):
+        foo_field = Schema.get_collection_metadata('tests_question').smart_fields['foo']
+        get_foo = mock.Mock(side_effect=lambda obj: f'{obj.pk}+foo')
+        foo_field.update({'get': get_foo, 'cache': {'ttl': 60}})
+        params = {
+            'fields[tests_question]': 'id,foo',
+            'page[number]': '1',
+            'page[size]': '15'
+        }
+        try:
+            self.client.get(self.url, params)
+            response = self.client.get(self.url, params)
+        finally:
+            caches['default'].clear()
+        data = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(get_foo.call_count, 3)
+        self.assertEqual([x['attributes']['foo'] for x in data['data']], ['1+foo', '2+foo', '3+foo'])
+
+    @mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
+    @freeze_time(
+        lambda: datetime(2021, 7, 8, 9, 20, 23, 582772, tzinfo=get_timezone('UTC'))
+    )
+    def test_get_cached_version(self, mocked_decode):
+        foo_field = Schema.get_collection_metadata('tests_question').smart_fields['foo']
+        get_foo = mock.Mock(side_effect=lambda obj: f'{obj.pk}+foo')
+        foo_field.update({'get': get_foo, 'cache': {'ttl': 60, 'version': 'pub_date'}})
+        params = {
+            'fields[tests_question]': 'id,foo',
+            'page[number]': '1',
+            'page[size]': '15'
+        }
+        try:
+            self.client.get(self.url, params)
+            # Notice: the version column is loaded with the records, not once per record
+            with self._django_assert_num_queries(1):
+                response = self.client.get(self.url, params)
+        finally:
+            caches['default'].clear()
+        data = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(get_foo.call_count, 3)
+        self.assertEqual([x['attributes']['foo'] for x in data['data']], ['1+foo', '2+foo', '3+foo'])
+
+    @mock.patch.object(SmartFieldMixin, "_add_smart_fields_many")
     @mock.patch.object(SmartFieldMixin, "_add_smart_fields")
     @mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
     @freeze_time(
         lambda: datetime(2021, 7, 8, 9, 20, 23, 582772, tzinfo=get_timezone('UTC'))
     )
-    def test_smart_fields_not_requested_not_calculated(self, _, _add_smart_fields):
+    def test_smart_fields_not_requested_not_calculated(self, _, _add_smart_fields, _add_smart_fields_many):
         """
         Given
             - A collection is queried, where the smart fields are not
@@ -344,3 +632,4 @@ class ResourceListSmartFieldsViewTests(TransactionTestCase):
         # The thing we really care about in this integration
         # test is not adding *any* smart fields to the request
         _add_smart_fields.assert_not_called()
+        _add_smart_fields_many.assert_not_called()
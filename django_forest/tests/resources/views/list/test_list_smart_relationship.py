@@ -8,6 +8,7 @@ from django.test import TransactionTestCase
 from django.urls import reverse
 from freezegun import freeze_time
 
+from django_forest.tests.models import Question, Topic
 from django_forest.tests.resources.views.list.test_list_scope import mocked_scope
 from django_forest.utils.collection import Collection
 from django_forest.utils.models import Models
@@ -91,3 +92,35 @@ class ResourceListSmartRelationshipViewTests(TransactionTestCase):
                  'links': {'self': '/forest/tests_question/1'}},
                 {'type': 'tests_question', 'attributes': {'question_text': 'do you like chocolate?'}, 'id': 2,
                  'links': {'self': '/forest/tests_question/2'}}]})
+
+    @mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
+    @mock.patch('django_forest.utils.scope.ScopeManager._has_cache_expired', return_value=False)
+    def test_get_key(self, mocked_scope_has_expired, mocked_decode):
+        ScopeManager.cache = {
+            '1': {
+                'scopes': {},
+                'fetched_at': datetime(2021, 7, 8, 9, 20, 22, 582772, tzinfo=pytz.UTC)
+            }
+        }
+        Question.objects.filter(pk=1).update(topic=Topic.objects.create(name='colors'))
+        Question.objects.filter(pk=2).update(topic=Topic.objects.create(name='food'))
+        topic_field = Schema.get_collection_metadata('tests_choice').smart_fields['topic']
+        topic_field['get'] = mock.Mock()
+        topic_field['get_key'] = lambda obj: obj.question.topic_id
+        with self._django_assert_num_queries(2):
+            response = self.client.get(self.url, {
+                'fields[tests_choice]': 'id,question,topic,choice_text',
+                'fields[question]': 'topic',
+                'fields[topic]': 'name',
+                'page[number]': '1',
+                'page[size]': '15'
+            })
+        data = response.json()
+        self.assertEqual(response.status_code, 200)
+        topic_field['get'].assert_not_called()
+        self.assertEqual([x['relationships']['topic']['data'] for x in data['data']], [
+            {'type': 'tests_topic', 'id': '1'},
+            {'type': 'tests_topic', 'id': '1'},
+            {'type': 'tests_topic', 'id': '2'},
+        ])
+        self.assertEqual([x['id'] for x in data['included'] if x['type'] == 'tests_topic'], [1, 2])
@@ -5,6 +5,7 @@ from django.test import TransactionTestCase
 from django.urls import reverse
 from django.conf import settings
 from django_forest.middleware.deactivate_count import DeactivateCountMiddleware
+from django_forest.resources.utils.count import CountStrategyException, validate_count_strategies
 
 from django_forest.tests.fixtures.schema import test_schema
 from django_forest.utils.schema import Schema
@@ -91,6 +92,70 @@ class ResourceCountViewTests(TransactionTestCase):
         self.assertEqual(data, {'meta': {'count': 'deactivated'}})
         del settings.MIDDLEWARE[0]
 
+    @mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
+    @mock.patch('django_forest.resources.utils.count.get_forest_setting',
+                side_effect=lambda setting, default=None: {'FOREST_COUNT_STRATEGIES': {'tests_question': 'capped'},
+                                                           'FOREST_COUNT_CAP': 2}.get(setting, default))
+    def test_get_capped(self, *args, **kwargs):
+        url = reverse('django_forest:resources:count', kwargs={'resource': 'tests_question'})
+        response = self.client.get(url)
+        data = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data, {'count': 2, 'meta': {'capped': True}})
+
+        response = self.client.get(url, {'search': 'favorite'})
+        data = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data, {'count': 2})
+
+    @mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
+    @mock.patch('django_forest.resources.utils.count.get_forest_setting',
+                side_effect=lambda setting, default=None: {'FOREST_COUNT_STRATEGIES': {'tests_question': 'estimated'},
+                                                           'FOREST_COUNT_ESTIMATE_THRESHOLD': 0}.get(setting, default))
+    def test_get_estimated(self, *args, **kwargs):
+        url = reverse('django_forest:resources:count', kwargs={'resource': 'tests_question'})
+        response = self.client.get(url)
+        data = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data['meta'], {'estimated': True})
+        self.assertIsInstance(data['count'], int)
+
+        # Notice: the filtered counts are exact
+        response = self.client.get(url, {'search': 'favorite'})
+        data = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data, {'count': 2})
+
+    @mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
+    @mock.patch('django_forest.resources.utils.count.get_forest_setting',
+                side_effect=lambda setting, default=None: {'FOREST_COUNT_STRATEGIES': {'tests_question': 'estimated'},
+                                                           'FOREST_COUNT_ESTIMATE_THRESHOLD': 10 ** 9}.get(setting,
+                                                                                                         default))
+    def test_get_estimated_small_table(self, *args, **kwargs):
+        url = reverse('django_forest:resources:count', kwargs={'resource': 'tests_question'})
+        response = self.client.get(url)
+        data = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data, {'count': 3})
+
+    @mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
+    @mock.patch('django_forest.resources.utils.count.get_forest_setting',
+                side_effect=lambda setting, default=None: {'FOREST_COUNT_STRATEGIES': {'tests_question': 'foo'}}.get(
+                    setting, default))
+    def test_get_unknown_strategy(self, *args, **kwargs):
+        url = reverse('django_forest:resources:count', kwargs={'resource': 'tests_question'})
+        response = self.client.get(url)
+        data = response.json()
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(data, {'errors': [{'detail': 'unknown count strategy foo'}]})
+
+    @mock.patch('django_forest.resources.utils.count.get_forest_setting',
+                side_effect=lambda setting, default=None: {'FOREST_COUNT_STRATEGIES': {'tests_question': 'foo'}}.get(
+                    setting, default))
+    def test_validate_count_strategies(self, *args, **kwargs):
+        with self.assertRaisesMessage(CountStrategyException, 'unknown count strategy foo'):
+            validate_count_strategies()
+
     @mock.patch('jose.jwt.decode', return_value={'id': 1})
     def test_get_invalid_token(self, *args, **kwargs):
         url = reverse('django_forest:resources:count', kwargs={'resource': 'tests_question'})
@@ -3,7 +3,9 @@ import sys
 from unittest import mock
 
 import pytest
+from django.db import connection
 from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from django_forest.tests.fixtures.schema import test_schema
@@ -65,6 +67,41 @@ class ResourceCsvViewTests(TransactionTestCase):
         self.assertEqual(response.content.decode('utf-8'),
                          'id,topic,question text,pub date,foo,bar\r\n1,,what is your favorite color?,2021-06-02T13:52:53.528000+00:00,what is your favorite color?+foo,what is your favorite color?+bar\r\n2,,do you like chocolate?,2021-06-02T15:52:53.528000+00:00,do you like chocolate?+foo,do you like chocolate?+bar\r\n3,,who is your favorite singer?,2021-06-03T13:52:53.528000+00:00,who is your favorite singer?+foo,who is your favorite singer?+bar\r\n')
 
+    def test_get_not_ordered(self, *args, **kwargs):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(self.reverse_url, {
+                'fields[tests_choice]': 'id,question,choice_text',
+                'fields[question]': 'question_text',
+                'filename': 'choices',
+                'header': 'id,question,choice text',
+                'timezone': 'Europe/Paris'
+            })
+        self.assertEqual(response.status_code, 200)
+        # Notice: only the paginated lists are ordered by primary key when unsorted
+        sql = captured.captured_queries[0]['sql']
+        self.assertIn('JOIN "tests_question"', sql)
+        self.assertNotIn('ORDER BY', sql)
+
+    @mock.patch('django_forest.resources.utils.csv.get_forest_setting',
+                side_effect=lambda setting, default=None: {'FOREST_CSV_STREAMING': True,
+                                                           'FOREST_CSV_CHUNK_SIZE': 2}.get(setting, default))
+    def test_get_streaming(self, *args, **kwargs):
+        response = self.client.get(self.url, {
+            'fields[tests_question]': 'id,topic,question_text,pub_date,foo,bar',
+            'fields[topic]': 'name',
+            'search': '',
+            'filters': '',
+            'searchExtended': 0,
+            'filename': 'questions',
+            'header': 'id,topic,question text,pub date,foo,bar',
+            'timezone': 'Europe/Paris',
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="questions.csv"')
+        self.assertEqual(b''.join(response.streaming_content).decode('utf-8'),
+                         'id,topic,question text,pub date,foo,bar\r\n1,,what is your favorite color?,2021-06-02T13:52:53.528000+00:00,what is your favorite color?+foo,what is your favorite color?+bar\r\n2,,do you like chocolate?,2021-06-02T15:52:53.528000+00:00,do you like chocolate?+foo,do you like chocolate?+bar\r\n3,,who is your favorite singer?,2021-06-03T13:52:53.528000+00:00,who is your favorite singer?+foo,who is your favorite singer?+bar\r\n')
+
     @mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
     @mock.patch('django_forest.utils.scope.ScopeManager._has_cache_expired', return_value=False)
     def test_get_related_data(self, *args, **kwargs):
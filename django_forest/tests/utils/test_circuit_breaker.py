@@ -0,0 +1,115 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from django_forest.tests.utils.test_forest_api_requester import mocked_requests
+from django_forest.utils.circuit_breaker import CircuitBreaker, CircuitBreakerOpenError, CLOSED, HALF_OPEN, OPEN
+
+
+class UtilsCircuitBreakerTests(TestCase):
+
+    def setUp(self):
+        self.now = 1000
+        patcher = mock.patch('django_forest.utils.circuit_breaker.time.monotonic', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        CircuitBreaker.reset()
+
+    def call(self, status_code=200):
+        return CircuitBreaker.call(lambda: mocked_requests({}, status_code))
+
+    def fail(self):
+        def method():
+            raise Exception('down')
+        with self.assertRaises(Exception):
+            CircuitBreaker.call(method)
+
+    def test_call_open(self):
+        for _ in range(5):
+            self.call()
+        for _ in range(4):
+            self.fail()
+        self.assertEqual(CircuitBreaker.state, CLOSED)
+        self.call(503)
+        self.assertEqual(CircuitBreaker.state, OPEN)
+        method = mock.Mock()
+        self.assertRaises(CircuitBreakerOpenError, CircuitBreaker.call, method)
+        method.assert_not_called()
+
+    def test_call_window(self):
+        for _ in range(9):
+            self.fail()
+        self.now += 61
+        self.call()
+        self.assertEqual(CircuitBreaker.state, CLOSED)
+        self.assertEqual(len(CircuitBreaker.calls), 1)
+
+    @mock.patch('django_forest.utils.circuit_breaker.get_forest_setting',
+                side_effect=lambda setting, default=None: {'FOREST_CIRCUIT_BREAKER_SLOW_CALL': 1}.get(setting, default))
+    def test_call_slow(self, *args):
+        def method():
+            self.now += 2
+            return mocked_requests({}, 200)
+        for _ in range(10):
+            CircuitBreaker.call(method)
+        self.assertEqual(CircuitBreaker.state, OPEN)
+
+    def test_call_half_open(self):
+        for _ in range(10):
+            self.fail()
+        self.now += 31
+
+        def probe():
+            # Notice: the other calls still fail fast while the probe is pending
+            self.assertEqual(CircuitBreaker.state, HALF_OPEN)
+            self.assertRaises(CircuitBreakerOpenError, self.call)
+            return mocked_requests({}, 200)
+        CircuitBreaker.call(probe)
+        self.assertEqual(CircuitBreaker.state, CLOSED)
+        self.call()
+
+    def test_call_half_open_failed(self):
+        for _ in range(10):
+            self.fail()
+        self.now += 31
+        self.call(500)
+        self.assertEqual(CircuitBreaker.state, OPEN)
+        self.assertRaises(CircuitBreakerOpenError, self.call)
+
+    def test_call_half_open_interrupted(self):
+        class Interrupted(BaseException):
+            pass
+
+        def probe():
+            raise Interrupted()
+
+        for _ in range(10):
+            self.fail()
+        self.now += 31
+        self.assertRaises(Interrupted, CircuitBreaker.call, probe)
+        # Notice: the interrupted probe is a failure, a new probe is allowed after the open duration
+        self.assertEqual(CircuitBreaker.state, OPEN)
+        self.assertFalse(CircuitBreaker._probing)
+        self.assertRaises(CircuitBreakerOpenError, self.call)
+        self.now += 31
+        self.assertRaises(AttributeError, CircuitBreaker.call, lambda: None)
+        self.assertEqual(CircuitBreaker.state, OPEN)
+        self.now += 31
+        self.call()
+        self.assertEqual(CircuitBreaker.state, CLOSED)
+
+    @mock.patch('django_forest.utils.circuit_breaker.get_forest_setting',
+                side_effect=lambda setting, default=None: {
+                    'FOREST_CIRCUIT_BREAKER_MIN_CALLS': 2,
+                    'FOREST_CIRCUIT_BREAKER_FAILURE_RATE': 1,
+                }.get(setting, default))
+    def test_call_settings(self, *args):
+        self.call()
+        self.fail()
+        self.assertEqual(CircuitBreaker.state, CLOSED)
+        CircuitBreaker.reset()
+        self.fail()
+        self.fail()
+        self.assertEqual(CircuitBreaker.state, OPEN)
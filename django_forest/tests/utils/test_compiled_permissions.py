@@ -0,0 +1,96 @@
+import copy
+
+from django.test import TestCase
+
+from django_forest.tests.fixtures.schema import test_schema
+from django_forest.tests.middleware import mocked_permissions
+from django_forest.utils.permissions import Permission
+from django_forest.utils.permissions.compiled import CompiledPermissions
+from django_forest.utils.schema import Schema
+
+PERMISSIONS = copy.deepcopy(mocked_permissions)
+PERMISSIONS['data']['collections']['tests_question']['collection']['browseEnabled'] = list(range(1000))
+PERMISSIONS['data']['collections']['tests_question']['collection']['deleteEnabled'] = None
+PERMISSIONS['data']['collections']['tests_question']['actions'] = {
+    'Send invoice': {'triggerEnabled': [1, 2]},
+}
+PERMISSIONS['stats'] = {
+    'queries': ['SELECT COUNT(*) AS value FROM tests_question'],
+    'values': [
+        {'type': 'Value', 'filter': None, 'aggregator': 'Count', 'sourceCollectionId': 'tests_question'},
+        {'type': 'Value', 'filter': {'field': 'id', 'operator': 'equal', 'value': 1}, 'aggregator': 'Sum',
+         'aggregateFieldName': 'id', 'sourceCollectionId': 'tests_question'},
+    ],
+}
+
+
+class CompiledPermissionsTests(TestCase):
+
+    def setUp(self):
+        Schema.schema = copy.deepcopy(test_schema)
+        Schema.get_collection('tests_question')['actions'].append({
+            'name': 'Send invoice', 'endpoint': '/forest/actions/send-invoice', 'http_method': 'POST',
+        })
+        self.compiled = CompiledPermissions(PERMISSIONS)
+
+    def tearDown(self):
+        Permission.permissions_cached = {}
+        Permission.compiled_permissions_cached = {}
+
+    def test_collection(self):
+        self.assertEqual(self.compiled.get_collection_value('tests_question', 'browseEnabled'), frozenset(range(1000)))
+        self.assertIsNone(self.compiled.get_collection_value('tests_question', 'deleteEnabled'))
+        self.assertTrue(self.compiled.get_collection_value('tests_question', 'editEnabled'))
+        self.assertEqual(self.compiled.get_action_value('tests_question', 'Send invoice'), frozenset([1, 2]))
+
+    def test_queries(self):
+        self.assertTrue(self.compiled.is_query_allowed('SELECT COUNT(*) AS value FROM tests_question'))
+        self.assertFalse(self.compiled.is_query_allowed('SELECT SUM(id) AS value FROM tests_question'))
+        self.assertFalse(CompiledPermissions(mocked_permissions).is_query_allowed('SELECT 1'))
+
+    def test_stats(self):
+        self.assertTrue(self.compiled.is_stat_allowed('values', ['Value', 'Count', 'tests_question', None]))
+        self.assertTrue(self.compiled.is_stat_allowed('values', [
+            'Value', {'value': 1, 'operator': 'equal', 'field': 'id'}, 'Sum', 'id', 'tests_question'
+        ]))
+        # Notice: a part of a saved chart values is allowed
+        self.assertTrue(self.compiled.is_stat_allowed('values', ['Value', 'Sum']))
+        self.assertFalse(self.compiled.is_stat_allowed('values', ['Value', 'Sum', 'tests_choice']))
+        self.assertFalse(self.compiled.is_stat_allowed('pies', ['Pie', 'Count']))
+
+    def test_json_string(self):
+        compiled = CompiledPermissions({'stats': {
+            'queries': [{'a': 1}],
+            'values': [{'type': 'Value', 'filter': {'a': 1}}],
+        }})
+        self.assertTrue(compiled.is_query_allowed({'a': 1}))
+        self.assertFalse(compiled.is_query_allowed('{"a": 1}'))
+        self.assertTrue(compiled.is_stat_allowed('values', ['Value', {'a': 1}]))
+        self.assertFalse(compiled.is_stat_allowed('values', ['Value', '{"a": 1}']))
+
+    def test_permission_allowed(self):
+        Permission.permissions_cached['1'] = PERMISSIONS
+        self.assertTrue(Permission.permission_allowed(Permission('tests_question', 'browseEnabled', 1, 999)))
+        self.assertFalse(Permission.permission_allowed(Permission('tests_question', 'browseEnabled', 1, 1000)))
+        self.assertFalse(Permission.permission_allowed(Permission('tests_question', 'deleteEnabled', 1, 1)))
+        self.assertFalse(Permission.permission_allowed(Permission('tests_choice', 'browseEnabled', 1, 1)))
+        compiled = Permission.compiled_permissions_cached['1']
+        self.assertIs(Permission.get_compiled_permissions('1'), compiled)
+
+    def test_permission_allowed_actions(self):
+        Permission.permissions_cached['1'] = PERMISSIONS
+        info = {'endpoint': '/forest/actions/send-invoice', 'http_method': 'POST'}
+        self.assertTrue(Permission.permission_allowed(
+            Permission('tests_question', 'actions', 1, 2, smart_action_request_info=info)))
+        self.assertFalse(Permission.permission_allowed(
+            Permission('tests_question', 'actions', 1, 3, smart_action_request_info=info)))
+        self.assertFalse(Permission.permission_allowed(Permission(
+            'tests_question', 'actions', 1, 2,
+            smart_action_request_info={'endpoint': '/forest/actions/not-exists', 'http_method': 'POST'})))
+
+    def test_get_compiled_permissions_changed(self):
+        Permission.permissions_cached['1'] = PERMISSIONS
+        compiled = Permission.get_compiled_permissions('1')
+        Permission.permissions_cached['1'] = copy.deepcopy(mocked_permissions)
+        self.assertIsNot(Permission.get_compiled_permissions('1'), compiled)
+        self.assertTrue(Permission.permission_allowed(Permission('tests_question', 'browseEnabled', 1, 1000)))
@@ -0,0 +1,96 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.db.models.signals import post_save
+from django.test import TestCase
+
+from django_forest.tests.models import Choice, Question, Topic
+from django_forest.utils.count_cache import CountCache
+
+
+def count(queryset):
+    return {'count': queryset.count()}
+
+
+@mock.patch('django_forest.utils.count_cache.get_forest_setting',
+            side_effect=lambda setting, default=None: {'FOREST_COUNT_CACHE_TTL': 60}.get(setting, default))
+class UtilsCountCacheTests(TestCase):
+    fixtures = ['question.json', 'choice.json']
+
+    def setUp(self):
+        CountCache.connect_signals()
+
+    def tearDown(self):
+        CountCache.disconnect_signals()
+        caches['default'].clear()
+
+    def test_get_or_count(self, *args):
+        with self.assertNumQueries(1):
+            self.assertEqual(CountCache.get_or_count(Question.objects.all(), 'exact', count), {'count': 3})
+            self.assertEqual(CountCache.get_or_count(Question.objects.all(), 'exact', count), {'count': 3})
+
+    def test_get_or_count_other_query(self, *args):
+        CountCache.get_or_count(Question.objects.all(), 'exact', count)
+        with self.assertNumQueries(1):
+            res = CountCache.get_or_count(Question.objects.filter(question_text__icontains='favorite'), 'exact', count)
+        self.assertEqual(res, {'count': 2})
+
+    def test_get_or_count_empty_result(self, *args):
+        with self.assertNumQueries(0):
+            self.assertEqual(CountCache.get_or_count(Question.objects.filter(pk__in=[]), 'exact', count),
+                             {'count': 0})
+
+    @mock.patch.object(CountCache, 'get_ttl', return_value=0)
+    def test_get_or_count_disabled(self, *args):
+        with self.assertNumQueries(2):
+            CountCache.get_or_count(Question.objects.all(), 'exact', count)
+            CountCache.get_or_count(Question.objects.all(), 'exact', count)
+
+    def test_post_save(self, *args):
+        CountCache.get_or_count(Question.objects.all(), 'exact', count)
+        CountCache.get_or_count(Choice.objects.all(), 'exact', count)
+        Question.objects.create(question_text='is it invalidated?')
+        with self.assertNumQueries(1):
+            self.assertEqual(CountCache.get_or_count(Question.objects.all(), 'exact', count), {'count': 4})
+            self.assertEqual(CountCache.get_or_count(Choice.objects.all(), 'exact', count), {'count': 3})
+
+    def test_post_delete(self, *args):
+        CountCache.get_or_count(Choice.objects.all(), 'exact', count)
+        Choice.objects.get(pk=1).delete()
+        self.assertEqual(CountCache.get_or_count(Choice.objects.all(), 'exact', count), {'count': 2})
+
+    def test_related_changed(self, *args):
+        queryset = Choice.objects.filter(question__question_text__icontains='favorite')
+        self.assertEqual(CountCache.get_or_count(queryset, 'exact', count), {'count': 2})
+        question = Question.objects.get(pk=1)
+        question.question_text = 'what is your least loved language?'
+        question.save()
+        # Notice: a change on the table behind the filter expires the count
+        self.assertEqual(CountCache.get_or_count(queryset, 'exact', count), {'count': 0})
+
+    def test_subquery_changed(self, *args):
+        queryset = Choice.objects.filter(question__in=Question.objects.filter(question_text__icontains='favorite'))
+        self.assertEqual(CountCache.get_or_count(queryset, 'exact', count), {'count': 2})
+        question = Question.objects.get(pk=2)
+        question.question_text = 'what is your favorite chocolate?'
+        question.save()
+        self.assertEqual(CountCache.get_or_count(queryset, 'exact', count), {'count': 3})
+
+    def test_not_listened(self, *args):
+        with mock.patch('django_forest.utils.count_cache.Models.list', return_value=[Choice]):
+            CountCache.connect_signals()
+        queryset = Choice.objects.filter(question__question_text__icontains='favorite')
+        with self.assertNumQueries(2):
+            CountCache.get_or_count(queryset, 'exact', count)
+            CountCache.get_or_count(queryset, 'exact', count)
+        with self.assertNumQueries(1):
+            CountCache.get_or_count(Choice.objects.all(), 'exact', count)
+            CountCache.get_or_count(Choice.objects.all(), 'exact', count)
+
+    def test_connect_signals(self, *args):
+        uids = [receiver[0][0] for receiver in post_save.receivers]
+        self.assertIn('forest_count_cache_post_save_tests.question', uids)
+        self.assertNotIn('forest_count_cache_post_save', uids)
+        with mock.patch.object(CountCache, 'invalidate') as mocked_invalidate:
+            post_save.send(sender=Topic, instance=Topic(name='listened'), created=True)
+        mocked_invalidate.assert_called_once_with(Topic)
@@ -33,14 +33,14 @@ def mocked_requests_no_data(status_code):
 
 class UtilsForestApiRequesterTests(TestCase):
 
-    @mock.patch('requests.get', return_value=mocked_requests({'key1': 'value1'}, 200))
+    @mock.patch('requests.Session.get', return_value=mocked_requests({'key1': 'value1'}, 200))
     def test_get(self, mocked_requests_get):
         r = ForestApiRequester.get('/foo')
         self.assertEqual(r.status_code, 200)
         self.assertEqual(r.json_data, {'key1': 'value1'})
 
     @override_settings(DEBUG=True)
-    @mock.patch('requests.get', return_value=mocked_requests({'key1': 'value1'}, 200))
+    @mock.patch('requests.Session.get', return_value=mocked_requests({'key1': 'value1'}, 200))
     def test_get_debug(self, mocked_requests_get):
         r = ForestApiRequester.get(
             ForestApiRequester.build_url('/foo')
@@ -51,17 +51,18 @@ class UtilsForestApiRequesterTests(TestCase):
             'https://api.test.forestadmin.com/foo',
             headers={'Content-Type': 'application/json', 'forest-secret-key': 'foo'},
             params={},
+            timeout=(5.0, 30.0),
             verify=False
         )
 
-    @mock.patch('requests.post', return_value=mocked_requests({'key1': 'value1'}, 200))
+    @mock.patch('requests.Session.post', return_value=mocked_requests({'key1': 'value1'}, 200))
     def test_post(self, mocked_requests_post):
         r = ForestApiRequester.post('/foo', {'foo': 'bar'})
         self.assertEqual(r.status_code, 200)
         self.assertEqual(r.json_data, {'key1': 'value1'})
 
     @override_settings(DEBUG=True)
-    @mock.patch('requests.post', return_value=mocked_requests({'key1': 'value1'}, 200))
+    @mock.patch('requests.Session.post', return_value=mocked_requests({'key1': 'value1'}, 200))
     def test_post_debug(self, mocked_requests_post):
         r = ForestApiRequester.post(
             ForestApiRequester.build_url('/foo'), 
@@ -74,10 +75,11 @@ class UtilsForestApiRequesterTests(TestCase):
             data=json.dumps({'foo': 'bar'}),
             headers={'Content-Type': 'application/json', 'forest-secret-key': 'foo'},
             params={},
+            timeout=(5.0, 30.0),
             verify=False
         )
 
-    @mock.patch('requests.post', return_value=mocked_requests({'key1': 'value1'}, 200))
+    @mock.patch('requests.Session.post', return_value=mocked_requests({'key1': 'value1'}, 200))
     def test_post_ssl(self, mocked_requests_post):
         r = ForestApiRequester.post('/foo', {'foo': 'bar'})
         self.assertEqual(r.status_code, 200)
@@ -90,3 +92,40 @@ class UtilsForestApiRequesterTests(TestCase):
     def test_get_url_ssl(self):
         url = ForestApiRequester._get_url('https://foo.com')
         self.assertEqual(url, 'https://foo.com')
+
+
+class UtilsForestApiRequesterSessionTests(TestCase):
+
+    def tearDown(self):
+        ForestApiRequester._session = None
+        ForestApiRequester._session_pid = None
+
+    def test_get_session(self):
+        session = ForestApiRequester.get_session()
+        self.assertIs(ForestApiRequester.get_session(), session)
+        adapter = session.get_adapter('https://api.test.forestadmin.com')
+        self.assertEqual(adapter.max_retries.total, 2)
+        self.assertEqual(adapter.max_retries.status_forcelist, (502, 503, 504))
+        self.assertTrue(adapter.max_retries.is_retry('GET', 503))
+        self.assertFalse(adapter.max_retries.is_retry('POST', 503))
+
+    def test_get_session_forked(self):
+        session = ForestApiRequester.get_session()
+        with mock.patch('django_forest.utils.forest_api_requester.os.getpid', return_value=-1):
+            self.assertIsNot(ForestApiRequester.get_session(), session)
+
+    @mock.patch('django_forest.utils.forest_api_requester.get_forest_setting',
+                side_effect=lambda setting, default=None: {
+                    'FOREST_API_CONNECT_TIMEOUT': 1,
+                    'FOREST_API_READ_TIMEOUT': '2.5',
+                    'FOREST_API_RETRIES': 0,
+                }.get(setting, default))
+    def test_settings(self, *args):
+        self.assertEqual(ForestApiRequester.get_timeout(), (1.0, 2.5))
+        adapter = ForestApiRequester.get_session().get_adapter('https://api.test.forestadmin.com')
+        self.assertEqual(adapter.max_retries.total, 0)
+
+    @mock.patch('requests.Session.get', return_value=mocked_requests({'key1': 'value1'}, 200))
+    def test_get_timeout(self, mocked_requests_get):
+        ForestApiRequester.get('https://api.test.forestadmin.com/foo')
+        self.assertEqual(mocked_requests_get.call_args.kwargs['timeout'], (5.0, 30.0))
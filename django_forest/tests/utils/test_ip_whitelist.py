@@ -0,0 +1,83 @@
+import ipaddress
+
+from django.test import TestCase
+
+from django_forest.utils.ip_whitelist import CompiledIpWhitelistRules, IpWhitelist
+
+RULES = [
+    {'type': 0, 'ip': '123.12.34.0'},
+    {'type': 1, 'ipMinimum': '10.0.0.1', 'ipMaximum': '10.0.0.10'},
+    {'type': 1, 'ipMinimum': '10.0.0.5', 'ipMaximum': '10.0.0.20'},
+    {'type': 2, 'range': '10.0.0.0/27'},
+    {'type': 2, 'range': '192.168.0.0/31'},
+    {'type': 2, 'range': '2001:db8::/120'},
+]
+
+
+def is_allowed(ip):
+    return CompiledIpWhitelistRules(RULES).is_ip_allowed(ipaddress.ip_address(ip))
+
+
+class UtilsCompiledIpWhitelistRulesTests(TestCase):
+
+    def tearDown(self):
+        IpWhitelist.rules = []
+        IpWhitelist.compiled_rules = None
+
+    def test_intervals(self):
+        compiled = CompiledIpWhitelistRules(RULES)
+        self.assertEqual(compiled.intervals[4], (
+            [int(ipaddress.ip_address('10.0.0.1')), int(ipaddress.ip_address('123.12.34.0')),
+             int(ipaddress.ip_address('192.168.0.0'))],
+            [int(ipaddress.ip_address('10.0.0.30')), int(ipaddress.ip_address('123.12.34.0')),
+             int(ipaddress.ip_address('192.168.0.1'))],
+        ))
+        self.assertFalse(compiled.allows_loopback)
+
+    def test_is_ip_allowed(self):
+        self.assertTrue(is_allowed('123.12.34.0'))
+        self.assertFalse(is_allowed('123.12.34.1'))
+        self.assertTrue(is_allowed('10.0.0.20'))
+        # Notice: the network and broadcast addresses are not hosts of a subnet
+        self.assertFalse(is_allowed('10.0.0.0'))
+        self.assertTrue(is_allowed('10.0.0.30'))
+        self.assertFalse(is_allowed('10.0.0.31'))
+        self.assertTrue(is_allowed('192.168.0.0'))
+        self.assertTrue(is_allowed('192.168.0.1'))
+        self.assertFalse(is_allowed('9.255.255.255'))
+        self.assertFalse(is_allowed('::ffff:123.12.34.0'))
+        self.assertFalse(is_allowed('2001:db8::'))
+        self.assertTrue(is_allowed('2001:db8::ff'))
+        self.assertFalse(is_allowed('2001:db8::100'))
+        self.assertFalse(is_allowed('127.0.0.1'))
+
+    def test_is_ip_allowed_hosts(self):
+        rules = [{'type': 2, 'range': '10.0.0.0/28'}, {'type': 2, 'range': 'fe80::/125'}]
+        compiled = CompiledIpWhitelistRules(rules)
+        for subnet in ('10.0.0.0/27', 'fe80::/124'):
+            for ip in ipaddress.ip_network(subnet):
+                expected = any(ip in list(ipaddress.ip_network(rule['range']).hosts()) for rule in rules)
+                self.assertEqual(compiled.is_ip_allowed(ip), expected, ip)
+
+    def test_is_ip_allowed_large_subnet(self):
+        compiled = CompiledIpWhitelistRules([{'type': 2, 'range': '10.0.0.0/8'}, {'type': 2, 'range': '2001:db8::/32'}])
+        self.assertTrue(compiled.is_ip_allowed(ipaddress.ip_address('10.200.3.4')))
+        self.assertFalse(compiled.is_ip_allowed(ipaddress.ip_address('11.0.0.0')))
+        self.assertTrue(compiled.is_ip_allowed(ipaddress.ip_address('2001:db8:ffff::1')))
+
+    def test_is_ip_allowed_loopback(self):
+        compiled = CompiledIpWhitelistRules([{'type': 0, 'ip': '127.0.0.1'}])
+        self.assertTrue(compiled.allows_loopback)
+        self.assertTrue(compiled.is_ip_allowed(ipaddress.ip_address('127.0.0.2')))
+        self.assertTrue(compiled.is_ip_allowed(ipaddress.ip_address('::1')))
+        self.assertFalse(compiled.is_ip_allowed(ipaddress.ip_address('128.0.0.1')))
+
+    def test_is_ip_matches_any_rule(self):
+        IpWhitelist.rules = RULES
+        self.assertTrue(IpWhitelist.is_ip_matches_any_rule('10.0.0.3'))
+        compiled = IpWhitelist.compiled_rules
+        self.assertTrue(compiled.is_built_from(RULES))
+        self.assertFalse(IpWhitelist.is_ip_matches_any_rule('10.0.0.0'))
+        self.assertIs(IpWhitelist.compiled_rules, compiled)
+        IpWhitelist.rules = [{'type': 0, 'ip': '10.0.0.0'}]
+        self.assertTrue(IpWhitelist.is_ip_matches_any_rule('10.0.0.0'))
@@ -0,0 +1,64 @@
+import copy
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.test import TestCase
+
+from django_forest.tests.fixtures.schema import test_schema
+from django_forest.tests.models import Choice, Question, Session
+from django_forest.utils.collection import Collection
+from django_forest.utils.schema import Schema
+from django_forest.utils.schema.json_api_plan import JsonApiPlan, JsonApiPlanUnavailable
+from django_forest.utils.schema.json_api_schema import JsonApiSchema
+from django_forest.utils.scope import ScopeManager
+
+
+class UtilsJsonApiPlanTests(TestCase):
+    fixtures = ['session.json', 'question.json', 'choice.json']
+
+    def setUp(self):
+        Schema.schema = copy.deepcopy(test_schema)
+        Schema.handle_json_api_schema()
+
+    def tearDown(self):
+        # reset _registry after each test
+        Collection._registry = {}
+        JsonApiSchema._registry = {}
+        JsonApiPlan._registry = {}
+        ScopeManager.cache = {}
+
+    def assertSameDocument(self, collection_name, queryset, **kwargs):
+        expected = JsonApiSchema.get(collection_name)(**kwargs).dump(queryset, many=True)
+        data = JsonApiPlan.get(collection_name).dump(queryset, **kwargs)
+        # Notice: same documents, including the keys order
+        self.assertEqual(json.dumps(data, cls=DjangoJSONEncoder), json.dumps(expected, cls=DjangoJSONEncoder))
+
+    def test_dump(self):
+        self.assertSameDocument('tests_question', Question.objects.all())
+
+    def test_dump_only(self):
+        self.assertSameDocument('tests_question', Question.objects.all(), only=['question_text', 'id'])
+
+    def test_dump_include_data(self):
+        self.assertSameDocument('tests_choice', Choice.objects.all(),
+                                include_data=['question'],
+                                only=['id', 'choice_text', 'question.question_text'])
+
+    def test_dump_include_data_all_fields(self):
+        self.assertSameDocument('tests_choice', Choice.objects.all(), include_data=['question'])
+
+    def test_dump_pk_is_not_id(self):
+        self.assertSameDocument('tests_session', Session.objects.all())
+
+    def test_unknown_field(self):
+        with self.assertRaises(JsonApiPlanUnavailable):
+            JsonApiPlan.get('tests_question').dump(Question.objects.all(), only=['foo'])
+
+    def test_include_has_many(self):
+        with self.assertRaises(JsonApiPlanUnavailable):
+            JsonApiPlan.get('tests_question').dump(Question.objects.all(), include_data=['choice_set'])
+
+    def test_no_plan(self):
+        with self.assertRaises(JsonApiPlanUnavailable) as cm:
+            JsonApiPlan.get('Foo')
+        self.assertEqual(cm.exception.args[0], 'No compiled serializer for Foo')
@@ -1,10 +1,14 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
-from django_forest.tests.models import Question
+from django_forest.tests.models import Choice, Question
+from django_forest.utils import get_association_field
 from django_forest.utils.models import Models
 
 
 class UtilsGetModelTests(TestCase):
+    def tearDown(self):
+        Models.models = None
+
     def test_get_model(self):
         Model = Models.get('tests_question')
         self.assertEqual(Model, Question)
@@ -12,3 +16,26 @@ class UtilsGetModelTests(TestCase):
     def test_get_model_None(self):
         Model = Models.get('tests_foo')
         self.assertEqual(Model, None)
+
+    def test_get_model_case_and_plural(self):
+        self.assertEqual(Models.get('Tests_Question'), Question)
+        self.assertEqual(Models.get('tests_questions'), Question)
+
+    def test_get_model_force(self):
+        Models.list(force=True)
+        self.assertEqual(Models.get('tests_question'), Question)
+        with override_settings(FOREST={'INCLUDED_MODELS': ['tests_choice']}):
+            Models.list(force=True)
+        self.assertEqual(Models.get('tests_question'), None)
+        self.assertEqual(Models.get('tests_choice'), Choice)
+
+
+class UtilsGetAssociationFieldTests(TestCase):
+    def test_get_association_field(self):
+        self.assertEqual(get_association_field(Question, 'choice_set'), Choice._meta.get_field('question').remote_field)
+        self.assertEqual(get_association_field(Choice, 'question'), Choice._meta.get_field('question'))
+
+    def test_get_association_field_not_relation(self):
+        with self.assertRaises(Exception) as cm:
+            get_association_field(Question, 'question_text')
+        self.assertEqual(cm.exception.args[0], 'cannot find association resource question_text for Model tests_question')
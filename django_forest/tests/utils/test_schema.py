@@ -15,6 +15,7 @@ from django_forest.utils.collection import Collection
 from django_forest.utils.schema.json_api_schema import JsonApiSchema
 from django_forest.utils.models import Models
 from django_forest.utils.schema import Schema
+from django_forest.utils.schema.definitions import FIELD
 from django_forest.utils.scope import ScopeManager
 
 # reset forest config dir auto import
@@ -115,6 +116,37 @@ class UtilsSchemaTests(TestCase):
         collection = Schema.get_collection('Foo')
         self.assertEqual(collection, None)
 
+    def test_get_collection_schema_mutated(self):
+        self.assertEqual(Schema.get_collection('Foo'), None)
+        Schema.schema['collections'].append({'name': 'Foo', 'fields': []})
+        self.assertEqual(Schema.get_collection('Foo'), {'name': 'Foo', 'fields': []})
+
+        Schema.schema = copy.deepcopy(test_schema)
+        self.assertEqual(Schema.get_collection('Foo'), None)
+
+    def test_get_collection_metadata(self):
+        metadata = Schema.get_collection_metadata('tests_question')
+        self.assertEqual(list(metadata.fields.keys()), ['choice_set', 'id', 'question_text', 'pub_date', 'topic'])
+        self.assertEqual(metadata.smart_fields, {})
+        self.assertEqual([x['field'] for x in metadata.search_fields], ['id', 'question_text'])
+        self.assertEqual([x['field'] for x in metadata.single_relationships], ['topic'])
+        self.assertIs(Schema.get_collection_metadata('tests_question'), metadata)
+
+    def test_get_collection_metadata_inexist(self):
+        self.assertEqual(Schema.get_collection_metadata('Foo'), None)
+
+    def test_get_collection_metadata_fields_mutated(self):
+        metadata = Schema.get_collection_metadata('tests_question')
+        collection = Schema.get_collection('tests_question')
+        collection['fields'].append(Schema.get_default({'field': 'foo', 'type': 'String', 'is_virtual': True}, FIELD))
+        collection['search_fields'] = ['question_text', 'foo']
+
+        new_metadata = Schema.get_collection_metadata('tests_question')
+        self.assertIsNot(new_metadata, metadata)
+        self.assertEqual(list(new_metadata.smart_fields.keys()), ['foo'])
+        self.assertEqual([x['field'] for x in new_metadata.search_fields], ['question_text'])
+        self.assertEqual([x['field'] for x in new_metadata.decorator_search_fields], ['question_text', 'foo'])
+
     def test_handle_json_api_schema(self):
         Schema.handle_json_api_schema()
         self.assertEqual(len(JsonApiSchema._registry), 22)
@@ -219,7 +251,7 @@ class UtilsSchemaSendTests(TestCase):
         self.assertRaises(Exception, Schema.send_apimap())
 
     @override_settings(DEBUG=True)
-    @mock.patch('requests.post', return_value=mocked_requests({'key1': 'value1'}, 200))
+    @mock.patch('requests.Session.post', return_value=mocked_requests({'key1': 'value1'}, 200))
     def test_send_apimap(self, mocked_requests_post):
         Schema.schema_data = test_question_schema_data
         Schema.send_apimap()
@@ -228,11 +260,12 @@ class UtilsSchemaSendTests(TestCase):
             data=json.dumps(test_serialized_schema),
             headers={'Content-Type': 'application/json', 'forest-secret-key': 'foo'},
             params={},
+            timeout=(5.0, 30.0),
             verify=False
         )
 
     @override_settings(DEBUG=True)
-    @mock.patch('requests.post', return_value=mocked_requests_no_data(204))
+    @mock.patch('requests.Session.post', return_value=mocked_requests_no_data(204))
     def test_send_apimap_no_changes(self, mocked_requests_post):
         Schema.schema_data = test_question_schema_data
         Schema.send_apimap()
@@ -241,10 +274,11 @@ class UtilsSchemaSendTests(TestCase):
             data=json.dumps(test_serialized_schema),
             headers={'Content-Type': 'application/json', 'forest-secret-key': 'foo'},
             params={},
+            timeout=(5.0, 30.0),
             verify=False
         )
 
-    @mock.patch('requests.post', return_value=mocked_requests({'key1': 'value1'}, 200))
+    @mock.patch('requests.Session.post', return_value=mocked_requests({'key1': 'value1'}, 200))
     def test_send_apimap_production(self, mocked_requests_post):
         Schema.schema_data = test_question_schema_data
         Schema.send_apimap()
@@ -253,9 +287,10 @@ class UtilsSchemaSendTests(TestCase):
             data=json.dumps(test_serialized_schema),
             headers={'Content-Type': 'application/json', 'forest-secret-key': 'foo'},
             params={},
+            timeout=(5.0, 30.0),
         )
 
-    @mock.patch('requests.post', return_value=mocked_requests({'warning': 'foo'}, 200))
+    @mock.patch('requests.Session.post', return_value=mocked_requests({'warning': 'foo'}, 200))
     def test_send_apimap_warning(self, mocked_requests_post):
         Schema.schema_data = test_question_schema_data
         with self.assertLogs() as cm:
@@ -263,7 +298,7 @@ class UtilsSchemaSendTests(TestCase):
             self.assertEqual(cm.records[0].message, 'foo')
             self.assertEqual(cm.records[0].levelname, 'WARNING')
 
-    @mock.patch('requests.post', side_effect=Exception('foo'))
+    @mock.patch('requests.Session.post', side_effect=Exception('foo'))
     def test_send_apimap_zero(self, mocked_requests_post):
         Schema.schema_data = test_question_schema_data
         with self.assertLogs() as cm:
@@ -272,7 +307,7 @@ class UtilsSchemaSendTests(TestCase):
                              'Cannot send the apimap to Forest. Are you online?')
             self.assertEqual(cm.records[0].levelname, 'WARNING')
 
-    @mock.patch('requests.post', return_value=mocked_requests({}, 404))
+    @mock.patch('requests.Session.post', return_value=mocked_requests({}, 404))
     def test_send_apimap_not_found(self, mocked_requests_post):
         Schema.schema_data = test_question_schema_data
         with self.assertLogs() as cm:
@@ -281,7 +316,7 @@ class UtilsSchemaSendTests(TestCase):
                              'Cannot find the project related to the envSecret you configured. Can you check on Forest that you copied it properly in the Forest settings?')
             self.assertEqual(cm.records[0].levelname, 'ERROR')
 
-    @mock.patch('requests.post', return_value=mocked_requests({}, 503))
+    @mock.patch('requests.Session.post', return_value=mocked_requests({}, 503))
     def test_send_apimap_unavailable(self, mocked_requests_post):
         Schema.schema_data = test_question_schema_data
         with self.assertLogs() as cm:
@@ -290,7 +325,7 @@ class UtilsSchemaSendTests(TestCase):
                              'Forest is in maintenance for a few minutes. We are upgrading your experience in the forest. We just need a few more minutes to get it right.')
             self.assertEqual(cm.records[0].levelname, 'WARNING')
 
-    @mock.patch('requests.post', return_value=mocked_requests({}, 500))
+    @mock.patch('requests.Session.post', return_value=mocked_requests({}, 500))
     def test_send_apimap_error(self, mocked_requests_post):
         Schema.schema_data = test_question_schema_data
 
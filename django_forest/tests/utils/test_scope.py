@@ -0,0 +1,137 @@
+import threading
+import time
+from datetime import datetime
+from unittest import mock
+
+import pytz
+from django.test import TestCase
+from freezegun import freeze_time
+
+from django_forest.utils.circuit_breaker import CircuitBreaker, OPEN
+from django_forest.utils.scope import ScopeManager
+
+SCOPES = {'tests_question': {'scope': {'filter': {'aggregator': 'and', 'conditions': []}}}}
+STALE_SCOPES = {'tests_question': {'scope': {'filter': {'aggregator': 'or', 'conditions': []}}}}
+
+
+@freeze_time(lambda: datetime(2021, 7, 8, 10, 0, 0, tzinfo=pytz.UTC))
+class UtilsScopeManagerTests(TestCase):
+
+    def tearDown(self):
+        ScopeManager.cache = {}
+        ScopeManager._refreshing = {}
+        CircuitBreaker.reset()
+
+    def set_cache(self, minute):
+        ScopeManager.cache = {
+            '1': {
+                'scopes': STALE_SCOPES,
+                'fetched_at': datetime(2021, 7, 8, 9, minute, 0, tzinfo=pytz.UTC)
+            }
+        }
+
+    @mock.patch('django_forest.utils.scope.ForestApiRequester.get_from_rendering_id', return_value=SCOPES)
+    def test_get_scope_collection_scope_fresh(self, mocked_get):
+        self.set_cache(58)
+        self.assertEqual(ScopeManager._get_scope_collection_scope('1', 'tests_question'), STALE_SCOPES['tests_question'])
+        mocked_get.assert_not_called()
+
+    @mock.patch('django_forest.utils.scope.ForestApiRequester.get_from_rendering_id', return_value=SCOPES)
+    def test_get_scope_collection_scope_cold(self, mocked_get):
+        self.assertEqual(ScopeManager._get_scope_collection_scope('1', 'tests_question'), SCOPES['tests_question'])
+        mocked_get.assert_called_once_with('/liana/scopes', '1')
+
+    @mock.patch('django_forest.utils.scope.ForestApiRequester.get_from_rendering_id', return_value=SCOPES)
+    def test_get_scope_collection_scope_hard_expired(self, mocked_get):
+        ScopeManager.cache = {
+            '1': {
+                'scopes': STALE_SCOPES,
+                'fetched_at': datetime(2021, 7, 8, 8, 0, 0, tzinfo=pytz.UTC)
+            }
+        }
+        self.assertEqual(ScopeManager._get_scope_collection_scope('1', 'tests_question'), SCOPES['tests_question'])
+        mocked_get.assert_called_once_with('/liana/scopes', '1')
+
+    def test_get_scope_collection_scope_stale(self):
+        self.set_cache(50)
+        fetching = threading.Event()
+
+        def get_from_rendering_id(url, rendering_id):
+            fetching.wait(5)
+            return SCOPES
+
+        with mock.patch('django_forest.utils.scope.ForestApiRequester.get_from_rendering_id',
+                        side_effect=get_from_rendering_id) as mocked_get:
+            # Notice: the stale scopes are served while the refresh is pending, a single refresh is started
+            self.assertEqual(ScopeManager._get_scope_collection_scope('1', 'tests_question'),
+                             STALE_SCOPES['tests_question'])
+            self.assertEqual(ScopeManager._get_scope_collection_scope('1', 'tests_question'),
+                             STALE_SCOPES['tests_question'])
+            thread = ScopeManager._refreshing['1']
+            fetching.set()
+            thread.join(5)
+        mocked_get.assert_called_once_with('/liana/scopes', '1')
+        self.assertEqual(ScopeManager._refreshing, {})
+        self.assertEqual(ScopeManager._get_scope_collection_scope('1', 'tests_question'), SCOPES['tests_question'])
+
+    @mock.patch('django_forest.utils.scope.ForestApiRequester.get_from_rendering_id', side_effect=Exception('down'))
+    def test_get_scope_collection_scope_stale_error(self, mocked_get):
+        self.set_cache(50)
+        self.assertEqual(ScopeManager._get_scope_collection_scope('1', 'tests_question'), STALE_SCOPES['tests_question'])
+        thread = ScopeManager._refreshing.get('1')
+        if thread is not None:
+            thread.join(5)
+        self.assertEqual(ScopeManager._refreshing, {})
+        self.assertEqual(ScopeManager.cache['1']['scopes'], STALE_SCOPES)
+
+    @mock.patch('django_forest.utils.scope.get_forest_setting',
+                side_effect=lambda setting, default=None: {'FOREST_SCOPE_CACHE_MAX_AGE': 60 * 5}.get(setting, default))
+    @mock.patch('django_forest.utils.scope.ForestApiRequester.get_from_rendering_id', return_value=SCOPES)
+    def test_get_scope_collection_scope_max_age_setting(self, mocked_get, *args):
+        self.set_cache(50)
+        self.assertEqual(ScopeManager._get_scope_collection_scope('1', 'tests_question'), SCOPES['tests_question'])
+        mocked_get.assert_called_once_with('/liana/scopes', '1')
+
+    @mock.patch('django_forest.utils.scope.ForestApiRequester.get_from_rendering_id', side_effect=Exception('down'))
+    def test_get_scope_collection_scope_hard_expired_error(self, mocked_get):
+        ScopeManager.cache = {
+            '1': {
+                'scopes': STALE_SCOPES,
+                'fetched_at': datetime(2021, 7, 8, 8, 0, 0, tzinfo=pytz.UTC)
+            }
+        }
+        self.assertEqual(ScopeManager._get_scope_collection_scope('1', 'tests_question'), STALE_SCOPES['tests_question'])
+        mocked_get.assert_called_once_with('/liana/scopes', '1')
+
+        # Notice: beyond the grace period, the scopes are not served anymore
+        ScopeManager.cache['1']['fetched_at'] = datetime(2021, 7, 8, 7, 0, 0, tzinfo=pytz.UTC)
+        self.assertRaises(Exception, ScopeManager._get_scope_collection_scope, '1', 'tests_question')
+
+    @mock.patch('django_forest.utils.scope.ScopeManager._refresh_cache_in_background')
+    @mock.patch('django_forest.utils.scope.ForestApiRequester.get_from_rendering_id', return_value=SCOPES)
+    def test_get_scope_collection_scope_hard_expired_circuit_open(self, mocked_get, mocked_refresh):
+        CircuitBreaker.state = OPEN
+        ScopeManager.cache = {
+            '1': {
+                'scopes': STALE_SCOPES,
+                'fetched_at': datetime(2021, 7, 8, 8, 0, 0, tzinfo=pytz.UTC)
+            }
+        }
+        self.assertEqual(ScopeManager._get_scope_collection_scope('1', 'tests_question'), STALE_SCOPES['tests_question'])
+        mocked_get.assert_not_called()
+        mocked_refresh.assert_called_once_with('1')
+
+    @mock.patch('threading.Thread')
+    def test_refresh_cache_in_background_circuit_open(self, mocked_thread):
+        CircuitBreaker.state = OPEN
+        CircuitBreaker.opened_at = time.monotonic()
+        ScopeManager._refresh_cache_in_background('1')
+        mocked_thread.assert_not_called()
+        self.assertEqual(ScopeManager._refreshing, {})
+
+        # Notice: once the open duration is elapsed, a single refresh probes the Forest API
+        CircuitBreaker.opened_at = time.monotonic() - 60
+        ScopeManager._refresh_cache_in_background('1')
+        ScopeManager._refresh_cache_in_background('1')
+        mocked_thread.return_value.start.assert_called_once_with()
+        self.assertEqual(ScopeManager._refreshing, {'1': mocked_thread.return_value})
@@ -0,0 +1,83 @@
+import copy
+import sys
+
+import pytest
+from django.core.cache import caches
+from django.db.models.signals import post_save
+from django.test import TestCase
+
+from django_forest.tests.fixtures.schema import test_schema
+from django_forest.tests.models import Choice, Question
+from django_forest.utils.collection import Collection
+from django_forest.utils.schema import Schema
+from django_forest.utils.schema.json_api_schema import JsonApiSchema
+from django_forest.utils.smart_field_cache import SmartFieldCache
+
+
+@pytest.fixture()
+def reset_config_dir_import():
+    for key in list(sys.modules.keys()):
+        if key.startswith('django_forest.tests.forest'):
+            del sys.modules[key]
+
+
+@pytest.mark.usefixtures('reset_config_dir_import')
+class UtilsSmartFieldCacheTests(TestCase):
+    fixtures = ['question.json', 'choice.json']
+
+    def setUp(self):
+        Schema.schema = copy.deepcopy(test_schema)
+        Schema.add_smart_features()
+        self.foo_field = Schema.get_collection_metadata('tests_question').smart_fields['foo']
+        self.foo_field['cache'] = {'ttl': 60, 'depends_on': ['tests.Choice']}
+        self.questions = list(Question.objects.order_by('pk'))
+        SmartFieldCache.connect_signals()
+
+    def tearDown(self):
+        SmartFieldCache.disconnect_signals()
+        caches['default'].clear()
+        JsonApiSchema._registry = {}
+        Collection._registry = {}
+
+    def test_get_values(self):
+        self.assertEqual(SmartFieldCache.get_values('tests_question', self.foo_field, self.questions),
+                         [SmartFieldCache.MISSING] * 3)
+        SmartFieldCache.set_values('tests_question', self.foo_field, self.questions[:2], ['foo 1', None])
+        self.assertEqual(SmartFieldCache.get_values('tests_question', self.foo_field, self.questions),
+                         ['foo 1', None, SmartFieldCache.MISSING])
+
+    def test_get_values_version(self):
+        self.foo_field['cache']['version'] = 'question_text'
+        SmartFieldCache.set_values('tests_question', self.foo_field, self.questions, ['foo 1', 'foo 2', 'foo 3'])
+        Question.objects.filter(pk=2).update(question_text='updated without signals')
+        questions = list(Question.objects.order_by('pk'))
+        self.assertEqual(SmartFieldCache.get_values('tests_question', self.foo_field, questions),
+                         ['foo 1', SmartFieldCache.MISSING, 'foo 3'])
+
+    def test_get_values_version_deferred(self):
+        self.foo_field['cache']['version'] = 'question_text'
+        SmartFieldCache.set_values('tests_question', self.foo_field, self.questions, ['foo 1', 'foo 2', 'foo 3'])
+        questions = list(Question.objects.order_by('pk').only('id'))
+        with self.assertNumQueries(1):
+            self.assertEqual(SmartFieldCache.get_values('tests_question', self.foo_field, questions),
+                             ['foo 1', 'foo 2', 'foo 3'])
+
+    def test_connect_signals(self):
+        self.assertEqual(set(SmartFieldCache.dependencies), {Question, Choice})
+        uid = SmartFieldCache.get_dispatch_uid('post_save', Question)
+        self.assertIn(uid, [receiver[0][0] for receiver in post_save.receivers])
+        SmartFieldCache.disconnect_signals()
+        self.assertNotIn(uid, [receiver[0][0] for receiver in post_save.receivers])
+        self.assertEqual(SmartFieldCache.dependencies, {})
+
+    def test_post_save(self):
+        SmartFieldCache.set_values('tests_question', self.foo_field, self.questions, ['foo 1', 'foo 2', 'foo 3'])
+        self.questions[0].save()
+        self.assertEqual(SmartFieldCache.get_values('tests_question', self.foo_field, self.questions),
+                         [SmartFieldCache.MISSING, 'foo 2', 'foo 3'])
+
+    def test_post_delete_dependency(self):
+        SmartFieldCache.set_values('tests_question', self.foo_field, self.questions, ['foo 1', 'foo 2', 'foo 3'])
+        Choice.objects.get(pk=1).delete()
+        self.assertEqual(SmartFieldCache.get_values('tests_question', self.foo_field, self.questions),
+                         [SmartFieldCache.MISSING] * 3)
@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 
 from jose import jwt
 
@@ -29,9 +30,17 @@ def get_token(request):
     return jwt.decode(token, auth_secret, algorithms=['HS256'])
 
 
+@lru_cache(maxsize=None)
+def get_association_fields(Model):
+    association_fields = {}
+    for field in Model._meta.get_fields():
+        if field.is_relation:
+            association_fields.setdefault(get_accessor_name(field), field)
+    return association_fields
+
+
 def get_association_field(Model, association_resource):
-    association_field = next((x for x in Model._meta.get_fields()
-                              if x.is_relation and get_accessor_name(x) == association_resource), None)
+    association_field = get_association_fields(Model).get(association_resource)
     if association_field is None:
         message = f'cannot find association resource {association_resource} for Model {Model._meta.db_table}'
         raise Exception(message)
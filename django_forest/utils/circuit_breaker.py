@@ -0,0 +1,133 @@
+import logging
+import threading
+import time
+from collections import deque
+
+from django_forest.utils.forest_setting import get_forest_setting
+
+CIRCUIT_BREAKER_WINDOW = 60
+CIRCUIT_BREAKER_MIN_CALLS = 10
+CIRCUIT_BREAKER_FAILURE_RATE = 0.5
+# Notice: a call slower than this is counted as a failure, even if it succeeded
+CIRCUIT_BREAKER_SLOW_CALL = 10
+CIRCUIT_BREAKER_OPEN_SECONDS = 30
+# Notice: how long the cached data may still be served once expired, when the Forest API can not be reached
+LAST_KNOWN_GOOD_GRACE_PERIOD = 60 * 60
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# Get an instance of a logger
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreakerOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    state = CLOSED
+    opened_at = None
+    # Notice: (monotonic time, failed) of the calls of the window
+    calls = deque()
+    _probing = False
+    _lock = threading.Lock()
+
+    @staticmethod
+    def get_setting(name, default):
+        return float(get_forest_setting(name, default))
+
+    @staticmethod
+    def get_grace_period():
+        return int(get_forest_setting('FOREST_LAST_KNOWN_GOOD_GRACE_PERIOD', LAST_KNOWN_GOOD_GRACE_PERIOD))
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls.state = CLOSED
+            cls.opened_at = None
+            cls.calls = deque()
+            cls._probing = False
+
+    @classmethod
+    def is_open(cls):
+        return cls.state != CLOSED
+
+    @classmethod
+    def _is_suspended(cls):
+        open_seconds = cls.get_setting('FOREST_CIRCUIT_BREAKER_OPEN_SECONDS', CIRCUIT_BREAKER_OPEN_SECONDS)
+        # Notice: once the open duration is elapsed, a single call at once probes the Forest API
+        return cls._probing or time.monotonic() - cls.opened_at < open_seconds
+
+    @classmethod
+    def is_call_allowed(cls):
+        with cls._lock:
+            return cls.state == CLOSED or not cls._is_suspended()
+
+    @classmethod
+    def _open(cls):
+        if cls.state == CLOSED:
+            logger.warning('Forest API is failing, its calls are suspended')
+        cls.state = OPEN
+        cls.opened_at = time.monotonic()
+        cls.calls = deque()
+
+    @classmethod
+    def _close(cls):
+        logger.info('Forest API is reachable again')
+        cls.state = CLOSED
+        cls.opened_at = None
+
+    @classmethod
+    def before_call(cls):
+        with cls._lock:
+            if cls.state == CLOSED:
+                return
+            if cls._is_suspended():
+                raise CircuitBreakerOpenError('Forest API calls are suspended after too many failures')
+            cls.state = HALF_OPEN
+            cls._probing = True
+
+    @classmethod
+    def _has_too_many_failures(cls):
+        min_calls = cls.get_setting('FOREST_CIRCUIT_BREAKER_MIN_CALLS', CIRCUIT_BREAKER_MIN_CALLS)
+        failure_rate = cls.get_setting('FOREST_CIRCUIT_BREAKER_FAILURE_RATE', CIRCUIT_BREAKER_FAILURE_RATE)
+        failures = sum(1 for _, failed in cls.calls if failed)
+        return len(cls.calls) >= min_calls and failures / len(cls.calls) >= failure_rate
+
+    @classmethod
+    def _record_probe(cls, failed):
+        cls._probing = False
+        if failed:
+            cls._open()
+        else:
+            cls._close()
+
+    @classmethod
+    def record(cls, failed):
+        with cls._lock:
+            if cls.state == HALF_OPEN:
+                return cls._record_probe(failed)
+
+            now = time.monotonic()
+            window = cls.get_setting('FOREST_CIRCUIT_BREAKER_WINDOW', CIRCUIT_BREAKER_WINDOW)
+            cls.calls.append((now, failed))
+            while cls.calls and now - cls.calls[0][0] > window:
+                cls.calls.popleft()
+            if cls.state == CLOSED and cls._has_too_many_failures():
+                cls._open()
+
+    @classmethod
+    def call(cls, method, *args, **kwargs):
+        cls.before_call()
+        start = time.monotonic()
+        failed = True
+        # Notice: the call is recorded whatever it raises, a probe never stays pending
+        try:
+            response = method(*args, **kwargs)
+            slow_call = cls.get_setting('FOREST_CIRCUIT_BREAKER_SLOW_CALL', CIRCUIT_BREAKER_SLOW_CALL)
+            failed = response.status_code >= 500 or time.monotonic() - start > slow_call
+            return response
+        finally:
+            cls.record(failed)
@@ -38,8 +38,10 @@ class Collection:
 
     def add_smart_field(self, collection, field):
         field['is_virtual'] = True
-        field['is_filterable'] = False if 'is_filterable' not in field else field['is_filterable']
-        field['is_sortable'] = False if 'is_sortable' not in field else field['is_sortable']
+        # Notice: expression smart fields are computed by the database, which can filter and sort them
+        is_expression = field.get('expression') is not None
+        field['is_filterable'] = is_expression if 'is_filterable' not in field else field['is_filterable']
+        field['is_sortable'] = is_expression if 'is_sortable' not in field else field['is_sortable']
         collection['fields'].append(Schema.get_default(field, FIELD))
 
     def handle_smart_fields(self, collection):
@@ -113,5 +115,7 @@ class Collection:
             self.handle_smart_fields(collection)
             self.handle_smart_actions(collection)
             self.handle_smart_segments(collection)
+            # Notice: smart fields may have been updated in place
+            Schema.invalidate_collection_metadata(collection['name'])
 
         super().__init__()
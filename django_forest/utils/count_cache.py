@@ -0,0 +1,126 @@
+import hashlib
+
+from django.apps import apps
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from django_forest.utils.forest_setting import get_forest_setting
+from django_forest.utils.models import Models
+
+
+class CountCache:
+    """Cache the counts of the count endpoints, for FOREST_COUNT_CACHE_TTL seconds (0 disables it).
+
+    Each model has a version, bumped when one of its records changes, which expires the cached counts of the
+    queries on its table, joined or in a subquery (filters, scope, segment, parent record).
+    Only the counts on the tables of the collections models are cached, the other ones are not listened.
+    """
+
+    # Notice: the models whose changes are listened, set when the signals are connected
+    listened_models = set()
+
+    @staticmethod
+    def get_ttl():
+        return int(get_forest_setting('FOREST_COUNT_CACHE_TTL', 0))
+
+    @staticmethod
+    def get_cache():
+        return caches[get_forest_setting('FOREST_COUNT_CACHE', 'default')]
+
+    @staticmethod
+    def get_version_key(Model):
+        return f'forest:count:version:{Model._meta.db_table}'
+
+    @staticmethod
+    def get_query_models(queryset, sql):
+        # Notice: table names are always quoted in the SQL built by Django
+        quote_name = connections[queryset.db].ops.quote_name
+        return [
+            Model for Model in apps.get_models(include_auto_created=True)
+            if quote_name(Model._meta.db_table) in sql
+        ]
+
+    @classmethod
+    def get_key(cls, cache, queryset, strategy):
+        """Return the cache key of the count, None when the query is not cacheable."""
+        # Notice: the compiled query already holds the normalized filters, search, segment, scope and parent record
+        try:
+            sql, params = queryset.query.get_compiler(queryset.db).as_sql()
+        except EmptyResultSet:
+            return None
+        models = cls.get_query_models(queryset, sql)
+        if any(Model not in cls.listened_models for Model in models):
+            return None
+
+        version_keys = sorted(cls.get_version_key(Model) for Model in models)
+        versions = cache.get_many(version_keys)
+        versions = ','.join(f'{key}={versions.get(key, 0)}' for key in version_keys)
+        signature = hashlib.sha256(f'{queryset.db}:{strategy}:{sql}:{params}:{versions}'.encode('utf-8')).hexdigest()
+        return f'forest:count:{queryset.model._meta.db_table}:{signature}'
+
+    @classmethod
+    def get_or_count(cls, queryset, strategy, count):
+        ttl = cls.get_ttl()
+        if ttl <= 0:
+            return count(queryset)
+
+        cache = cls.get_cache()
+        key = cls.get_key(cache, queryset, strategy)
+        if key is None:
+            return count(queryset)
+
+        res = cache.get(key)
+        if res is None:
+            res = count(queryset)
+            cache.set(key, res, ttl)
+        return res
+
+    @classmethod
+    def invalidate(cls, Model):
+        if cls.get_ttl() <= 0:
+            return
+
+        cache = cls.get_cache()
+        key = cls.get_version_key(Model)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+    @classmethod
+    def handle_record_changed(cls, sender, **kwargs):
+        cls.invalidate(sender)
+
+    @classmethod
+    def handle_m2m_changed(cls, sender, instance, action, model, **kwargs):
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            cls.invalidate(sender)
+            cls.invalidate(instance.__class__)
+            cls.invalidate(model)
+
+    @staticmethod
+    def get_dispatch_uid(signal_name, Model):
+        return f'forest_count_cache_{signal_name}_{Model._meta.label_lower}'
+
+    @classmethod
+    def disconnect_signals(cls):
+        for Model in cls.listened_models:
+            post_save.disconnect(sender=Model, dispatch_uid=cls.get_dispatch_uid('post_save', Model))
+            post_delete.disconnect(sender=Model, dispatch_uid=cls.get_dispatch_uid('post_delete', Model))
+            m2m_changed.disconnect(sender=Model, dispatch_uid=cls.get_dispatch_uid('m2m_changed', Model))
+        cls.listened_models = set()
+
+    @classmethod
+    def connect_signals(cls):
+        # Notice: only the collections models are listened, m2m_changed is sent by their through models
+        cls.disconnect_signals()
+        cls.listened_models = set(Models.list())
+        for Model in cls.listened_models:
+            post_save.connect(cls.handle_record_changed, sender=Model,
+                              dispatch_uid=cls.get_dispatch_uid('post_save', Model))
+            post_delete.connect(cls.handle_record_changed, sender=Model,
+                                dispatch_uid=cls.get_dispatch_uid('post_delete', Model))
+            m2m_changed.connect(cls.handle_m2m_changed, sender=Model,
+                                dispatch_uid=cls.get_dispatch_uid('m2m_changed', Model))
@@ -1,15 +1,31 @@
 import json
+import os
+import threading
 from urllib.parse import urljoin
 
 import requests
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.validators import URLValidator
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from django_forest.utils.circuit_breaker import CircuitBreaker
 from django_forest.utils.forest_setting import get_forest_setting
 
+FOREST_API_CONNECT_TIMEOUT = 5
+FOREST_API_READ_TIMEOUT = 30
+FOREST_API_RETRIES = 2
+FOREST_API_RETRY_BACKOFF = 0.3
+FOREST_API_RETRY_STATUSES = (502, 503, 504)
+FOREST_API_POOL_SIZE = 10
+
 
 class ForestApiRequester:
+    # Notice: keep-alive connections pooled per process, a forked worker builds its own session
+    _session = None
+    _session_pid = None
+    _session_lock = threading.Lock()
 
     @staticmethod
     def get_headers(headers):
@@ -21,6 +37,39 @@ class ForestApiRequester:
         base_headers.update(headers)
         return base_headers
 
+    @staticmethod
+    def build_session():
+        # Notice: POST requests, not idempotent, are only retried when the connection could not be established
+        retries = Retry(
+            total=int(get_forest_setting('FOREST_API_RETRIES', FOREST_API_RETRIES)),
+            backoff_factor=float(get_forest_setting('FOREST_API_RETRY_BACKOFF', FOREST_API_RETRY_BACKOFF)),
+            status_forcelist=FOREST_API_RETRY_STATUSES,
+            raise_on_status=False,
+        )
+        pool_size = int(get_forest_setting('FOREST_API_POOL_SIZE', FOREST_API_POOL_SIZE))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    @classmethod
+    def get_session(cls):
+        pid = os.getpid()
+        if cls._session is None or cls._session_pid != pid:
+            with cls._session_lock:
+                if cls._session is None or cls._session_pid != pid:
+                    cls._session = cls.build_session()
+                    cls._session_pid = pid
+        return cls._session
+
+    @staticmethod
+    def get_timeout():
+        return (
+            float(get_forest_setting('FOREST_API_CONNECT_TIMEOUT', FOREST_API_CONNECT_TIMEOUT)),
+            float(get_forest_setting('FOREST_API_READ_TIMEOUT', FOREST_API_READ_TIMEOUT)),
+        )
+
     @staticmethod
     def error_msg(url):
         return f'Cannot reach Forest API at {url}, it seems to be down right now.'
@@ -79,12 +128,13 @@ class ForestApiRequester:
     def get(cls, url, query=None, headers=None):
         kwargs = {
             'params': query or {},
-            'headers': cls.get_headers(headers or {})
+            'headers': cls.get_headers(headers or {}),
+            'timeout': cls.get_timeout(),
         }
         if settings.DEBUG:
             kwargs['verify'] = False
 
-        return requests.get(url, **kwargs)
+        return CircuitBreaker.call(cls.get_session().get, url, **kwargs)
 
     @classmethod
     def post(cls, url, body=None, query=None, headers=None):
@@ -93,8 +143,9 @@ class ForestApiRequester:
         kwargs = {
             'data': json.dumps(body),
             'params': query,
-            'headers': cls.get_headers(headers)
+            'headers': cls.get_headers(headers),
+            'timeout': cls.get_timeout(),
         }
         if settings.DEBUG:
             kwargs['verify'] = False
-        return requests.post(url, **kwargs)
+        return CircuitBreaker.call(cls.get_session().post, url, **kwargs)
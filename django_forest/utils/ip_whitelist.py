@@ -1,15 +1,88 @@
 import ipaddress
+from bisect import bisect_right
 
 import requests
 
+from django_forest.utils.circuit_breaker import CircuitBreaker
+from django_forest.utils.date import get_utc_now
 from django_forest.utils.forest_api_requester import ForestApiRequester
 
 
+def get_ip_interval(rule):
+    ip = ipaddress.ip_address(rule['ip'])
+    return ip.version, (int(ip), int(ip))
+
+
+def get_range_interval(rule):
+    ip_minimum = ipaddress.ip_address(rule['ipMinimum'])
+    ip_maximum = ipaddress.ip_address(rule['ipMaximum'])
+    return ip_minimum.version, (int(ip_minimum), int(ip_maximum))
+
+
+def get_subnet_interval(rule):
+    network = ipaddress.ip_network(rule['range'])
+    # Notice: same bounds as network.hosts(), without listing them
+    if network.num_addresses <= 2:
+        hosts = list(network.hosts())
+        return network.version, (int(hosts[0]), int(hosts[-1])) if hosts else None
+    last = network.broadcast_address - 1 if network.version == 4 else network.broadcast_address
+    return network.version, (int(network.network_address) + 1, int(last))
+
+
+# Notice: rule type -> (ip version, (first address, last address)) of the rule
+RULE_INTERVALS = {
+    0: get_ip_interval,
+    1: get_range_interval,
+    2: get_subnet_interval,
+}
+
+
+def merge_intervals(intervals):
+    merged = []
+    for start, end in sorted(x for x in intervals if x is not None and x[0] <= x[1]):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [x[0] for x in merged], [x[1] for x in merged]
+
+
+def is_loopback_rule(rule):
+    return rule['type'] == 0 and ipaddress.ip_address(rule['ip']).is_loopback
+
+
+class CompiledIpWhitelistRules:
+    """Rules compiled in sorted and merged intervals of addresses per IP version, checked with a bisect."""
+
+    def __init__(self, rules):
+        self.rules = rules
+        # Notice: a loopback ip rule allows any loopback address, of any version
+        self.allows_loopback = any(is_loopback_rule(rule) for rule in rules)
+        intervals = {4: [], 6: []}
+        for rule in rules:
+            if rule['type'] in RULE_INTERVALS:
+                version, interval = RULE_INTERVALS[rule['type']](rule)
+                intervals[version].append(interval)
+        self.intervals = {version: merge_intervals(x) for version, x in intervals.items()}
+
+    def is_built_from(self, rules):
+        return self.rules is rules
+
+    def is_ip_allowed(self, ip):
+        if ip.is_loopback and self.allows_loopback:
+            return True
+        starts, ends = self.intervals[ip.version]
+        index = bisect_right(starts, int(ip)) - 1
+        return index >= 0 and int(ip) <= ends[index]
+
+
 class IpWhitelist:
 
     fetched = False
+    fetched_at = None
     use_ip_whitelist = False
     rules = []
+    compiled_rules = None
 
     @classmethod
     def get_rules(cls):
@@ -19,54 +92,26 @@ class IpWhitelist:
             raise Exception('Unable to retrieve ip whitelist rules')
 
         data = response.json()
+        rules = data['data']['attributes']['rules']
+        compiled_rules = CompiledIpWhitelistRules(rules)
         cls.fetched = True
+        cls.fetched_at = get_utc_now()
         cls.use_ip_whitelist = data['data']['attributes']['use_ip_whitelist']
-        cls.rules = data['data']['attributes']['rules']
-
-    @staticmethod
-    def same_version(ip1, ip2):
-        return isinstance(ip1, type(ip2))
-
-    @staticmethod
-    def is_both_loopback(ip1, ip2):
-        return ip1.is_loopback and ip2.is_loopback
+        cls.rules = rules
+        cls.compiled_rules = compiled_rules
 
     @classmethod
-    def is_ip_match_ip(cls, ip1, ip2):
-        if not cls.same_version(ip1, ip2):
-            return cls.is_both_loopback(ip1, ip2)
-
-        if ip1 == ip2:
-            return True
-        else:
-            return cls.is_both_loopback(ip1, ip2)
-
-    @classmethod
-    def is_ip_match_range(cls, ip, rule):
-        ip_minimum = ipaddress.ip_address(rule['ipMinimum'])
-        ip_maximum = ipaddress.ip_address(rule['ipMaximum'])
-        if not cls.same_version(ip, ip_minimum):
+    def is_last_known_good_usable(cls):
+        if not cls.fetched or cls.fetched_at is None:
             return False
-
-        return int(ip_minimum) <= int(ip) <= int(ip_maximum)
+        return (get_utc_now() - cls.fetched_at).total_seconds() <= CircuitBreaker.get_grace_period()
 
     @classmethod
-    def is_ip_match_subnet(cls, ip, subnet):
-        return ip in list(ipaddress.ip_network(subnet).hosts())
-
-    @classmethod
-    def is_ip_matches_rule(cls, ip, rule):
-        if rule['type'] == 0:
-            return cls.is_ip_match_ip(ipaddress.ip_address(ip), ipaddress.ip_address(rule['ip']))
-        elif rule['type'] == 1:
-            return cls.is_ip_match_range(ipaddress.ip_address(ip), rule)
-        elif rule['type'] == 2:
-            return cls.is_ip_match_subnet(ipaddress.ip_address(ip), rule['range'])
+    def get_compiled_rules(cls):
+        if cls.compiled_rules is None or not cls.compiled_rules.is_built_from(cls.rules):
+            cls.compiled_rules = CompiledIpWhitelistRules(cls.rules)
+        return cls.compiled_rules
 
     @classmethod
     def is_ip_matches_any_rule(cls, ip):
-        for rule in cls.rules:
-            if cls.is_ip_matches_rule(ip, rule):
-                return True
-        else:
-            return False
+        return cls.get_compiled_rules().is_ip_allowed(ipaddress.ip_address(ip))
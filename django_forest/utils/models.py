@@ -1,11 +1,16 @@
 from django.apps import apps
 
+from django_forest.utils import get_association_fields
 from django_forest.utils.forest_setting import get_forest_setting
 
 
 class Models:
     models = None
 
+    # Notice: resource name -> model, rebuilt when models changes
+    _indexed_models = None
+    _index = {}
+
     @classmethod
     def list(cls, force=False):
         if cls.models is None or force:
@@ -16,12 +21,21 @@ class Models:
                 cls.models = [m for m in cls.models if m._meta.db_table in included_models]
             elif excluded_models is not None:
                 cls.models = [m for m in cls.models if m._meta.db_table not in excluded_models]
+            get_association_fields.cache_clear()
         return cls.models
 
     @classmethod
-    def get(cls, resource):
-        for model in cls.list():
-            if resource.lower() in (model._meta.db_table.lower(), f'{model._meta.db_table.lower()}s'):
-                return model
+    def get_index(cls):
+        models = cls.list()
+        if models is not cls._indexed_models:
+            index = {}
+            for model in models:
+                index.setdefault(model._meta.db_table.lower(), model)
+                index.setdefault(f'{model._meta.db_table.lower()}s', model)
+            cls._index = index
+            cls._indexed_models = models
+        return cls._index
 
-        return None
+    @classmethod
+    def get(cls, resource):
+        return cls.get_index().get(resource.lower())
@@ -1,22 +1,42 @@
+import logging
+import threading
 from datetime import datetime
 
 import pytz
 
+from django_forest.utils.circuit_breaker import CircuitBreaker
 from django_forest.utils.forest_api_requester import ForestApiRequester
 from django_forest.utils.forest_setting import get_forest_setting
+from django_forest.utils.permissions.compiled import CompiledPermissions
 from django_forest.utils.permissions.utils import (
     date_difference_in_seconds,
-    is_stat_allowed,
+    find_action_name_from_endpoint,
     is_user_allowed,
-    is_smart_action_allowed,
 )
 
+# Notice: permissions are refreshed in background once this ratio of their expiration is elapsed
+PERMISSIONS_REFRESH_RATIO = 0.8
+PERMISSIONS_DENIED_REFETCH_INTERVAL = 10
+PERMISSIONS_FETCH_WAIT_IN_SECONDS = 30
+
+# Get an instance of a logger
+logger = logging.getLogger(__name__)
+
 
 class Permission:
     renderings_cached = {}
+    # Notice: rendering id -> permissions of the rendering, with their last_fetch
     permissions_cached = {}
+    # Notice: rendering id -> hashed lookups on its permissions, compiled after each fetch
+    compiled_permissions_cached = {}
     expiration_in_seconds = get_forest_setting('FOREST_PERMISSIONS_EXPIRATION_IN_SECONDS', 3600)
 
+    # Notice: rendering id -> event set when its in-flight fetch is done
+    _fetching = {}
+    _fetching_lock = threading.Lock()
+    # Notice: rendering ids being refreshed in background
+    _refreshing = set()
+
     def __init__(self, *args, **kwargs):
         self.collection_name = args[0]
         self.permission_name = args[1]
@@ -28,27 +48,131 @@ class Permission:
 
     @classmethod
     def is_authorized(cls, obj):
-        if not cls.have_permissions_expired() and cls.is_allowed(obj):
+        if cls.have_permissions_expired(obj.rendering_id):
+            cls.handle_expired_permissions(obj.rendering_id)
+        elif cls.should_refresh_permissions(obj.rendering_id):
+            cls.refresh_permissions_in_background(obj.rendering_id)
+
+        if cls.is_allowed(obj):
             return True
 
-        # Notice fetch if permissions have expired or not allowed, to get last update
-        cls.fetch_permissions(obj.rendering_id)
+        # Notice: fetch if not allowed, to get last update, at most once per interval
+        if cls.can_refetch_denied(obj.rendering_id) and not CircuitBreaker.is_open():
+            cls.fetch_permissions(obj.rendering_id)
+            return cls.is_allowed(obj)
+        return False
+
+    @classmethod
+    def get_permissions(cls, rendering_id):
+        return cls.permissions_cached.get(rendering_id, {})
+
+    @classmethod
+    def get_compiled_permissions(cls, rendering_id):
+        permissions = cls.get_permissions(rendering_id)
+        compiled = cls.compiled_permissions_cached.get(rendering_id)
+        if compiled is None or not compiled.is_built_from(permissions):
+            compiled = CompiledPermissions(permissions)
+            cls.compiled_permissions_cached[rendering_id] = compiled
+        return compiled
+
+    @classmethod
+    def get_elapsed_seconds(cls, rendering_id):
+        permissions = cls.get_permissions(rendering_id)
+        if 'last_fetch' not in permissions:
+            return None
+        return date_difference_in_seconds(datetime.now(pytz.UTC), permissions['last_fetch'])
+
+    @classmethod
+    def have_permissions_expired(cls, rendering_id):
+        elapsed_seconds = cls.get_elapsed_seconds(rendering_id)
+        return elapsed_seconds is None or elapsed_seconds >= cls.expiration_in_seconds
+
+    @classmethod
+    def is_last_known_good_usable(cls, rendering_id):
+        elapsed_seconds = cls.get_elapsed_seconds(rendering_id)
+        return elapsed_seconds is not None \
+            and elapsed_seconds < cls.expiration_in_seconds + CircuitBreaker.get_grace_period()
+
+    @classmethod
+    def handle_expired_permissions(cls, rendering_id):
+        # Notice: while the Forest API is failing, the expired permissions are served during a grace period
+        if CircuitBreaker.is_open() and cls.is_last_known_good_usable(rendering_id):
+            cls.refresh_permissions_in_background(rendering_id)
+            return
 
-        return cls.is_allowed(obj)
+        try:
+            cls.fetch_permissions(rendering_id)
+        except Exception as e:
+            if not cls.is_last_known_good_usable(rendering_id):
+                raise
+            logger.warning(f'Unable to fetch the permissions of the rendering {rendering_id}, served expired: {e}')
 
     @classmethod
-    def have_permissions_expired(cls):
-        if 'last_fetch' in cls.permissions_cached:
-            elapsed_seconds = date_difference_in_seconds(datetime.now(pytz.UTC), cls.permissions_cached['last_fetch'])
-            return elapsed_seconds >= cls.expiration_in_seconds
+    def should_refresh_permissions(cls, rendering_id):
+        refresh_in_seconds = get_forest_setting(
+            'FOREST_PERMISSIONS_REFRESH_IN_SECONDS', cls.expiration_in_seconds * PERMISSIONS_REFRESH_RATIO
+        )
+        elapsed_seconds = cls.get_elapsed_seconds(rendering_id)
+        return elapsed_seconds is None or elapsed_seconds >= int(refresh_in_seconds)
 
-        return True
+    @classmethod
+    def can_refetch_denied(cls, rendering_id):
+        interval = get_forest_setting('FOREST_PERMISSIONS_DENIED_REFETCH_INTERVAL', PERMISSIONS_DENIED_REFETCH_INTERVAL)
+        elapsed_seconds = cls.get_elapsed_seconds(rendering_id)
+        return elapsed_seconds is None or elapsed_seconds >= int(interval)
 
     @classmethod
     def fetch_permissions(cls, rendering_id):
+        with cls._fetching_lock:
+            event = cls._fetching.get(rendering_id)
+            is_fetching = event is not None
+            if not is_fetching:
+                event = cls._fetching[rendering_id] = threading.Event()
+
+        # Notice: a single fetch at once per rendering, the concurrent requests wait for its result
+        if is_fetching:
+            event.wait(PERMISSIONS_FETCH_WAIT_IN_SECONDS)
+            # Notice: the fetch failed or is too long, with nothing cached the request fetches by itself
+            if cls.get_elapsed_seconds(rendering_id) is None:
+                cls.request_permissions(rendering_id)
+            return
+
+        try:
+            cls.request_permissions(rendering_id)
+        finally:
+            with cls._fetching_lock:
+                cls._fetching.pop(rendering_id, None)
+            event.set()
+
+    @classmethod
+    def request_permissions(cls, rendering_id):
         permissions = ForestApiRequester.get_from_rendering_id('/liana/v3/permissions', rendering_id)
         permissions['last_fetch'] = datetime.now(pytz.UTC)
-        cls.permissions_cached = permissions
+        cls.permissions_cached[rendering_id] = permissions
+        cls.compiled_permissions_cached[rendering_id] = CompiledPermissions(permissions)
+
+    @classmethod
+    def refresh_permissions_in_background(cls, rendering_id):
+        # Notice: no refresh while the Forest API calls are suspended, the cached permissions are served
+        if not CircuitBreaker.is_call_allowed():
+            return
+        with cls._fetching_lock:
+            # Notice: a single refresh at once per rendering
+            if rendering_id in cls._fetching or rendering_id in cls._refreshing:
+                return
+            cls._refreshing.add(rendering_id)
+        threading.Thread(target=cls.background_fetch_permissions, args=(rendering_id,), daemon=True).start()
+
+    @classmethod
+    def background_fetch_permissions(cls, rendering_id):
+        try:
+            cls.fetch_permissions(rendering_id)
+        except Exception as e:
+            # Notice: keep the cached permissions, they are fetched again once expired
+            logger.warning(f'Unable to refresh the permissions of the rendering {rendering_id}: {e}')
+        finally:
+            with cls._fetching_lock:
+                cls._refreshing.discard(rendering_id)
 
     @classmethod
     def is_allowed(cls, obj):
@@ -62,36 +186,25 @@ class Permission:
 
     @classmethod
     def permission_allowed(cls, obj):
+        compiled = cls.get_compiled_permissions(obj.rendering_id)
         try:
-            permissions = cls.permissions_cached['data']['collections'][obj.collection_name]
+            if obj.permission_name == 'actions':
+                action_name = find_action_name_from_endpoint(obj)
+                permission_value = compiled.get_action_value(obj.collection_name, action_name)
+            else:
+                permission_value = compiled.get_collection_value(obj.collection_name, obj.permission_name)
         except Exception:
             return False
         else:
-            if obj.permission_name == 'actions':
-                return is_smart_action_allowed(obj, permissions['actions'])
-            else:
-                return is_user_allowed(obj.user_id, permissions['collection'][obj.permission_name])
+            return is_user_allowed(obj.user_id, permission_value)
 
     @classmethod
     def live_query_allowed(cls, obj):
-        permissions = cls.permissions_cached
-        try:
-            live_queries_permissions = permissions['stats']['queries']
-        except Exception:
-            return False
-        else:
-            # NOTICE: query_request_info matching an existing live query
-            return obj.query_request_info in live_queries_permissions
+        # NOTICE: query_request_info matching an existing live query
+        return cls.get_compiled_permissions(obj.rendering_id).is_query_allowed(obj.query_request_info)
 
     @classmethod
     def stat_with_parameters_allowed(cls, obj):
         permission_type = f"{obj.query_request_info['type'].lower()}s"
-        permissions = cls.permissions_cached
-
-        try:
-            pool_permissions = permissions['stats'][permission_type]
-        except Exception:
-            return False
-        else:
-            array_permission_infos = [x for x in obj.query_request_info.values() if x is not None]
-            return is_stat_allowed(pool_permissions, array_permission_infos)
+        compiled = cls.get_compiled_permissions(obj.rendering_id)
+        return compiled.is_stat_allowed(permission_type, obj.query_request_info.values())
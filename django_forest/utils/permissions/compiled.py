@@ -0,0 +1,97 @@
+import json
+
+
+def get_hashable(value):
+    # Notice: filters and other nested values are compared by their JSON representation,
+    # tagged so that it never equals a string value
+    if isinstance(value, (dict, list)):
+        return ('json', json.dumps(value, sort_keys=True))
+    return value
+
+
+def get_stat_key(values):
+    return frozenset(get_hashable(x) for x in values if x is not None)
+
+
+def compile_user_value(value):
+    if value is None or value in (True, False):
+        return value
+    try:
+        return frozenset(value)
+    except TypeError:
+        return value
+
+
+def compile_collection(permissions):
+    compiled = {
+        'collection': {},
+        'actions': {},
+    }
+    if not isinstance(permissions, dict):
+        return compiled
+
+    for name, value in (permissions.get('collection') or {}).items():
+        compiled['collection'][name] = compile_user_value(value)
+    for name, action in (permissions.get('actions') or {}).items():
+        if isinstance(action, dict) and 'triggerEnabled' in action:
+            compiled['actions'][name] = compile_user_value(action['triggerEnabled'])
+    return compiled
+
+
+def compile_stats(pool_permissions):
+    if not isinstance(pool_permissions, list):
+        return None
+    return [get_stat_key(pool_permission.values()) for pool_permission in pool_permissions]
+
+
+class CompiledPermissions:
+    """Hashed lookups on the permissions of a rendering, computed once per fetch instead of on every request."""
+
+    def __init__(self, permissions):
+        self.permissions = permissions
+        data = permissions.get('data') or {}
+        stats = permissions.get('stats')
+        if not isinstance(stats, dict):
+            stats = {}
+
+        # Notice: collection -> {'collection': permission -> value, 'actions': action -> value}
+        # values are kept when boolean or None, user ids lists become sets
+        self.collections = {
+            name: compile_collection(collection_permissions)
+            for name, collection_permissions in (data.get('collections') or {}).items()
+        }
+        queries = stats.get('queries')
+        self.queries = frozenset(get_hashable(x) for x in queries) if isinstance(queries, list) else None
+        # Notice: chart type -> values of each saved chart, and the set of them for exact matches
+        self.stats = {}
+        for name, pool_permissions in stats.items():
+            pool = compile_stats(pool_permissions) if name != 'queries' else None
+            if pool is not None:
+                self.stats[name] = pool
+        self.exact_stats = {name: frozenset(pool) for name, pool in self.stats.items()}
+
+    def is_built_from(self, permissions):
+        return self.permissions is permissions
+
+    def get_collection_value(self, collection_name, permission_name):
+        return self.collections[collection_name]['collection'][permission_name]
+
+    def get_action_value(self, collection_name, action_name):
+        return self.collections[collection_name]['actions'][action_name]
+
+    def is_query_allowed(self, query):
+        if self.queries is None:
+            return False
+        try:
+            return get_hashable(query) in self.queries
+        except TypeError:
+            return False
+
+    def is_stat_allowed(self, permission_type, values):
+        if permission_type not in self.stats:
+            return False
+        key = get_stat_key(values)
+        if key in self.exact_stats[permission_type]:
+            return True
+        # Notice: a request may only send a part of a saved chart values
+        return any(key <= pool_permission for pool_permission in self.stats[permission_type])
@@ -12,6 +12,8 @@ from django_forest.utils.schema.apimap_errors import APIMAP_ERRORS
 from django_forest.utils.models import Models
 from django_forest.utils.type_mapping import get_type
 from django_forest.utils.schema.json_api_schema import create_json_api_schema
+from django_forest.utils.schema.json_api_plan import JsonApiPlan
+from django_forest.utils.schema.metadata import CollectionMetadata
 from django_forest.utils.forest_api_requester import ForestApiRequester
 from .definitions import COLLECTION, FIELD
 from .validations import handle_validations
@@ -43,13 +45,44 @@ class Schema:
     # schema to send to Forest Admin Server
     schema_data = None
 
+    # Notice: collections by name and their metadata, rebuilt when schema['collections'] changes
+    _indexed_collections = None
+    _indexed_collections_count = 0
+    _collections_index = {}
+    _metadata = {}
+
+    @classmethod
+    def get_collections_index(cls):
+        collections = cls.schema['collections']
+        if collections is not cls._indexed_collections or len(collections) != cls._indexed_collections_count:
+            index = {}
+            for collection in collections:
+                index.setdefault(collection['name'], collection)
+            cls._collections_index = index
+            cls._indexed_collections = collections
+            cls._indexed_collections_count = len(collections)
+            cls._metadata = {}
+        return cls._collections_index
+
     @classmethod
     def get_collection(cls, resource):
-        collections = [collection for collection in cls.schema['collections'] if collection['name'] == resource]
-        if len(collections):
-            return collections[0]
+        return cls.get_collections_index().get(resource)
 
-        return None
+    @classmethod
+    def get_collection_metadata(cls, resource):
+        collection = cls.get_collection(resource)
+        if collection is None:
+            return None
+
+        metadata = cls._metadata.get(resource)
+        if metadata is None or not metadata.is_built_from(collection):
+            metadata = CollectionMetadata(collection)
+            cls._metadata[resource] = metadata
+        return metadata
+
+    @classmethod
+    def invalidate_collection_metadata(cls, resource):
+        cls._metadata.pop(resource, None)
 
     @staticmethod
     def get_default(obj, definition):
@@ -130,7 +163,9 @@ class Schema:
     def handle_json_api_schema(cls):
         for collection in cls.schema['collections']:
             # Notice: create marshmallow-jsonapi resource for json api serializer
-            create_json_api_schema(collection)
+            JsonSchema = create_json_api_schema(collection)
+            # Notice: compile a plain python serializer from it, used on list endpoints
+            JsonApiPlan.register(collection, JsonSchema)
 
     @classmethod
     def handle_schema_file_production(cls, file_path):
@@ -0,0 +1,208 @@
+from django.core.exceptions import FieldDoesNotExist
+from marshmallow import missing
+from marshmallow_jsonapi import fields
+
+from django_forest.utils.models import Models
+
+
+class JsonApiPlanUnavailable(Exception):
+    pass
+
+
+def cast_string(value):
+    if value is None:
+        return None
+    if isinstance(value, bytes):
+        value = value.decode('utf-8')
+    return str(value)
+
+
+def get_number_caster(num_type):
+    def cast_number(value):
+        if value is None:
+            return None
+        return num_type(value)
+    return cast_number
+
+
+def cast_raw(value):
+    return value
+
+
+# Notice: plain python casters for the most common marshmallow fields, others keep their own formatting
+CASTERS = {
+    fields.Str: cast_string,
+    fields.Integer: get_number_caster(int),
+    fields.Float: get_number_caster(float),
+    fields.Number: get_number_caster(float),
+    fields.Raw: cast_raw,
+}
+
+
+class Relationship:
+    def __init__(self, field, reference):
+        self.type_ = field.type_
+        self.many = field.many
+        self.related_name = reference.split('.')[0]
+
+
+class JsonApiPlan:
+    """Plain python serializer compiled from a collection marshmallow-jsonapi schema.
+
+    It produces the same documents as the marshmallow schema, without its per attribute machinery.
+    """
+    _registry = {}
+
+    def __init__(self, collection, JsonSchema, Model):
+        self.name = collection['name']
+        self.type_ = JsonSchema.opts.type_
+        self.pk_prep = Model._meta.pk.get_prep_value
+        references = {field['field']: field['reference'] for field in collection['fields']}
+        self.plan = [
+            self.compile_field(name, field, Model, references.get(name))
+            for name, field in JsonSchema._declared_fields.items()
+        ]
+        self.plan_by_name = {entry[0]: entry for entry in self.plan}
+
+    @classmethod
+    def register(cls, collection, JsonSchema):
+        Model = Models.get(collection['name'])
+        # Notice: smart collections are only serialized by marshmallow
+        if Model is None:
+            cls._registry.pop(collection['name'], None)
+        else:
+            cls._registry[collection['name']] = cls(collection, JsonSchema, Model)
+
+    @classmethod
+    def get(cls, name):
+        if name not in cls._registry:
+            raise JsonApiPlanUnavailable(f'No compiled serializer for {name}')
+        return cls._registry[name]
+
+    @staticmethod
+    def get_field_caster(field):
+        if field.__class__ in CASTERS:
+            return CASTERS[field.__class__]
+
+        def cast_field(value):
+            return field._serialize(value, None, None)
+        return cast_field
+
+    @classmethod
+    def get_caster(cls, field, model_field):
+        cast = cls.get_field_caster(field)
+        if model_field is None or model_field.is_relation:
+            return cast
+
+        # Notice: same as DjangoSchema.cast_value
+        prep = model_field.get_prep_value
+
+        def cast_model_field(value):
+            return cast(prep(value))
+        return cast_model_field
+
+    @classmethod
+    def compile_field(cls, name, field, Model, reference):
+        if isinstance(field, fields.Relationship):
+            return name, None, Relationship(field, reference)
+
+        try:
+            model_field = Model._meta.get_field(name)
+        except FieldDoesNotExist:
+            model_field = None
+        return name, cls.get_caster(field, model_field), None
+
+    def get_nested_only(self, only):
+        names = []
+        nested_only = {}
+        for name in only:
+            parent, _, nested = name.partition('.')
+            if parent not in self.plan_by_name:
+                raise JsonApiPlanUnavailable(f'Unknown field {parent}')
+            if parent not in names:
+                names.append(parent)
+            if nested:
+                nested_only.setdefault(parent, []).append(nested)
+        return names, nested_only
+
+    def get_included_plan(self, relationship, nested_only):
+        if relationship.many:
+            raise JsonApiPlanUnavailable('Cannot include HasMany relationships')
+        plan = JsonApiPlan.get(relationship.related_name)
+        return plan, plan.select(nested_only)
+
+    def select(self, only=None, include_data=()):
+        """Return the (attribute, caster, relationship, included plan) tuples for the requested fields."""
+        names, nested_only = list(self.plan_by_name.keys()), {}
+        if only is not None:
+            names, nested_only = self.get_nested_only(only)
+
+        selected = []
+        for name in names:
+            _, caster, relationship = self.plan_by_name[name]
+            included = None
+            if name in include_data:
+                if relationship is None:
+                    raise JsonApiPlanUnavailable(f'Can only include relationships, {name} is not')
+                included = self.get_included_plan(relationship, nested_only.get(name))
+            selected.append((name, caster, relationship, included))
+        return selected
+
+    def get_related_links(self, obj, name):
+        if obj.pk is None:
+            return {}
+        return {'links': {'related': f'/forest/{self.name}/{obj.pk}/relationships/{name}'}}
+
+    def format_relationship(self, obj, name, relationship, included_plan, included):
+        if included_plan is None:
+            return self.get_related_links(obj, name)
+
+        value = getattr(obj, name, missing)
+        if value is missing:
+            return missing
+
+        ret = self.get_related_links(obj, name)
+        ret['data'] = None
+        if value is not None:
+            pk = getattr(value, 'pk', value)
+            ret['data'] = {'type': relationship.type_, 'id': None if pk is None else str(pk)}
+            item = self.format_included(value, included_plan, included)
+            included[(item['type'], item['id'])] = item
+        return ret
+
+    @staticmethod
+    def format_included(value, included_plan, included):
+        plan, selected = included_plan
+        return plan.format_item(value, selected, included)
+
+    def format_attribute(self, res, name, caster, value):
+        if name == 'id':
+            # Notice: the id is replaced by the primary key below, keep its position
+            res['id'] = None
+        else:
+            res.setdefault('attributes', {})[name] = caster(value)
+
+    def format_item(self, obj, selected, included):
+        res = {'type': self.type_}
+        for name, caster, relationship, included_plan in selected:
+            if relationship is None:
+                value = getattr(obj, name, missing)
+                if value is not missing:
+                    self.format_attribute(res, name, caster, value)
+                continue
+
+            value = self.format_relationship(obj, name, relationship, included_plan, included)
+            if value:
+                res.setdefault('relationships', {})[name] = value
+
+        res['links'] = {'self': f'/forest/{self.name}/{self.pk_prep(obj.pk)}'}
+        res['id'] = obj.pk
+        return res
+
+    def dump(self, queryset, only=None, include_data=()):
+        selected = self.select(only, include_data)
+        included = {}
+        data = {'data': [self.format_item(obj, selected, included) for obj in queryset]}
+        if included:
+            data['included'] = list(included.values())
+        return data
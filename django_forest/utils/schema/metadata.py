@@ -0,0 +1,48 @@
+from django_forest.resources.utils.in_search_fields import in_search_fields
+
+
+def is_searchable(field, search_fields):
+    return field['type'] in ('String', 'Number', 'Enum') \
+        and not field['reference'] \
+        and in_search_fields(field['field'], search_fields)
+
+
+class CollectionMetadata:
+    """Lookups on a schema collection fields, computed once instead of on every request."""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.collection_fields = collection['fields']
+        self.fields_count = len(collection['fields'])
+        self.search_fields_setting = collection['search_fields']
+        self.collection_actions = collection['actions']
+        self.actions_count = len(collection['actions'])
+
+        self.fields = {}
+        for field in collection['fields']:
+            self.fields.setdefault(field['field'], field)
+        self.smart_fields = {name: field for name, field in self.fields.items() if field['is_virtual']}
+        self.single_relationships = [
+            field for field in collection['fields']
+            if field['relationship'] in ('BelongsTo', 'HasOne')
+        ]
+        # Notice: the search decorator also highlights smart fields, the search itself does not use them
+        self.decorator_search_fields = [
+            field for field in collection['fields']
+            if is_searchable(field, collection['search_fields'])
+        ]
+        self.search_fields = [field for field in self.decorator_search_fields if not field['is_virtual']]
+        # Notice: (endpoint, http_method) -> action name, used by the smart actions permissions
+        self.actions_by_endpoint = {}
+        for action in collection['actions']:
+            self.actions_by_endpoint.setdefault((action['endpoint'], action['http_method']), action['name'])
+        # Notice: filled on demand by the filters, 'field' or 'relationship:field' -> model field type
+        self.field_types = {}
+
+    def is_built_from(self, collection):
+        return self.collection is collection \
+            and self.collection_fields is collection['fields'] \
+            and self.fields_count == len(collection['fields']) \
+            and self.search_fields_setting == collection['search_fields'] \
+            and self.collection_actions is collection['actions'] \
+            and self.actions_count == len(collection['actions'])
@@ -1,12 +1,17 @@
 import logging
+import threading
 
 # 5 minutes expiration cache
 from django_forest.utils.date import get_utc_now
 
+from django_forest.utils.circuit_breaker import CircuitBreaker
 from django_forest.utils.forest_api_requester import ForestApiRequester
+from django_forest.utils.forest_setting import get_forest_setting
 from django_forest.utils.permissions import date_difference_in_seconds
 
 SCOPE_CACHE_EXPIRATION_DELTA = 60 * 5
+# Notice: expired scopes are still served, while refreshed in background, until this hard expiration
+SCOPE_CACHE_MAX_AGE = 60 * 60
 
 # Get an instance of a logger
 logger = logging.getLogger(__name__)
@@ -15,13 +20,34 @@ logger = logging.getLogger(__name__)
 class ScopeManager:
     cache = {}
 
+    # Notice: rendering ids being refreshed in background -> refresh thread
+    _refreshing = {}
+    _refreshing_lock = threading.Lock()
+
+    @classmethod
+    def _get_cache_age(cls, rendering_id):
+        return date_difference_in_seconds(get_utc_now(), cls.cache[rendering_id]['fetched_at'])
+
     @classmethod
     def _has_cache_expired(cls, rendering_id):
         if rendering_id not in cls.cache:
             return True
-        rendering_scopes = cls.cache[rendering_id]
-        seconds_since_last_fetch = date_difference_in_seconds(get_utc_now(), rendering_scopes['fetched_at'])
-        return seconds_since_last_fetch > SCOPE_CACHE_EXPIRATION_DELTA
+        expiration = int(get_forest_setting('FOREST_SCOPE_CACHE_EXPIRATION', SCOPE_CACHE_EXPIRATION_DELTA))
+        return cls._get_cache_age(rendering_id) > expiration
+
+    @classmethod
+    def _is_cache_usable(cls, rendering_id):
+        if rendering_id not in cls.cache:
+            return False
+        max_age = int(get_forest_setting('FOREST_SCOPE_CACHE_MAX_AGE', SCOPE_CACHE_MAX_AGE))
+        return cls._get_cache_age(rendering_id) <= max_age
+
+    @classmethod
+    def _is_last_known_good_usable(cls, rendering_id):
+        if rendering_id not in cls.cache:
+            return False
+        max_age = int(get_forest_setting('FOREST_SCOPE_CACHE_MAX_AGE', SCOPE_CACHE_MAX_AGE))
+        return cls._get_cache_age(rendering_id) <= max_age + CircuitBreaker.get_grace_period()
 
     @classmethod
     def _refresh_cache(cls, rendering_id):
@@ -35,6 +61,46 @@ class ScopeManager:
                 'fetched_at': get_utc_now()
             }
 
+    @classmethod
+    def _refresh_cache_in_background(cls, rendering_id):
+        # Notice: no refresh while the Forest API calls are suspended, the cached scopes are served
+        if not CircuitBreaker.is_call_allowed():
+            return
+        thread = threading.Thread(target=cls._background_refresh_cache, args=(rendering_id,), daemon=True)
+        with cls._refreshing_lock:
+            # Notice: a single refresh at once per rendering
+            if rendering_id in cls._refreshing:
+                return
+            cls._refreshing[rendering_id] = thread
+        thread.start()
+
+    @classmethod
+    def _background_refresh_cache(cls, rendering_id):
+        try:
+            cls._refresh_cache(rendering_id)
+        except Exception as e:
+            # Notice: keep serving the stale scopes, the next request will retry
+            logger.warning(f'Unable to refresh the scopes of the rendering {rendering_id}: {e}')
+        finally:
+            with cls._refreshing_lock:
+                cls._refreshing.pop(rendering_id, None)
+
+    @classmethod
+    def _handle_expired_cache(cls, rendering_id):
+        # Notice: only a cold (or hard expired) cache blocks the request, stale scopes are refreshed in background
+        # while the Forest API is failing, hard expired scopes are still served during a grace period
+        if cls._is_cache_usable(rendering_id) \
+                or (CircuitBreaker.is_open() and cls._is_last_known_good_usable(rendering_id)):
+            cls._refresh_cache_in_background(rendering_id)
+            return
+
+        try:
+            cls._refresh_cache(rendering_id)
+        except Exception as e:
+            if not cls._is_last_known_good_usable(rendering_id):
+                raise
+            logger.warning(f'Unable to fetch the scopes of the rendering {rendering_id}, served expired: {e}')
+
     @staticmethod
     def _format_dynamic_values(user_id, collection_scope):
         try:
@@ -48,10 +114,8 @@ class ScopeManager:
 
     @classmethod
     def _get_scope_collection_scope(cls, rendering_id, collection_name):
-        # TODO: handle cache stale true, do not wait for requests if cache expired using a ThreadPoolExecutor
-        # https://stackoverflow.com/questions/14245989/python-requests-non-blocking
         if cls._has_cache_expired(rendering_id):
-            cls._refresh_cache(rendering_id)
+            cls._handle_expired_cache(rendering_id)
 
         if collection_name in cls.cache[rendering_id]['scopes']:
             return cls.cache[rendering_id]['scopes'][collection_name]
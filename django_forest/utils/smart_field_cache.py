@@ -0,0 +1,154 @@
+import hashlib
+
+from django.apps import apps
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+
+from django_forest.utils.forest_setting import get_forest_setting
+from django_forest.utils.models import Models
+from django_forest.utils.schema import Schema
+
+
+class SmartFieldCache:
+    """Cache the values of the smart fields declaring a cache, in the FOREST_SMART_FIELDS_CACHE cache.
+
+    'cache': {'ttl': 300, 'version': 'updated_at', 'depends_on': ['app_label.ModelName']}
+
+    A record value is deleted when the record changes, and a version column expires it when the record
+    is updated without signals. Each field has a generation, bumped when one of its dependency models changes.
+    """
+
+    MISSING = object()
+    # Notice: changed model -> (resource, smart field, is the model of the resource) of the cached smart fields
+    # to invalidate, built when the signals are connected
+    dependencies = {}
+
+    @staticmethod
+    def get_cache():
+        return caches[get_forest_setting('FOREST_SMART_FIELDS_CACHE', 'default')]
+
+    @staticmethod
+    def get_generation_key(resource, smart_field):
+        return f"forest:smart_field:generation:{resource}:{smart_field['field']}"
+
+    @staticmethod
+    def get_key(resource, smart_field, generation, pk):
+        signature = hashlib.sha256(str(pk).encode('utf-8')).hexdigest()
+        return f"forest:smart_field:{resource}:{smart_field['field']}:{generation}:{signature}"
+
+    @staticmethod
+    def get_version(smart_field, item):
+        version = smart_field['cache'].get('version')
+        return None if version is None else getattr(item, version)
+
+    @staticmethod
+    def load_versions(smart_field, items):
+        version = smart_field['cache'].get('version')
+        if version is None or not items:
+            return
+        attname = items[0]._meta.get_field(version).attname
+        deferred = [item for item in items if item.pk is not None and attname in item.get_deferred_fields()]
+        if not deferred:
+            return
+
+        # Notice: a single query for the versions not loaded with the items, instead of one per item
+        Model = deferred[0]._meta.model
+        versions = dict(Model._default_manager.filter(pk__in=[item.pk for item in deferred])
+                        .values_list('pk', attname))
+        for item in deferred:
+            if item.pk in versions:
+                setattr(item, attname, versions[item.pk])
+
+    @classmethod
+    def get_keys(cls, cache, resource, smart_field, items):
+        generation = cache.get(cls.get_generation_key(resource, smart_field), 0)
+        return [cls.get_key(resource, smart_field, generation, item.pk) for item in items]
+
+    @classmethod
+    def get_values(cls, resource, smart_field, items):
+        """Return the cached values of the items, in the items order (MISSING when not cached)."""
+        cache = cls.get_cache()
+        cls.load_versions(smart_field, items)
+        keys = cls.get_keys(cache, resource, smart_field, items)
+        cached = cache.get_many([key for key, item in zip(keys, items) if item.pk is not None])
+
+        values = []
+        for key, item in zip(keys, items):
+            version, value = cached.get(key, (cls.MISSING, cls.MISSING))
+            values.append(value if version == cls.get_version(smart_field, item) else cls.MISSING)
+        return values
+
+    @classmethod
+    def set_values(cls, resource, smart_field, items, values):
+        cache = cls.get_cache()
+        keys = cls.get_keys(cache, resource, smart_field, items)
+        cache.set_many({
+            key: (cls.get_version(smart_field, item), value)
+            for key, item, value in zip(keys, items, values)
+            if item.pk is not None
+        }, smart_field['cache'].get('ttl'))
+
+    @staticmethod
+    def get_cached_smart_fields(collection):
+        metadata = Schema.get_collection_metadata(collection['name'])
+        return [field for field in metadata.smart_fields.values() if field.get('cache')]
+
+    @staticmethod
+    def get_dependency_model(dependency):
+        return dependency if isinstance(dependency, type) else apps.get_model(str(dependency))
+
+    @classmethod
+    def add_dependencies(cls, dependencies, collection):
+        Model = Models.get(collection['name'])
+        for smart_field in cls.get_cached_smart_fields(collection):
+            if Model is not None:
+                dependencies.setdefault(Model, []).append((collection['name'], smart_field, True))
+            for dependency in smart_field['cache'].get('depends_on', []):
+                dependency_model = cls.get_dependency_model(dependency)
+                dependencies.setdefault(dependency_model, []).append((collection['name'], smart_field, False))
+
+    @classmethod
+    def build_dependencies(cls):
+        dependencies = {}
+        for collection in Schema.schema['collections']:
+            cls.add_dependencies(dependencies, collection)
+        return dependencies
+
+    @classmethod
+    def invalidate_generation(cls, cache, resource, smart_field):
+        key = cls.get_generation_key(resource, smart_field)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+    @classmethod
+    def handle_record_changed(cls, sender, instance, **kwargs):
+        cache = cls.get_cache()
+        for resource, smart_field, is_resource_model in cls.dependencies.get(sender, []):
+            if is_resource_model:
+                cache.delete_many(cls.get_keys(cache, resource, smart_field, [instance]))
+            else:
+                cls.invalidate_generation(cache, resource, smart_field)
+
+    @staticmethod
+    def get_dispatch_uid(signal_name, Model):
+        return f'forest_smart_field_cache_{signal_name}_{Model._meta.label_lower}'
+
+    @classmethod
+    def disconnect_signals(cls):
+        for Model in cls.dependencies:
+            post_save.disconnect(sender=Model, dispatch_uid=cls.get_dispatch_uid('post_save', Model))
+            post_delete.disconnect(sender=Model, dispatch_uid=cls.get_dispatch_uid('post_delete', Model))
+        cls.dependencies = {}
+
+    @classmethod
+    def connect_signals(cls):
+        # Notice: only the models the cached smart fields depend on are listened, once the smart fields are added
+        cls.disconnect_signals()
+        cls.dependencies = cls.build_dependencies()
+        for Model in cls.dependencies:
+            post_save.connect(cls.handle_record_changed, sender=Model,
+                              dispatch_uid=cls.get_dispatch_uid('post_save', Model))
+            post_delete.connect(cls.handle_record_changed, sender=Model,
+                                dispatch_uid=cls.get_dispatch_uid('post_delete', Model))